@@ -1,13 +1,25 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from prometheus_client import make_asgi_app
 
 from app.api import endpoints as api_endpoints
-from app.containers import ApplicationContainer
-from app.exceptions import ResourceNotFound
+from app.containers import ApplicationContainer, bootstrap_storage
+from app.exceptions import (
+    AdmissionRejected,
+    ImageTooLarge,
+    InvalidBatch,
+    InvalidCursor,
+    InvalidImage,
+    InvalidStoryState,
+    ResourceNotFound,
+)
+from app.infrastructure.metrics import metrics_registry
 
 
 logging.basicConfig(
@@ -16,10 +28,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    def __init__(self, app, max_image_bytes: int, max_batch_size: int) -> None:
+        self.app = app
+        self._max_image_bytes = max_image_bytes
+        self._max_batch_size = max_batch_size
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or scope["method"] != "POST" or not path.startswith("/api/stories/generate"):
+            return await self.app(scope, receive, send)
+
+        images = self._max_batch_size if path.endswith("/batch") else 1
+        limit = images * self._max_image_bytes + MULTIPART_OVERHEAD_BYTES
+        too_large = f"Request body is larger than {limit} bytes"
+        headers = dict(scope["headers"])
+
+        try:
+            declared = int(headers.get(b"content-length") or 0)
+        except ValueError:
+            return await self._reject(scope, receive, send, 400, "Invalid request", "Malformed Content-Length header")
+
+        if declared > limit:
+            return await self._reject(scope, receive, send, 413, "Image too large", too_large)
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise ImageTooLarge(too_large)
+
+            return message
+
+        async def guarded_send(message):
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except ImageTooLarge:
+            if not exceeded:
+                raise
+
+        if exceeded:
+            await self._reject(scope, receive, send, 413, "Image too large", too_large)
+
+    @staticmethod
+    async def _reject(scope, receive, send, status_code: int, error: str, details: str) -> None:
+        response = JSONResponse(status_code=status_code, content={"error": error, "details": details})
+        await response(scope, receive, send)
+
 
 def create_app(container: ApplicationContainer) -> FastAPI:
     container.wire(packages=[api_endpoints])
     settings = container.settings()
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        await bootstrap_storage(container)
+        yield
+        await asyncio.to_thread(container.shutdown_resources)
     
     app = FastAPI(
         title="Story Tailer",
@@ -27,10 +105,17 @@ def create_app(container: ApplicationContainer) -> FastAPI:
         version="1.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
     
     app.container = container  # type: ignore
     
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        max_image_bytes=settings.max_image_bytes,
+        max_batch_size=settings.max_batch_size,
+    )
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -38,8 +123,9 @@ def create_app(container: ApplicationContainer) -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    
+
     app.include_router(api_endpoints.router)
+    app.mount("/metrics", make_asgi_app(registry=metrics_registry()))
 
     @app.exception_handler(ResourceNotFound)
     async def resource_not_found_handler(request, exc):
@@ -51,6 +137,67 @@ def create_app(container: ApplicationContainer) -> FastAPI:
             },
         )
 
+    @app.exception_handler(InvalidImage)
+    async def invalid_image_handler(request, exc):
+        return JSONResponse(
+            status_code=415,
+            content={
+                "error": "Unsupported image",
+                "details": str(exc),
+            },
+        )
+
+    @app.exception_handler(ImageTooLarge)
+    async def image_too_large_handler(request, exc):
+        return JSONResponse(
+            status_code=413,
+            content={
+                "error": "Image too large",
+                "details": str(exc),
+            },
+        )
+
+    @app.exception_handler(InvalidCursor)
+    async def invalid_cursor_handler(request, exc):
+        return JSONResponse(
+            status_code=400,
+            content={
+                "error": "Invalid cursor",
+                "details": str(exc),
+            },
+        )
+
+    @app.exception_handler(InvalidBatch)
+    async def invalid_batch_handler(request, exc):
+        return JSONResponse(
+            status_code=400,
+            content={
+                "error": "Invalid batch",
+                "details": str(exc),
+            },
+        )
+
+    @app.exception_handler(InvalidStoryState)
+    async def invalid_story_state_handler(request, exc):
+        return JSONResponse(
+            status_code=409,
+            content={
+                "error": "Invalid story state",
+                "details": str(exc),
+            },
+        )
+
+    @app.exception_handler(AdmissionRejected)
+    async def admission_rejected_handler(request, exc):
+        return JSONResponse(
+            status_code=429,
+            content={
+                "error": "Too many requests",
+                "details": str(exc),
+            },
+            headers={"Retry-After": str(exc.retry_after_seconds)},
+        )
+
     @app.exception_handler(Exception)
     async def global_exception_handler(request, exc):
         logger.error(f"Global exception handler caught: {exc}")
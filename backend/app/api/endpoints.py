@@ -1,20 +1,35 @@
-from typing import Annotated
+import hashlib
+from typing import Annotated, AsyncIterator
+
+from pydantic import TypeAdapter, ValidationError
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, File, Query, UploadFile, Form, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile, Form, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+
+from app.api.http_caching import http_date, is_not_modified
+from app.api.server_sent_events import with_heartbeats
 
 from app.api.serializers import (
+    StoryBatchResponse,
     StoryGenerationRequest,
     StoryGenerationResponse,
     StoryListResponse,
 )
 from app.application import StoryApplication
+from app.domain import Story
+from app.exceptions import InvalidBatch
 from app.infrastructure import FileManager
 from app.containers import ApplicationContainer
+from app.settings import Settings
 
 router = APIRouter(prefix="/api", tags=["story-tailer"])
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+SSE_KEEPALIVE = ": keepalive\n\n"
+
+_batch_requests_adapter = TypeAdapter(list[StoryGenerationRequest])
+
 
 @router.post(
     "/stories/generate",
@@ -22,6 +37,7 @@ router = APIRouter(prefix="/api", tags=["story-tailer"])
 )
 @inject
 async def generate_story(
+    http_request: Request,
     request_json: Annotated[str, Form(..., alias="request")],
     image: UploadFile = File(..., description="The image to generate a story from"),
     app: StoryApplication = Depends(Provide[ApplicationContainer.application]),
@@ -30,12 +46,63 @@ async def generate_story(
 
     story = await app.initiate_story_generation(
         request=request,
-        raw_image=await image.read(),
+        image=_read_upload(image),
+        client_id=_client_id(http_request),
     )
 
     return StoryGenerationResponse.from_domain(story)
 
 
+@router.post(
+    "/stories/generate/batch",
+    response_model=StoryBatchResponse,
+    response_model_by_alias=True,
+)
+@inject
+async def generate_story_batch(
+    http_request: Request,
+    requests_json: Annotated[str, Form(..., alias="requests")],
+    images: list[UploadFile] = File(..., description="One image per request, in the same order"),
+    app: StoryApplication = Depends(Provide[ApplicationContainer.application]),
+) -> StoryBatchResponse:
+    try:
+        requests = _batch_requests_adapter.validate_json(requests_json)
+    except ValidationError as exc:
+        raise InvalidBatch(f"Malformed batch requests: {exc}") from exc
+
+    if len(requests) != len(images):
+        raise InvalidBatch(f"Got {len(requests)} requests but {len(images)} images")
+
+    batch = await app.initiate_batch_generation(
+        [(request, _read_upload(image)) for request, image in zip(requests, images)],
+        client_id=_client_id(http_request),
+    )
+
+    return StoryBatchResponse.from_domain(batch)
+
+
+async def _read_upload(upload: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+def _client_id(request: Request) -> str:
+    return request.client.host if request.client else "anonymous"
+
+
+@router.get(
+    "/stories/batches/{batch_id}",
+    response_model=StoryBatchResponse,
+    response_model_by_alias=True,
+)
+@inject
+async def get_story_batch(
+    batch_id: str,
+    app: StoryApplication = Depends(Provide[ApplicationContainer.application]),
+) -> StoryBatchResponse:
+    return StoryBatchResponse.from_domain(await app.get_batch(batch_id))
+
+
 @router.get(
     "/stories/{story_id}",
     response_model=StoryGenerationResponse,
@@ -43,13 +110,75 @@ async def generate_story(
 @inject
 async def get_story(
     story_id: str,
+    request: Request,
     app: StoryApplication = Depends(Provide[ApplicationContainer.application]),
-) -> StoryGenerationResponse:
-    return StoryGenerationResponse.from_domain(
-        story=await app.get_story_by_id(story_id),
+) -> Response:
+    story = await app.get_story_by_id(story_id)
+
+    version = f"{story.id}:{story.status.value}:{story.last_modified.isoformat()}"
+    headers = {
+        "ETag": f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"',
+        "Last-Modified": http_date(story.last_modified),
+        "Cache-Control": "no-cache",
+    }
+
+    if is_not_modified(request, headers["ETag"], story.last_modified):
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=StoryGenerationResponse.from_domain(story).model_dump_json(by_alias=True),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.get("/stories/{story_id}/events")
+@inject
+async def stream_story_events(
+    story_id: str,
+    app: StoryApplication = Depends(Provide[ApplicationContainer.application]),
+    settings: Settings = Depends(Provide[ApplicationContainer.settings]),
+) -> StreamingResponse:
+    stories = app.watch_story(story_id)
+    first_story = await anext(stories)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield _status_event(first_story)
+            async for story in with_heartbeats(
+                stories,
+                interval_seconds=settings.story_events_keepalive_seconds,
+                lifetime_seconds=settings.story_events_max_stream_seconds,
+            ):
+                yield SSE_KEEPALIVE if story is None else _status_event(story)
+        finally:
+            await stories.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+def _status_event(story: Story) -> str:
+    payload = StoryGenerationResponse.from_domain(story).model_dump_json(by_alias=True)
+    return f"event: status\ndata: {payload}\n\n"
+
+
+@router.post(
+    "/stories/{story_id}/audio",
+    response_model=StoryGenerationResponse,
+    status_code=202,
+)
+@inject
+async def resynthesize_story_audio(
+    story_id: str,
+    app: StoryApplication = Depends(Provide[ApplicationContainer.application]),
+) -> StoryGenerationResponse:
+    return StoryGenerationResponse.from_domain(await app.resynthesize_audio(story_id))
+
+
 @router.get(
     "/stories",
     response_model=StoryListResponse,
@@ -58,15 +187,17 @@ async def get_story(
 async def list_stories(
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: Annotated[str | None, Query()] = None,
     app: StoryApplication = Depends(Provide[ApplicationContainer.application]),
 ) -> StoryListResponse:
-    stories, total = await app.list_stories(page=page, page_size=page_size)
+    story_page = await app.list_stories(page=page, page_size=page_size, cursor=cursor)
 
     return StoryListResponse.from_domain(
-        stories=stories,
-        total=total,
+        stories=story_page.stories,
+        total=story_page.total,
         page=page,
         page_size=page_size,
+        next_cursor=story_page.next_cursor,
     )
 
 
@@ -86,14 +217,33 @@ async def delete_story(
 @inject
 async def get_file(
     filepath: str,
+    request: Request,
     file_manager: FileManager = Depends(Provide[ApplicationContainer.file_manager]),
-):
+    settings: Settings = Depends(Provide[ApplicationContainer.settings]),
+) -> Response:
+    file_url = f"/files/{filepath}"
+
     try:
-        file_path = file_manager.resolve_path_from_url(f"/files/{filepath}")
+        file_path = file_manager.resolve_path_from_url(file_url)
     except ValueError:
         raise HTTPException(status_code=404, detail="File not found")
 
-    if not file_path.exists():
+    if (stat_result := await file_manager.stat(file_url)) is None:
         raise HTTPException(status_code=404, detail="File not found")
-    
-    return FileResponse(str(file_path))
+
+    headers = {
+        "ETag": f'"{file_path.stem}-{stat_result.st_size:x}"',
+        "Cache-Control": "public, max-age=31536000, immutable",
+    }
+
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    if settings.files_delivery_mode == "x-accel-redirect":
+        location = f"{settings.files_accel_redirect_location.rstrip('/')}/{filepath}"
+        return Response(headers={**headers, "X-Accel-Redirect": location})
+
+    if settings.files_delivery_mode == "x-sendfile":
+        return Response(headers={**headers, "X-Sendfile": str(file_path)})
+
+    return FileResponse(str(file_path), stat_result=stat_result, headers=headers)
@@ -1,9 +1,17 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from pydantic import BaseModel, Field
 
-from app.domain.story import Story, StoryFlavor, StoryStatus
+from app.domain.story import (
+    STORY_PREVIEW_LENGTH,
+    AudioCodec,
+    Story,
+    StoryBatch,
+    StoryFlavor,
+    StoryStatus,
+    StorySummary,
+)
 
 
 class StoryGenerationRequest(BaseModel):
@@ -28,7 +36,10 @@ class StoryGenerationResponse(BaseModel):
     image_url: str | None = Field(None, alias="imageUrl")
     audio_url: str | None = Field(None, alias="audioUrl")
     audio_duration_seconds: float | None = Field(None, alias="audioDurationSeconds")
+    audio_codec: AudioCodec | None = Field(None, alias="audioCodec")
     generation_time_seconds: float | None = Field(None, alias="generationTimeSeconds")
+    stage_timings: Dict[str, float] = Field(default_factory=dict, alias="stageTimings")
+    error_message: str | None = Field(None, alias="errorMessage")
     created_at: datetime = Field(..., alias="createdAt")
     status: StoryStatus = Field(
         ..., 
@@ -49,12 +60,36 @@ class StoryGenerationResponse(BaseModel):
             imageUrl=story.image_url,
             audioUrl=story.audio_url,
             audioDurationSeconds=story.audio_duration_seconds,
+            audioCodec=story.audio_codec,
             generationTimeSeconds=story.generation_time_seconds,
+            stageTimings=story.stage_timings,
+            errorMessage=story.error_message,
             createdAt=story.created_at,
             status=story.status,
         )
 
 
+class StoryBatchResponse(BaseModel):
+    batch_id: str = Field(..., alias="batchId")
+    stories: List[StoryGenerationResponse]
+    finished: bool = Field(
+        ...,
+        description="Whether every story of the batch has reached a final status",
+    )
+
+    model_config = {
+        "populate_by_name": True
+    }
+
+    @classmethod
+    def from_domain(cls, batch: StoryBatch) -> "StoryBatchResponse":
+        return cls(
+            batchId=batch.id,
+            stories=[StoryGenerationResponse.from_domain(story) for story in batch.stories],
+            finished=all(story.status.is_terminal for story in batch.stories),
+        )
+
+
 class StoryListItem(BaseModel):
     id: str
     flavor: StoryFlavor
@@ -68,11 +103,11 @@ class StoryListItem(BaseModel):
     status: str
     
     @classmethod
-    def from_domain(cls, story: Story) -> "StoryListItem":
+    def from_domain(cls, story: StorySummary) -> "StoryListItem":
         story_preview = (
-            story.story_text[:100] + "..." 
-            if len(story.story_text) > 100 
-            else story.story_text
+            story.story_text_head[:STORY_PREVIEW_LENGTH] + "..." 
+            if len(story.story_text_head) > STORY_PREVIEW_LENGTH 
+            else story.story_text_head
         )
         return cls(
             id=story.id,
@@ -90,20 +125,23 @@ class StoryListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
     
     @classmethod
     def from_domain(
         cls, 
-        stories: List[Story], 
+        stories: List[StorySummary], 
         total: int, 
         page: int, 
         page_size: int,
+        next_cursor: Optional[str] = None,
     ) -> "StoryListResponse":
         return cls(
             stories=[StoryListItem.from_domain(story) for story in stories],
             total=total,
             page=page,
             page_size=page_size,
+            next_cursor=next_cursor,
         )
 
 
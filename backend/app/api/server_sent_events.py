@@ -0,0 +1,34 @@
+import asyncio
+import time
+from contextlib import suppress
+from typing import AsyncIterator, TypeVar
+
+T = TypeVar("T")
+
+
+async def with_heartbeats(
+    items: AsyncIterator[T],
+    interval_seconds: float,
+    lifetime_seconds: float,
+) -> AsyncIterator[T | None]:
+    deadline = time.monotonic() + lifetime_seconds
+    next_item: asyncio.Future[T] = asyncio.ensure_future(anext(items))
+
+    try:
+        while (remaining := deadline - time.monotonic()) > 0:
+            done, _ = await asyncio.wait({next_item}, timeout=min(interval_seconds, remaining))
+            if not done:
+                yield None
+                continue
+
+            try:
+                item = next_item.result()
+            except StopAsyncIteration:
+                return
+
+            yield item
+            next_item = asyncio.ensure_future(anext(items))
+    finally:
+        next_item.cancel()
+        with suppress(asyncio.CancelledError, StopAsyncIteration):
+            await next_item
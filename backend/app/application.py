@@ -1,114 +1,500 @@
-from contextlib import suppress
+import asyncio
+from contextlib import contextmanager, suppress
 import logging
 from datetime import datetime, timezone
 from uuid import uuid4
 from time import perf_counter
+from typing import AsyncGenerator, AsyncIterable, AsyncIterator, Callable, Iterator, NamedTuple
 
-from app.domain import IStoryRepository, Story, StoryStatus
+from celery import Signature, chain, group
+
+from app.domain import GenerationMode, IStoryEvents, IStoryRepository, Story, StoryBatch, StoryPage, StoryStatus
 from app.api.serializers import StoryGenerationRequest
-from app.infrastructure import StoryGenerator, StorySynthesizer, FileManager
-from app.exceptions import ResourceNotFound, RestrictedContentDetected
+from app.infrastructure import (
+    AdmissionController,
+    FileManager,
+    ParagraphSplitter,
+    StoredImage,
+    StoryGenerator,
+    StorySynthesizer,
+)
+from app.infrastructure.images import ModelImage
+from app.infrastructure.metrics import STAGE_SECONDS, STORIES_FINISHED
+from app.infrastructure.story_generator.response_models import ImageInsights
+from app.exceptions import InvalidBatch, InvalidStoryState, ResourceNotFound, RestrictedContentDetected, StaleStoryWrite
+
+
+class StreamedStory(NamedTuple):
+    text: str
+    llm_seconds: float
+    first_token_seconds: float | None
 
 
 class StoryApplication:
     def __init__(
         self,
         story_repository: IStoryRepository,
+        events: IStoryEvents,
         generator: StoryGenerator, 
         synthesizer: StorySynthesizer, 
         file_manager: FileManager,
+        admission: AdmissionController,
+        generation_mode: GenerationMode = GenerationMode.SEQUENTIAL,
+        max_batch_size: int = 50,
     ) -> None:
         self.story_repository = story_repository
+        self._events = events
         self._generator = generator
         self._synthesizer = synthesizer
         self._files = file_manager
+        self._admission = admission
+        self._generation_mode = generation_mode
+        self._max_batch_size = max_batch_size
 
         self._logger = logging.getLogger(__name__)
     
-    async def initiate_story_generation(self, request: StoryGenerationRequest, raw_image: bytes) -> Story:
-        image_url = self._files.store_image(raw_image)
+    async def initiate_story_generation(
+        self,
+        request: StoryGenerationRequest,
+        image: AsyncIterable[bytes],
+        client_id: str = "anonymous",
+    ) -> Story:
+        await self._admission.admit(client_id)
 
-        story = Story(
-            id=str(uuid4()),
-            flavor=request.flavor,
-            title="Story generation in progress...",
-            story_text="Your story is generating, please wait a moment...",
-            created_at=datetime.now(tz=timezone.utc),
-            status=StoryStatus.JUST_CREATED,
-            image_url=image_url,
-        )
+        upload_started = perf_counter()
+        try:
+            stored_image = await self._files.store_image(image)
+        except BaseException:
+            self._admission.release(client_id)
+            raise
 
-        await self.story_repository.save(story)
+        story = self._new_story(request, stored_image)
+        self._record_stage(story, "image_upload", perf_counter() - upload_started)
+
+        await self._save(story)
+        await self._events.publish(story)
 
         try:
-            from app.celery_app import celery
+            self._generation_job(story, request).apply_async()
+        except Exception as exc:
+            self._logger.error(f"Failed to enqueue Celery task: {exc}")
+            await self._make_story_failed(story, exc)
+
+        return story
+
+    async def initiate_batch_generation(
+        self,
+        items: list[tuple[StoryGenerationRequest, AsyncIterable[bytes]]],
+        client_id: str = "anonymous",
+    ) -> StoryBatch:
+        if not items:
+            raise InvalidBatch("A batch must contain at least one story")
 
-            celery.send_task(
-                "tasks.generate_story",
-                args=[story.id, request.model_dump(mode="json", by_alias=True)],
+        if len(items) > self._max_batch_size:
+            raise InvalidBatch(f"A batch may contain at most {self._max_batch_size} stories, got {len(items)}")
+
+        if len(items) > self._admission.capacity:
+            raise InvalidBatch(
+                f"A batch of {len(items)} stories exceeds the generation capacity of {self._admission.capacity}",
             )
-        except Exception as e:
-            self._logger.error(f"Failed to enqueue Celery task: {e}")
 
-        return story
+        await self._admission.admit(client_id, cost=len(items))
+
+        try:
+            images = await self._store_batch_images([image for _, image in items])
+        except BaseException:
+            self._admission.release(client_id, cost=len(items))
+            raise
+
+        batch = StoryBatch(id=str(uuid4()), stories=[])
+        for (request, _), stored_image in zip(items, images):
+            story = self._new_story(request, stored_image)
+            story.batch_id = batch.id
+            batch.stories.append(story)
+
+        saved_started = perf_counter()
+        await self.story_repository.save_many(batch.stories)
+        for story in batch.stories:
+            self._add_repository_time(story, perf_counter() - saved_started)
+        await asyncio.gather(*(self._events.publish(story) for story in batch.stories))
+
+        try:
+            group(
+                self._generation_job(story, request)
+                for story, (request, _) in zip(batch.stories, items)
+            ).apply_async()
+        except Exception as exc:
+            self._logger.error(f"Failed to enqueue Celery group for batch '{batch.id}': {exc}")
+            await asyncio.gather(*(self._make_story_failed(story, exc) for story in batch.stories))
+
+        return batch
 
     async def perform_story_generation(self, story_id: str, request: StoryGenerationRequest) -> None:
         start_time = perf_counter()
 
         story = await self.get_story_by_id(story_id)
 
+        if story.status.is_terminal:
+            self._logger.info(f"Skipping generation of story '{story_id}' in status `{story.status.value}`")
+            return
+
+        try:
+            if self._generation_mode is GenerationMode.PIPELINED and not self._has_text_checkpoint(story):
+                await self._generate_story_pipelined(story, request)
+            else:
+                await self._generate_story_text(story, request)
+                await self._synthesize_audio(story)
+
+            self._add_generation_time(story, perf_counter() - start_time)
+            await self._persist(story)
+        except Exception as exc:
+            await self._make_story_failed(story, exc)
+
+    async def perform_text_stage(self, story_id: str, request: StoryGenerationRequest) -> None:
+        start_time = perf_counter()
+
+        story = await self.get_story_by_id(story_id)
+
+        if story.status.is_terminal:
+            self._logger.info(f"Skipping text stage of story '{story_id}' in status `{story.status.value}`")
+            return
+
         try:
             await self._generate_story_text(story, request)
-            await self._synthesize_audio(story)
 
-            elapsed_seconds = perf_counter() - start_time
-            story.generation_time_seconds = elapsed_seconds
-            await self.story_repository.save(story)
+            self._add_generation_time(story, perf_counter() - start_time)
+            await self._persist(story)
         except Exception as exc:
             await self._make_story_failed(story, exc)
 
+    async def perform_audio_stage(self, story_id: str) -> None:
+        start_time = perf_counter()
+
+        story = await self.get_story_by_id(story_id)
+
+        if story.status is not StoryStatus.GENERATING_AUDIO:
+            self._logger.info(f"Skipping audio stage of story '{story_id}' in status `{story.status.value}`")
+            return
+
+        previous_audio_url = story.audio_url
+
+        try:
+            with self._timed_stage(story, "tts"):
+                story = await self._synthesizer.synthesize_audio_for(story)
+
+            self._add_generation_time(story, perf_counter() - start_time)
+            await self._persist(story)
+        except Exception as exc:
+            await self._make_story_failed(story, exc)
+            return
+
+        if previous_audio_url is not None and previous_audio_url != story.audio_url:
+            await self._files.delete_file(previous_audio_url)
+
+    async def resynthesize_audio(self, story_id: str) -> Story:
+        story = await self.get_story_by_id(story_id)
+
+        if (previous_status := story.status) not in (StoryStatus.COMPLETED, StoryStatus.AUDIO_TOO_LONG):
+            raise InvalidStoryState(
+                f"Story '{story_id}' has no finished text to synthesize (`{previous_status.value}`)",
+            )
+
+        story.status = StoryStatus.GENERATING_AUDIO
+        story.error_message = None
+
+        try:
+            await self.story_repository.patch(story, expected_status=previous_status)
+        except StaleStoryWrite as exc:
+            raise InvalidStoryState(f"Story '{story_id}' changed while scheduling audio synthesis") from exc
+
+        await self._events.publish(story)
+
+        try:
+            from app.celery_app import celery
+
+            celery.signature("tasks.synthesize_story_audio", args=[story.id]).apply_async()
+        except Exception:
+            story.status = previous_status
+            await self._persist(story)
+            raise
+
+        return story
+
     async def get_story_by_id(self, story_id: str) -> Story:
         if (story := await self.story_repository.get_by_id(story_id)) is None:
             raise ResourceNotFound(f"Story with id '{story_id}' not found")
 
         return story
 
+    async def get_batch(self, batch_id: str) -> StoryBatch:
+        if not (stories := await self.story_repository.list_by_batch(batch_id)):
+            raise ResourceNotFound(f"Batch with id '{batch_id}' not found")
+
+        return StoryBatch(id=batch_id, stories=stories)
+
+    async def watch_story(self, story_id: str) -> AsyncGenerator[Story, None]:
+        async with self._events.subscribe(story_id) as updates:
+            story = await self.get_story_by_id(story_id)
+            yield story
+
+            if story.status.is_terminal:
+                return
+
+            async for story in updates:
+                yield story
+
+                if story.status.is_terminal:
+                    return
+
     async def list_stories(
         self,
         page: int = 1,
         page_size: int = 10,
-    ) -> tuple[list[Story], int]:
-        return await self.story_repository.list_stories(page, page_size)
+        cursor: str | None = None,
+    ) -> StoryPage:
+        return await self.story_repository.list_stories(page, page_size, cursor)
 
     async def delete_story(self, story_id: str) -> None:
         try:
             with suppress(ResourceNotFound):
                 story = await self.get_story_by_id(story_id)
-                self._files.delete_story_files(story)
+                await self._files.delete_story_files(story)
         finally:
             await self.story_repository.delete(story_id)
     
-    async def _synthesize_audio(self, story: Story) -> None:
-        story = await self._synthesizer.synthesize_audio_for(story)
+    def _generation_job(self, story: Story, request: StoryGenerationRequest) -> Signature:
+        from app.celery_app import celery
+
+        request_json = request.model_dump(mode="json", by_alias=True)
+
+        if self._generation_mode is not GenerationMode.STAGED:
+            return celery.signature("tasks.generate_story", args=[story.id, request_json])
+
+        return chain(
+            celery.signature("tasks.generate_story_text", args=[story.id, request_json]),
+            celery.signature("tasks.synthesize_story_audio"),
+        )
+
+    @staticmethod
+    def _add_generation_time(story: Story, elapsed_seconds: float) -> None:
+        story.generation_time_seconds = (story.generation_time_seconds or 0.0) + elapsed_seconds
+
+    def _new_story(self, request: StoryGenerationRequest, image: StoredImage) -> Story:
+        story = Story(
+            id=str(uuid4()),
+            flavor=request.flavor,
+            title="Story generation in progress...",
+            story_text="Your story is generating, please wait a moment...",
+            created_at=datetime.now(tz=timezone.utc),
+            status=StoryStatus.JUST_CREATED,
+            image_url=image.url,
+            image_sha256=image.sha256,
+        )
+        self._record_stage(story, "image_normalization", image.normalization_seconds)
+        self._record_stage(story, "file_write", image.write_seconds)
+
+        return story
+
+    async def _store_batch_images(self, images: list[AsyncIterable[bytes]]) -> list[StoredImage]:
+        results = await asyncio.gather(
+            *(self._files.store_image(image) for image in images),
+            return_exceptions=True,
+        )
+
+        if failures := [result for result in results if isinstance(result, BaseException)]:
+            stored = [result for result in results if isinstance(result, StoredImage)]
+            await asyncio.gather(*(self._files.delete_image(image.url) for image in stored))
+            raise failures[0]
+
+        return results  # type: ignore[return-value]
+
+    @staticmethod
+    def _record_stage(story: Story, stage: str, elapsed_seconds: float) -> None:
+        STAGE_SECONDS.labels(stage=stage).observe(elapsed_seconds)
+        story.record_stage_timing(stage, elapsed_seconds)
+
+    @contextmanager
+    def _timed_stage(self, story: Story, stage: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self._record_stage(story, stage, perf_counter() - started)
+
+    @staticmethod
+    def _add_repository_time(story: Story, elapsed_seconds: float) -> None:
+        story.record_stage_timing("repository_save", story.stage_timings.get("repository_save", 0.0) + elapsed_seconds)
+
+    async def _save(self, story: Story) -> None:
+        started = perf_counter()
         await self.story_repository.save(story)
+        self._add_repository_time(story, perf_counter() - started)
+
+    async def _persist(self, story: Story) -> None:
+        finished = "status" in story.changed_fields and story.status.is_terminal
+
+        started = perf_counter()
+        await self.story_repository.patch(story)
+        self._add_repository_time(story, perf_counter() - started)
+
+        if finished:
+            STORIES_FINISHED.labels(status=story.status.value).inc()
+        await self._events.publish(story)
+
+    async def _ensure_insights(self, story: Story, request: StoryGenerationRequest) -> ImageInsights:
+        if story.image_insights is not None:
+            self._logger.info(f"Reusing image insights checkpoint of story '{story.id}'")
+            return ImageInsights.model_validate(story.image_insights)
 
-    async def _generate_story_text(self, story: Story, request: StoryGenerationRequest) -> None:
         story.status = StoryStatus.GENERATING_STORY
-        await self.story_repository.save(story)
+        await self._persist(story)
 
-        file_path = self._files.resolve_path_from_url(story.image_url or "")
-        with open(file_path, "rb") as img_file:
-            raw_image = img_file.read()
+        insights = await self._generate_insights(story, request, await self._load_model_image(story))
+
+        story.title = insights.title
+        story.image_insights = insights.model_dump(mode="json")
+        await self._persist(story)
+
+        return insights
+
+    async def _generate_insights(
+        self,
+        story: Story,
+        request: StoryGenerationRequest,
+        image: ModelImage,
+    ) -> ImageInsights:
+        insights_task = asyncio.create_task(self._get_image_insights(story, request, image))
 
-        generated = await self._generator.generate(request, raw_image)
+        if not request.eighting_plus_enabled:
+            try:
+                with self._timed_stage(story, "safety_check"):
+                    await self._generator.perform_elder_content_check(request, image)
+            except BaseException:
+                await self._cancel(insights_task)
+                raise
 
-        story.title = generated.title
-        story.story_text = generated.text
+        return await insights_task
+
+    async def _get_image_insights(
+        self,
+        story: Story,
+        request: StoryGenerationRequest,
+        image: ModelImage,
+    ) -> ImageInsights:
+        with self._timed_stage(story, "image_insights"):
+            return await self._generator.get_image_insights(request, image)
+
+    @staticmethod
+    def _has_text_checkpoint(story: Story) -> bool:
+        return story.status is StoryStatus.GENERATING_AUDIO
+
+    async def _synthesize_audio(self, story: Story) -> None:
+        with self._timed_stage(story, "tts"):
+            story = await self._synthesizer.synthesize_audio_for(story)
+        await self._persist(story)
+
+    async def _generate_story_text(self, story: Story, request: StoryGenerationRequest) -> None:
+        if self._has_text_checkpoint(story):
+            self._logger.info(f"Reusing story text checkpoint of story '{story.id}'")
+            return
+
+        insights = await self._ensure_insights(story, request)
+        streamed = await self._stream_story_text(request, insights)
+
+        story.title = insights.title
+        story.story_text = streamed.text
         story.status = StoryStatus.GENERATING_AUDIO
+        self._record_llm_timings(story, streamed)
 
-        await self.story_repository.save(story)
+        await self._persist(story)
+
+    async def _generate_story_pipelined(self, story: Story, request: StoryGenerationRequest) -> None:
+        insights = await self._ensure_insights(story, request)
+
+        paragraphs: asyncio.Queue[str | None] = asyncio.Queue()
+        producer = asyncio.create_task(self._stream_paragraphs(request, insights, paragraphs))
+
+        try:
+            with self._timed_stage(story, "story_llm_and_tts"):
+                story = await self._synthesizer.synthesize_paragraphs(story, self._drain(paragraphs))
+
+            streamed = await producer
+        except BaseException:
+            await self._cancel(producer)
+            raise
+
+        story.story_text = streamed.text
+        self._record_llm_timings(story, streamed)
+
+        await self._persist(story)
+
+    def _record_llm_timings(self, story: Story, streamed: StreamedStory) -> None:
+        self._record_stage(story, "story_llm", streamed.llm_seconds)
+        if streamed.first_token_seconds is not None:
+            story.record_stage_timing("story_llm_first_token", streamed.first_token_seconds)
+
+    async def _stream_story_text(
+        self,
+        request: StoryGenerationRequest,
+        insights: ImageInsights,
+        on_token: Callable[[str], None] | None = None,
+    ) -> StreamedStory:
+        tokens: list[str] = []
+        first_token_seconds: float | None = None
+        started = perf_counter()
+
+        async for token in self._generator.stream_story(request, insights):
+            if first_token_seconds is None:
+                first_token_seconds = perf_counter() - started
+
+            tokens.append(token)
+            if on_token is not None:
+                on_token(token)
+
+        return StreamedStory(
+            text="".join(tokens),
+            llm_seconds=perf_counter() - started,
+            first_token_seconds=first_token_seconds,
+        )
+
+    async def _stream_paragraphs(
+        self,
+        request: StoryGenerationRequest,
+        insights: ImageInsights,
+        paragraphs: asyncio.Queue[str | None],
+    ) -> StreamedStory:
+        splitter = ParagraphSplitter()
+
+        def enqueue(found: list[str]) -> None:
+            for paragraph in found:
+                paragraphs.put_nowait(paragraph)
+
+        try:
+            streamed = await self._stream_story_text(request, insights, lambda token: enqueue(splitter.feed(token)))
+            enqueue(splitter.flush())
+        finally:
+            paragraphs.put_nowait(None)
+
+        return streamed
+
+    @staticmethod
+    async def _drain(paragraphs: asyncio.Queue[str | None]) -> AsyncIterator[str]:
+        while (paragraph := await paragraphs.get()) is not None:
+            yield paragraph
+
+    @staticmethod
+    async def _cancel(task: asyncio.Task) -> None:
+        task.cancel()
+        with suppress(asyncio.CancelledError, Exception):
+            await task
+
+    async def _load_model_image(self, story: Story) -> ModelImage:
+        return await self._files.load_model_image(story.image_url or "")
 
     async def _make_story_failed(self, story: Story, exc: Exception) -> None:
+        if isinstance(exc, StaleStoryWrite):
+            self._logger.warning(f"Stopped generation of story '{story.id}' after a stale write: `{exc}`")
+            return
 
         if isinstance(exc, RestrictedContentDetected):
             self._logger.warning(f"Restricted content detected: `{exc}`")
@@ -126,4 +512,14 @@ class StoryApplication:
             story.story_text = str(exc)
             story.status = StoryStatus.FAILED
 
-        await self.story_repository.save(story)
+        await self._discard_unsaved_audio(story)
+        await self._persist(story)
+
+    async def _discard_unsaved_audio(self, story: Story) -> None:
+        if story.audio_url is None or "audio_url" not in story.changed_fields:
+            return
+
+        await self._files.delete_file(story.audio_url)
+        story.audio_url = None
+        story.audio_codec = None
+        story.audio_duration_seconds = None
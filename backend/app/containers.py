@@ -4,10 +4,21 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from app.application import StoryApplication
 from app.settings import Settings
 from app.infrastructure import (
+    AdmissionController,
+    AudioCache,
+    ClientRateLimiter,
+    CachedStoryRepository,
+    InMemoryStoryEvents,
+    MongoStoryEvents,
     MongoStoryRepository,
     StoryGenerator,
     StorySynthesizer,
+    VoiceRegistry,
+    create_paragraph_render_pool,
     FileManager,
+    VisionResultCache,
+    create_ollama_client_pool,
+    create_task_offloader,
 )
 
 
@@ -25,22 +36,129 @@ class ApplicationContainer(containers.DeclarativeContainer):
         settings.provided.mongo_db_name,
     )
     
-    story_repository = providers.Singleton(
+    mongo_story_repository = providers.Singleton(
         MongoStoryRepository,
         db=database,
     )
+    story_repository = providers.Singleton(
+        CachedStoryRepository,
+        inner=mongo_story_repository,
+        max_entries=settings.provided.story_cache_max_entries,
+        ttl_seconds=settings.provided.story_cache_ttl_seconds,
+    )
     
-    story_generator = providers.Singleton(StoryGenerator)
+    story_events = providers.Selector(
+        settings.provided.story_events_backend,
+        mongo=providers.Singleton(MongoStoryEvents, repository=mongo_story_repository),
+        local=providers.Singleton(InMemoryStoryEvents),
+    )
+    
+    offloader = providers.Resource(
+        create_task_offloader,
+        thread_pool_size=settings.provided.offload_thread_pool_size,
+        process_pool_size=settings.provided.offload_process_pool_size,
+    )
+    thread_offloader = providers.Resource(
+        create_task_offloader,
+        thread_pool_size=settings.provided.offload_thread_pool_size,
+        process_pool_size=0,
+    )
+
+    admission = providers.Singleton(
+        AdmissionController,
+        story_repository=story_repository,
+        offloader=offloader,
+        rate_limiter=providers.Singleton(
+            ClientRateLimiter,
+            requests_per_minute=settings.provided.rate_limit_per_minute,
+            burst=settings.provided.rate_limit_burst,
+        ),
+        queue_names=settings.provided.generation_queues,
+        max_queue_depth=settings.provided.admission_max_queue_depth,
+        max_in_flight=settings.provided.admission_max_in_flight,
+        seconds_per_story=settings.provided.admission_seconds_per_story,
+        in_flight_window_seconds=settings.provided.admission_in_flight_window_seconds,
+    )
+
+    vision_cache = providers.Singleton(
+        VisionResultCache,
+        db=database,
+        max_entries=settings.provided.vision_cache_max_entries,
+        ttl_seconds=settings.provided.vision_cache_ttl_seconds,
+    )
+
+    ollama_clients = providers.Resource(
+        create_ollama_client_pool,
+        base_urls=settings.provided.ollama_urls,
+        max_concurrency_per_model=settings.provided.ollama_max_concurrency_per_process,
+        max_connections=settings.provided.ollama_max_connections,
+        max_keepalive_connections=settings.provided.ollama_max_keepalive_connections,
+        keepalive_expiry_seconds=settings.provided.ollama_keepalive_expiry_seconds,
+        timeout_seconds=settings.provided.ollama_timeout_seconds,
+    )
+
+    story_generator = providers.Singleton(
+        StoryGenerator,
+        vision_cache=vision_cache,
+        clients=ollama_clients,
+        vision_model_name=settings.provided.ollama_vlm_model,
+        txt_model_name=settings.provided.ollama_txt_model,
+    )
     file_manager = providers.Singleton(
         FileManager,
         base_dir=settings.provided.base_files_dir,
+        offloader=offloader,
+        max_image_bytes=settings.provided.max_image_bytes,
+    )
+    voice_registry = providers.Singleton(
+        VoiceRegistry,
+        voices_dir=settings.provided.piper_voices_dir,
+        default_voice=settings.provided.piper_default_voice,
+        flavor_voices=settings.provided.piper_flavor_voices,
+        max_loaded_voices=settings.provided.piper_max_loaded_voices,
+        intra_op_threads=settings.provided.onnx_intra_op_threads,
+        inter_op_threads=settings.provided.onnx_inter_op_threads,
+    )
+    paragraph_render_pool = providers.Resource(
+        create_paragraph_render_pool,
+        workers=settings.provided.parallel_synthesis_workers,
+        voices=voice_registry,
+    )
+    audio_cache = providers.Singleton(
+        AudioCache,
+        cache_dir=settings.provided.audio_cache_dir,
+        file_manager=file_manager,
+        offloader=offloader,
+        max_bytes=settings.provided.audio_cache_max_bytes,
+        max_age_seconds=settings.provided.audio_cache_max_age_seconds,
+    )
+    story_synthesizer = providers.Singleton(
+        StorySynthesizer,
+        voices=voice_registry,
+        audio_cache=audio_cache,
+        render_pool=paragraph_render_pool,
+        file_manager=file_manager,
+        offloader=offloader,
+        audio_codec=settings.provided.audio_codec,
+        audio_bitrate=settings.provided.audio_bitrate,
+        max_audio_duration_seconds=settings.provided.max_audio_duration_seconds,
+        trim_overlong_audio=settings.provided.trim_overlong_audio,
+        paragraph_silence_seconds=settings.provided.paragraph_silence_seconds,
     )
-    story_synthesizer = providers.Singleton(StorySynthesizer, file_manager=file_manager)
 
     application = providers.Factory(
         StoryApplication,
         story_repository=story_repository,
+        events=story_events,
         generator=story_generator,
         synthesizer=story_synthesizer,
         file_manager=file_manager,
+        admission=admission,
+        generation_mode=settings.provided.generation_mode,
+        max_batch_size=settings.provided.max_batch_size,
     )
+
+
+async def bootstrap_storage(container: ApplicationContainer) -> None:
+    await container.mongo_story_repository().ensure_indexes()
+    await container.vision_cache().ensure_indexes()
@@ -1,9 +1,27 @@
-from .story import Story, StoryFlavor, StoryStatus
+from .story import (
+    STORY_PREVIEW_LENGTH,
+    AudioCodec,
+    GenerationMode,
+    Story,
+    StoryBatch,
+    StoryFlavor,
+    StoryPage,
+    StoryStatus,
+    StorySummary,
+)
+from .story_events import IStoryEvents
 from .story_repository import IStoryRepository
 
 __all__ = [
+    "AudioCodec",
+    "GenerationMode",
     "Story",
+    "StoryBatch",
     "StoryFlavor", 
     "StoryStatus",
+    "StorySummary",
+    "StoryPage",
+    "STORY_PREVIEW_LENGTH",
     "IStoryRepository",
+    "IStoryEvents",
 ]
@@ -1,7 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
+
+STORY_PREVIEW_LENGTH = 100
 
 
 class StoryFlavor(str, Enum):
@@ -11,6 +13,22 @@ class StoryFlavor(str, Enum):
     SCIENCE_FICTION = "science_fiction"
 
 
+class AudioCodec(str, Enum):
+    WAV = "wav"
+    OPUS = "opus"
+    MP3 = "mp3"
+
+    @property
+    def file_extension(self) -> str:
+        return "ogg" if self is AudioCodec.OPUS else self.value
+
+
+class GenerationMode(str, Enum):
+    STAGED = "staged"
+    PIPELINED = "pipelined"
+    SEQUENTIAL = "sequential"
+
+
 class StoryStatus(str, Enum):
     GENERATING_STORY = "generating_story"
     COMPLETED = "completed"
@@ -20,6 +38,28 @@ class StoryStatus(str, Enum):
     RESTRICTED_CONTENT_DETECTED = "restricted_content_detected"
     JUST_CREATED = "just_created"
 
+    @property
+    def is_terminal(self) -> bool:
+        return _STATUS_STAGE[self] == _TERMINAL_STAGE
+
+    def allowed_predecessors(self) -> list["StoryStatus"]:
+        if self.is_terminal:
+            return [status for status in StoryStatus if not status.is_terminal or status is self]
+
+        return [status for status in StoryStatus if _STATUS_STAGE[status] <= _STATUS_STAGE[self]]
+
+
+_TERMINAL_STAGE = 3
+_STATUS_STAGE = {
+    StoryStatus.JUST_CREATED: 0,
+    StoryStatus.GENERATING_STORY: 1,
+    StoryStatus.GENERATING_AUDIO: 2,
+    StoryStatus.COMPLETED: _TERMINAL_STAGE,
+    StoryStatus.FAILED: _TERMINAL_STAGE,
+    StoryStatus.AUDIO_TOO_LONG: _TERMINAL_STAGE,
+    StoryStatus.RESTRICTED_CONTENT_DETECTED: _TERMINAL_STAGE,
+}
+
 
 @dataclass
 class Story:
@@ -30,7 +70,59 @@ class Story:
     created_at: datetime
     status: StoryStatus = StoryStatus.GENERATING_STORY
     image_url: Optional[str] = None
+    image_sha256: Optional[str] = None
     audio_url: Optional[str] = None
     audio_duration_seconds: Optional[float] = None
+    audio_codec: Optional[AudioCodec] = None
     generation_time_seconds: Optional[float] = None
     error_message: Optional[str] = None
+    image_insights: Optional[dict[str, Any]] = None
+    batch_id: Optional[str] = None
+    stage_timings: dict[str, float] = field(default_factory=dict)
+    updated_at: Optional[datetime] = None
+
+    _changed_fields: set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+
+        if name != "_changed_fields" and "_changed_fields" in self.__dict__:
+            self._changed_fields.add(name)
+
+    @property
+    def changed_fields(self) -> frozenset[str]:
+        return frozenset(self._changed_fields)
+
+    @property
+    def last_modified(self) -> datetime:
+        return self.updated_at or self.created_at
+
+    def record_stage_timing(self, stage: str, seconds: float) -> None:
+        self.stage_timings = {**self.stage_timings, stage: round(seconds, 3)}
+
+    def mark_persisted(self) -> None:
+        self._changed_fields.clear()
+
+
+@dataclass
+class StorySummary:
+    id: str
+    flavor: StoryFlavor
+    title: str
+    story_text_head: str
+    created_at: datetime
+    status: StoryStatus
+    audio_url: Optional[str] = None
+
+
+@dataclass
+class StoryBatch:
+    id: str
+    stories: list[Story]
+
+
+@dataclass
+class StoryPage:
+    stories: list[StorySummary]
+    total: int
+    next_cursor: Optional[str] = None
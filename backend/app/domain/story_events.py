@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager
+from typing import AsyncIterator
+
+from .story import Story
+
+
+class IStoryEvents(ABC):
+    @abstractmethod
+    async def publish(self, story: Story) -> None:
+        pass
+
+    @abstractmethod
+    def subscribe(self, story_id: str) -> AbstractAsyncContextManager[AsyncIterator[Story]]:
+        pass
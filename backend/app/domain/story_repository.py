@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
-from .story import Story
+from .story import Story, StoryPage, StoryStatus
 
 
 class IStoryRepository(ABC):
@@ -8,16 +9,33 @@ class IStoryRepository(ABC):
     async def save(self, story: Story) -> None:
         pass
     
+    @abstractmethod
+    async def save_many(self, stories: list[Story]) -> None:
+        pass
+
+    @abstractmethod
+    async def patch(self, story: Story, expected_status: StoryStatus | None = None) -> None:
+        pass
+
     @abstractmethod
     async def get_by_id(self, story_id: str) -> Story | None:
         pass
     
+    @abstractmethod
+    async def list_by_batch(self, batch_id: str) -> list[Story]:
+        pass
+
+    @abstractmethod
+    async def count_in_progress(self, created_after: datetime) -> int:
+        pass
+
     @abstractmethod
     async def list_stories(
         self, 
         page: int = 1, 
         page_size: int = 10,
-    ) -> tuple[list[Story], int]:
+        cursor: str | None = None,
+    ) -> StoryPage:
         pass
 
     @abstractmethod
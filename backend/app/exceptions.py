@@ -4,3 +4,33 @@ class ResourceNotFound(Exception):
 
 class RestrictedContentDetected(Exception):
     pass
+
+
+class InvalidImage(Exception):
+    pass
+
+
+class ImageTooLarge(Exception):
+    pass
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class StaleStoryWrite(Exception):
+    pass
+
+
+class InvalidStoryState(Exception):
+    pass
+
+
+class InvalidBatch(Exception):
+    pass
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, message: str, retry_after_seconds: int) -> None:
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
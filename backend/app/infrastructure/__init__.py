@@ -1,12 +1,39 @@
 from .story_repository import MongoStoryRepository
-from .story_generator import StoryGenerator
-from .story_synthesizer import StorySynthesizer
-from .file_manager import FileManager
+from .cached_story_repository import CachedStoryRepository
+from .story_events import InMemoryStoryEvents, MongoStoryEvents
+from .story_generator import OllamaClientPool, StoryGenerator, VisionResultCache, create_ollama_client_pool
+from .story_synthesizer import (
+    AudioCache,
+    ParagraphRenderPool,
+    ParagraphSplitter,
+    StorySynthesizer,
+    VoiceRegistry,
+    create_paragraph_render_pool,
+)
+from .file_manager import FileManager, StoredImage
+from .offloader import TaskOffloader, create_task_offloader
+from .admission import AdmissionController, ClientRateLimiter
 
 
 __all__ = [
     "MongoStoryRepository",
+    "CachedStoryRepository",
+    "MongoStoryEvents",
+    "InMemoryStoryEvents",
     "StoryGenerator",
+    "VisionResultCache",
+    "OllamaClientPool",
+    "create_ollama_client_pool",
     "StorySynthesizer",
+    "AudioCache",
+    "VoiceRegistry",
     "FileManager",
+    "StoredImage",
+    "ParagraphSplitter",
+    "ParagraphRenderPool",
+    "create_paragraph_render_pool",
+    "TaskOffloader",
+    "create_task_offloader",
+    "AdmissionController",
+    "ClientRateLimiter",
 ]
@@ -0,0 +1,125 @@
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.domain import IStoryRepository
+from app.exceptions import AdmissionRejected
+
+from .lru import LRUCache
+from .offloader import TaskOffloader
+
+
+class ClientRateLimiter:
+    def __init__(self, requests_per_minute: float, burst: int, max_clients: int = 10_000) -> None:
+        self._rate_per_second = requests_per_minute / 60
+        self._burst = burst
+        self._buckets: LRUCache[str, tuple[float, float]] = LRUCache(max_size=max_clients)
+
+    def acquire(self, client_id: str, cost: int = 1) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(client_id) or (float(self._burst), now)
+        tokens = min(float(self._burst), tokens + (now - updated_at) * self._rate_per_second)
+
+        if tokens < (required := min(cost, self._burst)):
+            self._buckets.put(client_id, (tokens, now))
+            return (required - tokens) / self._rate_per_second
+
+        self._buckets.put(client_id, (tokens - cost, now))
+        return 0.0
+
+    def refund(self, client_id: str, cost: int = 1) -> None:
+        if (bucket := self._buckets.get(client_id)) is None:
+            return
+
+        tokens, updated_at = bucket
+        self._buckets.put(client_id, (min(float(self._burst), tokens + cost), updated_at))
+
+
+class AdmissionController:
+    LOAD_TTL_SECONDS = 2.0
+
+    def __init__(
+        self,
+        story_repository: IStoryRepository,
+        offloader: TaskOffloader,
+        rate_limiter: ClientRateLimiter,
+        queue_names: list[str],
+        max_queue_depth: int,
+        max_in_flight: int,
+        seconds_per_story: float,
+        in_flight_window_seconds: float,
+    ) -> None:
+        self._stories = story_repository
+        self._offloader = offloader
+        self._rate_limiter = rate_limiter
+        self._queue_names = queue_names
+        self._max_queue_depth = max_queue_depth
+        self._max_in_flight = max_in_flight
+        self._seconds_per_story = seconds_per_story
+        self._in_flight_window = timedelta(seconds=in_flight_window_seconds)
+
+        self._load: tuple[float, int, int] | None = None
+
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def capacity(self) -> int:
+        return min(self._max_queue_depth, self._max_in_flight)
+
+    async def admit(self, client_id: str, cost: int = 1) -> None:
+        queue_depth, in_flight = await self._current_load()
+
+        overflow = max(
+            queue_depth + cost - self._max_queue_depth,
+            in_flight + cost - self._max_in_flight,
+        )
+        if overflow > 0:
+            self._logger.warning(f"Rejecting {cost} stories: queue depth {queue_depth}, in flight {in_flight}")
+            raise AdmissionRejected(
+                f"Story generation is at capacity ({queue_depth} queued, {in_flight} in progress)",
+                retry_after_seconds=math.ceil(overflow * self._seconds_per_story),
+            )
+
+        if (wait_seconds := self._rate_limiter.acquire(client_id, cost)) > 0:
+            raise AdmissionRejected(
+                f"Too many story requests from client '{client_id}'",
+                retry_after_seconds=math.ceil(wait_seconds),
+            )
+
+        if self._load is not None:
+            checked_at, queue_depth, in_flight = self._load
+            self._load = (checked_at, queue_depth + cost, in_flight + cost)
+
+    def release(self, client_id: str, cost: int = 1) -> None:
+        self._rate_limiter.refund(client_id, cost)
+
+        if self._load is not None:
+            checked_at, queue_depth, in_flight = self._load
+            self._load = (checked_at, max(queue_depth - cost, 0), max(in_flight - cost, 0))
+
+    async def _current_load(self) -> tuple[int, int]:
+        if self._load is not None and time.monotonic() - self._load[0] < self.LOAD_TTL_SECONDS:
+            return self._load[1], self._load[2]
+
+        queue_depth = await self._offloader.run_in_thread(self._read_queue_depth)
+        in_flight = await self._stories.count_in_progress(
+            created_after=datetime.now(tz=timezone.utc) - self._in_flight_window,
+        )
+
+        self._load = (time.monotonic(), queue_depth, in_flight)
+        return queue_depth, in_flight
+
+    def _read_queue_depth(self) -> int:
+        from app.celery_app import celery
+
+        depth = 0
+        with celery.connection_for_read() as connection:
+            for queue_name in self._queue_names:
+                with connection.channel() as channel:
+                    try:
+                        depth += channel.queue_declare(queue=queue_name, passive=True).message_count
+                    except connection.channel_errors:
+                        pass
+
+        return depth
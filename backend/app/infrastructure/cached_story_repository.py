@@ -0,0 +1,61 @@
+import dataclasses
+import time
+from datetime import datetime
+
+from app.domain import IStoryRepository, Story, StoryPage, StoryStatus
+
+from .lru import LRUCache
+
+
+class CachedStoryRepository(IStoryRepository):
+    def __init__(self, inner: IStoryRepository, max_entries: int, ttl_seconds: float) -> None:
+        self._inner = inner
+        self._cache: LRUCache[str, tuple[float, Story]] = LRUCache(max_size=max_entries)
+        self._ttl_seconds = ttl_seconds
+
+    async def save(self, story: Story) -> None:
+        self._cache.pop(story.id)
+        await self._inner.save(story)
+
+    async def save_many(self, stories: list[Story]) -> None:
+        for story in stories:
+            self._cache.pop(story.id)
+        await self._inner.save_many(stories)
+
+    async def patch(self, story: Story, expected_status: StoryStatus | None = None) -> None:
+        self._cache.pop(story.id)
+        await self._inner.patch(story, expected_status)
+
+    async def get_by_id(self, story_id: str) -> Story | None:
+        if (entry := self._cache.get(story_id)) is not None:
+            expires_at, cached = entry
+            if expires_at > time.monotonic():
+                return dataclasses.replace(cached)
+
+            self._cache.pop(story_id)
+
+        if (story := await self._inner.get_by_id(story_id)) is None:
+            return None
+
+        if story.status.is_terminal:
+            self._cache.put(story_id, (time.monotonic() + self._ttl_seconds, dataclasses.replace(story)))
+
+        return story
+
+    async def list_by_batch(self, batch_id: str) -> list[Story]:
+        return await self._inner.list_by_batch(batch_id)
+
+    async def count_in_progress(self, created_after: datetime) -> int:
+        return await self._inner.count_in_progress(created_after)
+
+    async def list_stories(
+        self, 
+        page: int = 1, 
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> StoryPage:
+        return await self._inner.list_stories(page, page_size, cursor)
+
+    async def delete(self, story_id: str) -> None:
+        self._cache.pop(story_id)
+        await self._inner.delete(story_id)
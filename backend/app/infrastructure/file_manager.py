@@ -1,57 +1,170 @@
+import hashlib
 import logging
+import os
 from pathlib import Path
-from typing import Optional
+from time import perf_counter
+from typing import AsyncIterable, BinaryIO, NamedTuple
 from uuid import uuid4
 from contextlib import suppress
 
+from PIL import UnidentifiedImageError
+from PIL.Image import DecompressionBombError
 
-class FileManager:
-    def __init__(self, base_dir: Path) -> None:
-        self._base_dir = base_dir
-        self._base_dir.mkdir(parents=True, exist_ok=True)
+from app.exceptions import ImageTooLarge, InvalidImage
 
-        self._logger = logging.getLogger(__name__)
+from .images import (
+    IMAGE_SIGNATURE_LENGTH,
+    ModelImage,
+    NormalizedImage,
+    convert_image_to_jpeg,
+    detect_image_format,
+    normalize_image_file,
+)
+from .offloader import TaskOffloader
 
-    def store_image(self, raw_bytes: bytes, original_filename: Optional[str] = None) -> str:
-        self._logger.info("Storing image...")
 
-        extension = "png"
+class StoredImage(NamedTuple):
+    url: str
+    sha256: str
+    size_bytes: int
+    normalization_seconds: float
+    write_seconds: float
 
-        if original_filename and "." in original_filename:
-            extension = original_filename.rsplit(".", 1)[-1].lower()
 
-        filename = f"{uuid4()}.{extension}"
-        file_path = self._base_dir / "images" / filename
+class FileManager:
+    MODEL_IMAGE_SUFFIX = ".model.jpg"
 
-        with open(file_path, "wb") as file:
-            file.write(raw_bytes)
+    def __init__(self, base_dir: Path, offloader: TaskOffloader, max_image_bytes: int) -> None:
+        self._base_dir = base_dir
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._offloader = offloader
+        self._max_image_bytes = max_image_bytes
 
-        return f"images/{filename}"
-    
-    def store_audio(self, raw_bytes: bytes) -> str:
-        self._logger.info("Storing audio...")
+        self._logger = logging.getLogger(__name__)
 
-        extension = "wav"
+    async def store_image(self, chunks: AsyncIterable[bytes]) -> StoredImage:
+        self._logger.info("Storing image...")
 
+        image_id = uuid4()
+        upload_path = self._base_dir / "images" / f".{image_id}.upload"
+
+        try:
+            sha256, size_bytes = await self._receive_upload(chunks, upload_path)
+
+            normalization_started = perf_counter()
+            normalized = await self._normalize(upload_path)
+            normalization_seconds = perf_counter() - normalization_started
+
+            image_url = f"images/{image_id}.{normalized.extension}"
+            write_started = perf_counter()
+            await self._offloader.run_in_thread(
+                self._finalize_image_files,
+                image_url,
+                upload_path,
+                normalized.model_jpeg,
+            )
+            write_seconds = perf_counter() - write_started
+        except BaseException:
+            await self._offloader.run_in_thread(upload_path.unlink, True)
+            raise
+
+        return StoredImage(
+            url=image_url,
+            sha256=sha256,
+            size_bytes=size_bytes,
+            normalization_seconds=normalization_seconds,
+            write_seconds=write_seconds,
+        )
+
+    async def load_model_image(self, image_url: str) -> ModelImage:
+        model_image_path = self.resolve_path_from_url(self.model_image_url_for(image_url))
+
+        try:
+            return ModelImage(await self._offloader.run_in_thread(model_image_path.read_bytes))
+        except FileNotFoundError:
+            self._logger.info(f"No model-ready derivative for `{image_url}`, converting the original...")
+
+        raw_bytes = await self.read_file(image_url)
+        return ModelImage(await self._offloader.run_in_process(convert_image_to_jpeg, raw_bytes))
+
+    def model_image_url_for(self, image_url: str) -> str:
+        return image_url.rsplit(".", 1)[0] + self.MODEL_IMAGE_SUFFIX
+
+    async def read_file(self, url: str) -> bytes:
+        return await self._offloader.run_in_thread(self.resolve_path_from_url(url).read_bytes)
+
+    async def stat(self, url: str) -> os.stat_result | None:
+        try:
+            return await self._offloader.run_in_thread(os.stat, self.resolve_path_from_url(url))
+        except FileNotFoundError:
+            return None
+
+    def allocate_audio_file(self, extension: str = "wav") -> tuple[str, Path]:
         filename = f"{uuid4()}.{extension}"
         file_path = self._base_dir / "audio" / filename
 
-        with open(file_path, "wb") as file:
-            file.write(raw_bytes)
-
-        return f"audio/{filename}"
+        return f"audio/{filename}", file_path
 
     def resolve_path_from_url(self, url: str) -> Path:
         tail = url.replace("/files", "").lstrip("/")
         subdir, filename = tail.split("/", 1)
         return self._base_dir / subdir / filename
 
-    def delete_story_files(self, story) -> None:
+    async def delete_story_files(self, story) -> None:
         if (url := story.image_url) is not None:
-            self._delete_file(url)
+            await self.delete_image(url)
         if (url := story.audio_url) is not None:
-            self._delete_file(url)
-    
+            await self.delete_file(url)
+
+    async def delete_image(self, image_url: str) -> None:
+        await self.delete_file(image_url)
+        await self.delete_file(self.model_image_url_for(image_url))
+
+    async def delete_file(self, file_url: str) -> None:
+        await self._offloader.run_in_thread(self._delete_file, file_url)
+
+    async def _receive_upload(self, chunks: AsyncIterable[bytes], upload_path: Path) -> tuple[str, int]:
+        digest = hashlib.sha256()
+        header = b""
+        size_bytes = 0
+
+        upload: BinaryIO = await self._offloader.run_in_thread(upload_path.open, "wb")
+        try:
+            async for chunk in chunks:
+                size_bytes += len(chunk)
+                if size_bytes > self._max_image_bytes:
+                    raise ImageTooLarge(f"Uploaded image is larger than {self._max_image_bytes} bytes")
+
+                if len(header) < IMAGE_SIGNATURE_LENGTH:
+                    header += chunk[:IMAGE_SIGNATURE_LENGTH - len(header)]
+                    if len(header) == IMAGE_SIGNATURE_LENGTH:
+                        self._check_signature(header)
+
+                digest.update(chunk)
+                await self._offloader.run_in_thread(upload.write, chunk)
+        finally:
+            await self._offloader.run_in_thread(upload.close)
+
+        if len(header) < IMAGE_SIGNATURE_LENGTH:
+            self._check_signature(header)
+
+        return digest.hexdigest(), size_bytes
+
+    @staticmethod
+    def _check_signature(header: bytes) -> None:
+        if detect_image_format(header) is None:
+            raise InvalidImage("Uploaded file is not a supported image: unrecognized file signature")
+
+    async def _normalize(self, path: Path) -> NormalizedImage:
+        try:
+            return await self._offloader.run_in_process(normalize_image_file, str(path))
+        except (UnidentifiedImageError, DecompressionBombError, OSError) as exc:
+            raise InvalidImage(f"Uploaded file is not a supported image: {exc}") from exc
+
+    def _finalize_image_files(self, image_url: str, upload_path: Path, model_jpeg: bytes) -> None:
+        self.resolve_path_from_url(self.model_image_url_for(image_url)).write_bytes(model_jpeg)
+        upload_path.replace(self.resolve_path_from_url(image_url))
+
     def _delete_file(self, file_url: str) -> None:
         path = self.resolve_path_from_url(file_url)
 
@@ -0,0 +1,97 @@
+import base64
+import hashlib
+from functools import cached_property
+from io import BytesIO
+from typing import NamedTuple
+
+from PIL import Image
+
+MODEL_IMAGE_SIZE = (768, 768)
+IMAGE_SIGNATURE_LENGTH = 12
+
+_EXTENSION_FOR_FORMAT = {
+    "JPEG": "jpg",
+    "MPO": "jpg",
+    "PNG": "png",
+    "WEBP": "webp",
+    "GIF": "gif",
+    "BMP": "bmp",
+    "TIFF": "tiff",
+}
+
+
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"GIF87a", "GIF"),
+    (b"GIF89a", "GIF"),
+    (b"BM", "BMP"),
+    (b"II*\x00", "TIFF"),
+    (b"MM\x00*", "TIFF"),
+)
+
+
+class NormalizedImage(NamedTuple):
+    format: str
+    extension: str
+    model_jpeg: bytes
+
+
+class ModelImage:
+    def __init__(self, jpeg_bytes: bytes) -> None:
+        self.jpeg_bytes = jpeg_bytes
+
+    @cached_property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.jpeg_bytes).hexdigest()
+
+    @cached_property
+    def data_url(self) -> str:
+        return f"data:image/jpeg;base64,{base64.b64encode(self.jpeg_bytes).decode('ascii')}"
+
+
+def detect_image_format(header: bytes) -> str | None:
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "WEBP"
+
+    for signature, image_format in _SIGNATURES:
+        if header.startswith(signature):
+            return image_format
+
+    return None
+
+
+def normalize_image(image_bytes: bytes) -> NormalizedImage:
+    with BytesIO(image_bytes) as input_buffer:
+        return _normalize(Image.open(input_buffer))
+
+
+def normalize_image_file(path: str) -> NormalizedImage:
+    with Image.open(path) as image:
+        return _normalize(image)
+
+
+def convert_image_to_jpeg(image_bytes: bytes) -> bytes:
+    return normalize_image(image_bytes).model_jpeg
+
+
+def _normalize(image: Image.Image) -> NormalizedImage:
+    image_format = image.format or "UNKNOWN"
+
+    if image_format == "JPEG":
+        image.draft("RGB", MODEL_IMAGE_SIZE)
+
+    return NormalizedImage(
+        format=image_format,
+        extension=_EXTENSION_FOR_FORMAT.get(image_format, image_format.lower()),
+        model_jpeg=_encode_model_jpeg(image),
+    )
+
+
+def _encode_model_jpeg(image: Image.Image) -> bytes:
+    with BytesIO() as output_buffer:
+        image = image.convert("RGB")
+        image.thumbnail(MODEL_IMAGE_SIZE, Image.Resampling.LANCZOS)
+        image.save(output_buffer, format="JPEG", quality=70, subsampling=2, optimize=True)
+
+        return output_buffer.getvalue()
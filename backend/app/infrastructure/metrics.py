@@ -0,0 +1,111 @@
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess, start_http_server
+
+
+OFFLOAD_IN_FLIGHT = Gauge(
+    "storytailor_offload_in_flight",
+    "Jobs submitted to an offload pool that have not finished yet",
+    ["pool"],
+)
+OFFLOAD_SATURATED = Counter(
+    "storytailor_offload_saturated_total",
+    "Jobs that had to queue because every worker of the offload pool was busy",
+    ["pool"],
+)
+OFFLOAD_QUEUE_WAIT_SECONDS = Histogram(
+    "storytailor_offload_queue_wait_seconds",
+    "Time a job waited in the offload pool queue before a worker picked it up",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+VISION_CACHE_REQUESTS = Counter(
+    "storytailor_vision_cache_requests_total",
+    "Vision model cache lookups by outcome (memory_hit, mongo_hit, coalesced, miss)",
+    ["kind", "result"],
+)
+
+OLLAMA_WAITING = Gauge(
+    "storytailor_ollama_waiting_requests",
+    "Requests queued for a free per-model concurrency slot on an Ollama backend",
+    ["backend", "model"],
+)
+OLLAMA_IN_FLIGHT = Gauge(
+    "storytailor_ollama_in_flight_requests",
+    "Requests currently being served by an Ollama backend",
+    ["backend", "model"],
+)
+OLLAMA_QUEUE_WAIT_SECONDS = Histogram(
+    "storytailor_ollama_queue_wait_seconds",
+    "Time spent waiting for a per-model concurrency slot on an Ollama backend",
+    ["backend", "model"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+STAGE_SECONDS = Histogram(
+    "storytailor_stage_seconds",
+    "Wall time of a story pipeline stage",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+LLM_TIME_TO_FIRST_TOKEN_SECONDS = Histogram(
+    "storytailor_llm_time_to_first_token_seconds",
+    "Time from sending a story prompt until the first token streamed back",
+    ["model"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+LLM_TOKENS_PER_SECOND = Histogram(
+    "storytailor_llm_tokens_per_second",
+    "Decode rate of a story completion after its first token",
+    ["model"],
+    buckets=(1.0, 5.0, 10.0, 20.0, 30.0, 50.0, 75.0, 100.0, 150.0, 250.0),
+)
+TTS_REAL_TIME_FACTOR = Histogram(
+    "storytailor_tts_real_time_factor",
+    "Seconds spent synthesizing per second of story audio produced",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0),
+)
+MONGO_OPERATION_SECONDS = Histogram(
+    "storytailor_mongo_operation_seconds",
+    "Duration of story repository writes",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+CELERY_QUEUE_WAIT_SECONDS = Histogram(
+    "storytailor_celery_queue_wait_seconds",
+    "Time a Celery task spent in the broker between publish and a worker starting it",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+CELERY_TASKS_IN_FLIGHT = Gauge(
+    "storytailor_celery_tasks_in_flight",
+    "Celery tasks currently executing on workers",
+    ["task"],
+    multiprocess_mode="livesum",
+)
+
+STORIES_FINISHED = Counter(
+    "storytailor_stories_finished_total",
+    "Stories that reached a terminal status, by status",
+    ["status"],
+)
+
+
+def metrics_registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def start_metrics_exporter(port: int) -> None:
+    start_http_server(port, registry=metrics_registry())
+
+
+def mark_metrics_process_dead(pid: int) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterator, TypeVar
+
+from .metrics import OFFLOAD_IN_FLIGHT, OFFLOAD_QUEUE_WAIT_SECONDS, OFFLOAD_SATURATED
+
+T = TypeVar("T")
+
+
+def _timed_call(func: Callable[..., T], submitted_at: float, *args: Any) -> tuple[float, T]:
+    return time.monotonic() - submitted_at, func(*args)
+
+
+class OffloadPool:
+    def __init__(self, name: str, executor: Executor, size: int) -> None:
+        self.name = name
+        self.size = size
+        self._executor = executor
+        self._in_flight = 0
+
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        self._on_submit()
+
+        try:
+            loop = asyncio.get_running_loop()
+            queue_wait, result = await loop.run_in_executor(
+                self._executor,
+                partial(_timed_call, func, time.monotonic(), *args),
+            )
+        finally:
+            self._on_done()
+
+        OFFLOAD_QUEUE_WAIT_SECONDS.labels(pool=self.name).observe(queue_wait)
+        return result
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _on_submit(self) -> None:
+        if self._in_flight >= self.size:
+            OFFLOAD_SATURATED.labels(pool=self.name).inc()
+            self._logger.warning(
+                f"Offload pool `{self.name}` is saturated: {self._in_flight} jobs in flight for {self.size} workers",
+            )
+
+        self._in_flight += 1
+        OFFLOAD_IN_FLIGHT.labels(pool=self.name).inc()
+
+    def _on_done(self) -> None:
+        self._in_flight -= 1
+        OFFLOAD_IN_FLIGHT.labels(pool=self.name).dec()
+
+
+class TaskOffloader:
+    def __init__(self, thread_pool_size: int, process_pool_size: int) -> None:
+        self._threads = OffloadPool(
+            name="threads",
+            executor=ThreadPoolExecutor(max_workers=thread_pool_size, thread_name_prefix="offload"),
+            size=thread_pool_size,
+        )
+        self._processes = (
+            OffloadPool(
+                name="processes",
+                executor=ProcessPoolExecutor(
+                    max_workers=process_pool_size,
+                    mp_context=multiprocessing.get_context("spawn"),
+                ),
+                size=process_pool_size,
+            )
+            if process_pool_size > 0
+            else self._threads
+        )
+
+    async def run_in_thread(self, func: Callable[..., T], *args: Any) -> T:
+        return await self._threads.run(func, *args)
+
+    async def run_in_process(self, func: Callable[..., T], *args: Any) -> T:
+        return await self._processes.run(func, *args)
+
+    def shutdown(self) -> None:
+        self._threads.shutdown()
+        if self._processes is not self._threads:
+            self._processes.shutdown()
+
+
+def create_task_offloader(thread_pool_size: int, process_pool_size: int) -> Iterator[TaskOffloader]:
+    offloader = TaskOffloader(thread_pool_size=thread_pool_size, process_pool_size=process_pool_size)
+    try:
+        yield offloader
+    finally:
+        offloader.shutdown()
@@ -0,0 +1,57 @@
+import asyncio
+import dataclasses
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from motor.motor_asyncio import AsyncIOMotorChangeStream
+
+from app.domain import IStoryEvents, Story
+
+from .story_repository import MongoStoryRepository
+
+
+class MongoStoryEvents(IStoryEvents):
+    def __init__(self, repository: MongoStoryRepository) -> None:
+        self._repository = repository
+
+    async def publish(self, story: Story) -> None:
+        pass
+
+    @asynccontextmanager
+    async def subscribe(self, story_id: str) -> AsyncIterator[AsyncIterator[Story]]:
+        pipeline = [{"$match": {"fullDocument.id": story_id}}]
+
+        async with self._repository.collection.watch(pipeline, full_document="updateLookup") as stream:
+            yield self._stories_from(stream)
+
+    async def _stories_from(self, stream: AsyncIOMotorChangeStream) -> AsyncIterator[Story]:
+        async for change in stream:
+            if (document := change.get("fullDocument")) is not None:
+                yield self._repository.document_to_story(document)
+
+
+class InMemoryStoryEvents(IStoryEvents):
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[asyncio.Queue[Story]]] = {}
+
+    async def publish(self, story: Story) -> None:
+        for queue in self._subscribers.get(story.id, ()):
+            queue.put_nowait(dataclasses.replace(story))
+
+    @asynccontextmanager
+    async def subscribe(self, story_id: str) -> AsyncIterator[AsyncIterator[Story]]:
+        queue: asyncio.Queue[Story] = asyncio.Queue()
+        self._subscribers.setdefault(story_id, set()).add(queue)
+
+        try:
+            yield self._stories_from(queue)
+        finally:
+            subscribers = self._subscribers[story_id]
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[story_id]
+
+    @staticmethod
+    async def _stories_from(queue: asyncio.Queue[Story]) -> AsyncIterator[Story]:
+        while True:
+            yield await queue.get()
@@ -1 +1,3 @@
 from .generator import StoryGenerator
+from .ollama_pool import OllamaClientPool, create_ollama_client_pool
+from .vision_cache import VisionResultCache
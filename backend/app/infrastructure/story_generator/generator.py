@@ -1,55 +1,68 @@
-import base64
 import logging
-import os
-from io import BytesIO
-from typing import cast
-
-from langchain_ollama import ChatOllama
-from PIL import Image
+from time import perf_counter
+from typing import Any, AsyncIterator, TypeVar, cast
 
 from app.api.serializers import StoryGenerationRequest
 from app.exceptions import RestrictedContentDetected
 
-from .response_models import ImageInsights, StoryGenerationResponse, RestrictedContentResponse
+from ..images import ModelImage
+from ..metrics import LLM_TIME_TO_FIRST_TOKEN_SECONDS, LLM_TOKENS_PER_SECOND
+from .ollama_pool import OllamaClientPool
+from .response_models import ImageInsights, RestrictedContentResponse
+from .vision_cache import VisionResultCache
 from ..story_synthesizer.constants import flavour_to_wpm
 
 # VLM (Qwen2.5-VL-7B) https://huggingface.co/spaces/opencompass/open_vlm_leaderboard, https://arxiv.org/html/2501.00321v2
 # LLM (Qwen2.5-7B) 
 
+VisionResponse = TypeVar("VisionResponse", ImageInsights, RestrictedContentResponse)
+
 
 class StoryGenerator:
-    def __init__(self) -> None:
-        self._vision_model_name = os.getenv("OLLAMA_VLM_MODEL", "qwen2.5vl:7b")
-        self._txt_model_name = os.getenv("OLLAMA_TXT_MODEL", "qwen2.5:7b")
-        self._ollama_url = os.getenv("OLLAMA_URL", "http://host.docker.internal:11434")
+    def __init__(
+        self,
+        vision_cache: VisionResultCache,
+        clients: OllamaClientPool,
+        vision_model_name: str,
+        txt_model_name: str,
+    ) -> None:
+        self._vision_cache = vision_cache
+        self._clients = clients
+
+        self._vision_model_name = vision_model_name
+        self._txt_model_name = txt_model_name
 
         self._logger = logging.getLogger(__name__)
 
-    async def generate(
+    async def stream_story(
         self,
         request: StoryGenerationRequest,
-        image_bytes: bytes,
-    ) -> StoryGenerationResponse:
-        image_bytes = self._convert_image_to_jpeg(image_bytes)
-
-        if not request.eighting_plus_enabled:
-            await self._perform_elder_content_check(request, image_bytes)
-        
-        insights = await self._get_image_insights(request, image_bytes)
-
-        self._logger.info("Got image insights: %s", insights)
-
-        return await self._generate_story(request, insights)
+        insights: ImageInsights,
+    ) -> AsyncIterator[str]:
+        labels = {"model": self._txt_model_name}
+        tokens = 0
+        first_token_at: float | None = None
+
+        async with self._clients.chat(self._txt_model_name, **self._story_llm_params(request)) as llm:
+            started = perf_counter()
+            async for chunk in llm.astream(self._build_story_messages(request, insights)):
+                if first_token_at is None:
+                    first_token_at = perf_counter()
+                    LLM_TIME_TO_FIRST_TOKEN_SECONDS.labels(**labels).observe(first_token_at - started)
+
+                tokens += 1
+                yield str(chunk.content)
+
+        if first_token_at is not None and tokens > 1 and (decode_seconds := perf_counter() - first_token_at) > 0:
+            LLM_TOKENS_PER_SECOND.labels(**labels).observe((tokens - 1) / decode_seconds)
     
-    async def _perform_elder_content_check(
+    async def perform_elder_content_check(
         self,
         request: StoryGenerationRequest,
-        image_bytes: bytes,
+        image: ModelImage,
     ) -> None:
         self._logger.info("Performing elder content check...")
 
-        img_bytes_url: str = self._image_to_data_url(image_bytes)
-
         system = (
             "You are a concise content safety classifier."
             " Block explicit sexual content (nudity/acts/exploitation), graphic violence/gore,"
@@ -64,37 +77,23 @@ class StoryGenerator:
             f"Extra instructions from the user: ```{request.additional_context}```\n\n"
             " Keep summary one sentence, grounded in visible cues."
         )
-        messages = [
-            {"role": "system", "content": [{"type": "text", "text": system}]},
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": user},
-                    {"type": "image_url", "image_url": img_bytes_url},
-                ],
-            },
-        ]
 
-        structured = (
-            ChatOllama(
-                model=self._vision_model_name,
-                base_url=self._ollama_url,
-                temperature=0,
-                num_ctx=2048,
-            )
-            .with_structured_output(RestrictedContentResponse)
+        result = await self._vision_cache.get_or_compute(
+            key=self._vision_cache.key_for("safety", image.sha256, self._vision_model_name, system, user),
+            model_type=RestrictedContentResponse,
+            compute=lambda: self._invoke_vision_model(system, user, image, RestrictedContentResponse, 0),
         )
 
-        result = cast(RestrictedContentResponse, await structured.ainvoke(messages))
-
         if result.is_restricted:
             raise RestrictedContentDetected(result.summary)
 
-    async def _get_image_insights(self, request: StoryGenerationRequest, image_bytes: bytes) -> ImageInsights:
+    async def get_image_insights(
+        self,
+        request: StoryGenerationRequest,
+        image: ModelImage,
+    ) -> ImageInsights:
         self._logger.info("Getting image insights...")
 
-        img_bytes_url: str = self._image_to_data_url(image_bytes)
-
         system = (
             "You are a meticulous vision assistant extracting grounded story-building cues."
             " Be literal and faithful to the image; do not invent entities or text."
@@ -108,39 +107,61 @@ class StoryGenerator:
             " Consider the user's extra instructions for context: "
             f"```{request.additional_context}```"
         )
+
+        insights = await self._vision_cache.get_or_compute(
+            key=self._vision_cache.key_for("insights", image.sha256, self._vision_model_name, system, user),
+            model_type=ImageInsights,
+            compute=lambda: self._invoke_vision_model(system, user, image, ImageInsights, 0.3),
+        )
+
+        self._logger.info("Got image insights: %s", insights)
+
+        return insights
+
+    async def _invoke_vision_model(
+        self,
+        system: str,
+        user: str,
+        image: ModelImage,
+        schema: type[VisionResponse],
+        temperature: float,
+    ) -> VisionResponse:
         messages = [
             {"role": "system", "content": [{"type": "text", "text": system}]},
             {
                 "role": "user",
                 "content": [
                     {"type": "text", "text": user},
-                    {"type": "image_url", "image_url": img_bytes_url},
+                    {"type": "image_url", "image_url": image.data_url},
                 ],
             },
         ]
-        structured = (
-            ChatOllama(
-                model=self._vision_model_name,
-                base_url=self._ollama_url,
-                temperature=0.3,
-                num_ctx=2048,
-            )
-            .with_structured_output(ImageInsights)
-        )
+        async with self._clients.chat(
+            self._vision_model_name,
+            schema=schema,
+            temperature=temperature,
+            num_ctx=2048,
+        ) as structured:
+            return cast(VisionResponse, await structured.ainvoke(messages))
 
-        return cast(ImageInsights, await structured.ainvoke(messages))
+    def _story_llm_params(self, request: StoryGenerationRequest) -> dict[str, Any]:
+        return {
+            "temperature": 1.2,
+            "num_ctx": 2048,
+            "num_predict": self._tokens_to_predict(request),
+        }
 
-    async def _generate_story(
-        self,
-        request: StoryGenerationRequest,
-        insights: ImageInsights,
-    ) -> StoryGenerationResponse:
+    def _tokens_to_predict(self, request: StoryGenerationRequest) -> int:
+        return max(256, min(1024, int(self._max_words(request) * 1.3)))
+
+    def _max_words(self, request: StoryGenerationRequest) -> int:
         wpm = flavour_to_wpm[request.flavor]
         minutes = 4.0
         speech_margin = 0.92  # need this for pauses and extra effects
-        max_words = int(wpm * minutes * speech_margin)
+        return int(wpm * minutes * speech_margin)
 
-        tokens_to_predict = max(256, min(1024, int(max_words * 1.3)))
+    def _build_story_messages(self, request: StoryGenerationRequest, insights: ImageInsights) -> list[dict]:
+        max_words = self._max_words(request)
 
         if request.eighting_plus_enabled:
             content_guideline = (
@@ -175,32 +196,7 @@ class StoryGenerator:
             f"{context_line}"
         )
 
-        messages = [
+        return [
             {"role": "system", "content": [{"type": "text", "text": system}]},
             {"role": "user", "content": [{"type": "text", "text": user}]},
         ]
-
-        llm = ChatOllama(
-            model=self._txt_model_name,
-            base_url=self._ollama_url,
-            temperature=1.2,
-            num_ctx=2048,
-            num_predict=tokens_to_predict,
-        )
-        
-        story_text = (await llm.ainvoke(messages)).content
-
-        return StoryGenerationResponse(title=insights.title, text=str(story_text))
-
-    @staticmethod
-    def _image_to_data_url(image_bytes: bytes, mime: str = "image/jpeg") -> str:
-        b64 = base64.b64encode(image_bytes).decode("ascii")
-        return f"data:{mime};base64,{b64}"
-    
-    def _convert_image_to_jpeg(self, image_bytes: bytes) -> bytes:
-        with BytesIO(image_bytes) as input_buffer, BytesIO() as output_buffer:
-            image = Image.open(input_buffer).convert("RGB")
-            image.thumbnail((768, 768), Image.Resampling.LANCZOS)
-            image.save(output_buffer, format="JPEG", quality=70, subsampling=2, optimize=True)
-
-            return output_buffer.getvalue()
@@ -0,0 +1,170 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Hashable, Iterator
+
+import httpx
+from langchain_core.runnables import Runnable
+from langchain_ollama import ChatOllama
+from pydantic import BaseModel
+
+from ..metrics import OLLAMA_IN_FLIGHT, OLLAMA_QUEUE_WAIT_SECONDS, OLLAMA_WAITING
+
+
+class OllamaClientPool:
+    def __init__(
+        self,
+        base_urls: list[str],
+        max_concurrency_per_model: int,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry_seconds: float,
+        timeout_seconds: float | None,
+    ) -> None:
+        if not base_urls:
+            raise ValueError("At least one Ollama base URL is required")
+
+        self._base_urls = itertools.cycle(base_urls)
+        self._max_concurrency = max_concurrency_per_model
+        self._client_kwargs = {
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry_seconds,
+            ),
+            "timeout": timeout_seconds,
+        }
+
+        self._models: dict[Hashable, ChatOllama] = {}
+        self._clients: dict[Hashable, Runnable] = {}
+        self._semaphores: dict[tuple[str, str], asyncio.Semaphore] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self._logger = logging.getLogger(__name__)
+
+    @asynccontextmanager
+    async def chat(
+        self,
+        model: str,
+        schema: type[BaseModel] | None = None,
+        **params: Any,
+    ) -> AsyncIterator[Runnable]:
+        base_url = next(self._base_urls)
+        self._loop = asyncio.get_running_loop()
+
+        async with self._limited(base_url, model):
+            yield self._client_for(base_url, model, schema, params)
+
+    async def aclose(self) -> None:
+        models = list(self._models.values())
+        self._models.clear()
+        self._clients.clear()
+
+        for llm in models:
+            llm._client._client.close()
+            await llm._async_client._client.aclose()
+
+    def close(self) -> None:
+        if (loop := self._loop) is None or loop.is_closed():
+            return
+
+        # The async httpx clients must be closed on the loop that opened their connections, which is either
+        # idle (worker shutdown), running in another thread, or running this very call (nothing can block it).
+        closing = self.aclose()
+        if not loop.is_running():
+            loop.run_until_complete(closing)
+        elif self._is_current(loop):
+            loop.create_task(closing)
+        else:
+            asyncio.run_coroutine_threadsafe(closing, loop).result()
+
+    @staticmethod
+    def _is_current(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+    @asynccontextmanager
+    async def _limited(self, base_url: str, model: str) -> AsyncIterator[None]:
+        semaphore = self._semaphore_for(base_url, model)
+        labels = {"backend": base_url, "model": model}
+
+        if semaphore.locked():
+            self._logger.info(f"Waiting for a free `{model}` slot on {base_url}...")
+
+        OLLAMA_WAITING.labels(**labels).inc()
+        queued_at = time.monotonic()
+        try:
+            await semaphore.acquire()
+        finally:
+            OLLAMA_WAITING.labels(**labels).dec()
+
+        OLLAMA_QUEUE_WAIT_SECONDS.labels(**labels).observe(time.monotonic() - queued_at)
+        OLLAMA_IN_FLIGHT.labels(**labels).inc()
+        try:
+            yield
+        finally:
+            OLLAMA_IN_FLIGHT.labels(**labels).dec()
+            semaphore.release()
+
+    def _semaphore_for(self, base_url: str, model: str) -> asyncio.Semaphore:
+        key = (base_url, model)
+
+        if key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(self._max_concurrency)
+
+        return self._semaphores[key]
+
+    def _client_for(
+        self,
+        base_url: str,
+        model: str,
+        schema: type[BaseModel] | None,
+        params: dict[str, Any],
+    ) -> Runnable:
+        model_key = (base_url, model, tuple(sorted(params.items())))
+        key = (*model_key, schema)
+
+        if key not in self._clients:
+            if model_key not in self._models:
+                self._models[model_key] = self._build_model(base_url, model, params)
+
+            llm = self._models[model_key]
+            self._clients[key] = llm if schema is None else llm.with_structured_output(schema)
+
+        return self._clients[key]
+
+    def _build_model(self, base_url: str, model: str, params: dict[str, Any]) -> ChatOllama:
+        self._logger.info(f"Creating Ollama client for `{model}` on {base_url} with {params}")
+
+        return ChatOllama(
+            model=model,
+            base_url=base_url,
+            client_kwargs=self._client_kwargs,
+            **params,
+        )
+
+
+def create_ollama_client_pool(
+    base_urls: list[str],
+    max_concurrency_per_model: int,
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry_seconds: float,
+    timeout_seconds: float | None,
+) -> Iterator[OllamaClientPool]:
+    pool = OllamaClientPool(
+        base_urls=base_urls,
+        max_concurrency_per_model=max_concurrency_per_model,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry_seconds=keepalive_expiry_seconds,
+        timeout_seconds=timeout_seconds,
+    )
+    try:
+        yield pool
+    finally:
+        pool.close()
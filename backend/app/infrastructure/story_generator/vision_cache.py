@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, TypeVar
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+
+from ..lru import LRUCache
+from ..metrics import VISION_CACHE_REQUESTS
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class VisionResultCache:
+    def __init__(self, db: AsyncIOMotorDatabase, max_entries: int, ttl_seconds: int) -> None:
+        self.collection = db.vision_cache
+        self._memory: LRUCache[str, tuple[datetime, dict]] = LRUCache(max_size=max_entries)
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._in_flight: dict[str, asyncio.Future[dict]] = {}
+
+        self._logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def key_for(kind: str, image_hash: str, model_name: str, *prompt_inputs: str | None) -> str:
+        raw_key = json.dumps([kind, image_hash, model_name, *prompt_inputs])
+        return f"{kind}:{hashlib.sha256(raw_key.encode()).hexdigest()}"
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def get_or_compute(self, key: str, model_type: type[M], compute: Callable[[], Awaitable[M]]) -> M:
+        kind = key.split(":", 1)[0]
+
+        if (payload := self._get_from_memory(key)) is not None:
+            VISION_CACHE_REQUESTS.labels(kind=kind, result="memory_hit").inc()
+            return model_type.model_validate(payload)
+
+        if (pending := self._in_flight.get(key)) is not None:
+            await asyncio.wait([pending])
+
+            if not pending.cancelled():
+                VISION_CACHE_REQUESTS.labels(kind=kind, result="coalesced").inc()
+                return model_type.model_validate(pending.result())
+
+        return model_type.model_validate(await self._compute_once(key, kind, compute))
+
+    async def _compute_once(self, key: str, kind: str, compute: Callable[[], Awaitable[BaseModel]]) -> dict:
+        future: asyncio.Future[dict] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+
+        try:
+            payload = await self._load_or_compute(key, kind, compute)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+        future.set_result(payload)
+        return payload
+
+    async def _load_or_compute(self, key: str, kind: str, compute: Callable[[], Awaitable[BaseModel]]) -> dict:
+        if (payload := await self._get_from_mongo(key)) is not None:
+            VISION_CACHE_REQUESTS.labels(kind=kind, result="mongo_hit").inc()
+            self._put_to_memory(key, payload)
+            return payload
+
+        VISION_CACHE_REQUESTS.labels(kind=kind, result="miss").inc()
+
+        payload = (await compute()).model_dump(mode="json")
+        self._put_to_memory(key, payload)
+        await self._put_to_mongo(key, kind, payload)
+
+        return payload
+
+    def _get_from_memory(self, key: str) -> dict | None:
+        if (entry := self._memory.get(key)) is None:
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= datetime.now(tz=timezone.utc):
+            self._memory.pop(key)
+            return None
+
+        return payload
+
+    def _put_to_memory(self, key: str, payload: dict) -> None:
+        self._memory.put(key, (datetime.now(tz=timezone.utc) + self._ttl, payload))
+
+    async def _get_from_mongo(self, key: str) -> dict | None:
+        try:
+            document = await self.collection.find_one(
+                {"_id": key, "expires_at": {"$gt": datetime.now(tz=timezone.utc)}},
+            )
+        except Exception as exc:
+            self._logger.warning(f"Failed to read vision cache entry `{key}`: {exc}")
+            return None
+
+        return None if document is None else document["payload"]
+
+    async def _put_to_mongo(self, key: str, kind: str, payload: dict) -> None:
+        try:
+            await self.collection.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "kind": kind,
+                    "payload": payload,
+                    "expires_at": datetime.now(tz=timezone.utc) + self._ttl,
+                },
+                upsert=True,
+            )
+        except Exception as exc:
+            self._logger.warning(f"Failed to persist vision cache entry `{key}`: {exc}")
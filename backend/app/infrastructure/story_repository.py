@@ -1,39 +1,117 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+
+from app.domain import (
+    STORY_PREVIEW_LENGTH,
+    AudioCodec,
+    IStoryRepository,
+    Story,
+    StoryFlavor,
+    StoryPage,
+    StoryStatus,
+    StorySummary,
+)
+from app.exceptions import InvalidCursor, StaleStoryWrite
 
-from app.domain import IStoryRepository, Story, StoryFlavor, StoryStatus
+from .metrics import MONGO_OPERATION_SECONDS
 
 
 class MongoStoryRepository(IStoryRepository):
+    _LIST_SORT = [("created_at", DESCENDING), ("id", DESCENDING)]
+    _LIST_PROJECTION = {
+        "_id": 0,
+        "id": 1,
+        "flavor": 1,
+        "title": 1,
+        "created_at": 1,
+        "status": 1,
+        "audio_url": 1,
+        "story_text_head": {"$substrCP": ["$story_text", 0, STORY_PREVIEW_LENGTH + 1]},
+    }
+
     def __init__(self, db: AsyncIOMotorDatabase) -> None:
         self.db = db
         self.collection = db.stories
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index([("id", ASCENDING)], unique=True)
+        await self.collection.create_index(self._LIST_SORT)
+        await self.collection.create_index([("batch_id", ASCENDING)], sparse=True)
+        await self.collection.create_index([("status", ASCENDING), ("created_at", DESCENDING)])
     
     async def save(self, story: Story) -> None:
-        story_dict = {
-            "id": story.id,
-            "flavor": story.flavor.value,
-            "title": story.title,
-            "story_text": story.story_text,
-            "created_at": story.created_at,
-            "status": story.status.value,
-            "image_url": story.image_url,
-            "audio_url": story.audio_url,
-            "audio_duration_seconds": story.audio_duration_seconds,
-            "generation_time_seconds": story.generation_time_seconds,
-            "error_message": story.error_message,
-        }
+        story.updated_at = datetime.now(tz=timezone.utc)
 
-        await self.collection.replace_one(
-            {"id": story.id}, 
-            story_dict, 
-            upsert=True,
-        )
+        with MONGO_OPERATION_SECONDS.labels(operation="save").time():
+            await self.collection.replace_one(
+                {"id": story.id}, 
+                self._story_to_document(story), 
+                upsert=True,
+            )
+        story.mark_persisted()
+
+    async def save_many(self, stories: list[Story]) -> None:
+        if not stories:
+            return
+
+        updated_at = datetime.now(tz=timezone.utc)
+        for story in stories:
+            story.updated_at = updated_at
+
+        with MONGO_OPERATION_SECONDS.labels(operation="save_many").time():
+            await self.collection.insert_many([self._story_to_document(story) for story in stories])
+
+        for story in stories:
+            story.mark_persisted()
+
+    async def patch(self, story: Story, expected_status: StoryStatus | None = None) -> None:
+        if not story.changed_fields:
+            return
+
+        story.updated_at = datetime.now(tz=timezone.utc)
+        changed_fields = story.changed_fields
+
+        document = self._story_to_document(story)
+        query: dict = {"id": story.id}
+
+        if expected_status is not None:
+            query["status"] = expected_status.value
+        elif "status" in changed_fields:
+            query["status"] = {"$in": [status.value for status in story.status.allowed_predecessors()]}
+
+        with MONGO_OPERATION_SECONDS.labels(operation="patch").time():
+            result = await self.collection.update_one(
+                query,
+                self._update_for(document, changed_fields),
+            )
+
+        if result.matched_count == 0:
+            raise StaleStoryWrite(
+                f"Story '{story.id}' is missing or already past a state that allows `{story.status.value}`",
+            )
+
+        story.mark_persisted()
     
     async def get_by_id(self, story_id: str) -> Story | None:
         if (document := await self.collection.find_one({"id": story_id})) is None:
             return None
         
-        return self._document_to_story(document)
+        return self.document_to_story(document)
+
+    async def list_by_batch(self, batch_id: str) -> list[Story]:
+        documents = self.collection.find({"batch_id": batch_id}).sort([("created_at", ASCENDING), ("id", ASCENDING)])
+        return [self.document_to_story(document) async for document in documents]
+
+    async def count_in_progress(self, created_after: datetime) -> int:
+        in_progress = [status.value for status in StoryStatus if not status.is_terminal]
+        return await self.collection.count_documents(
+            {"status": {"$in": in_progress}, "created_at": {"$gt": created_after}},
+        )
 
     async def delete(self, story_id: str) -> None:
         await self.collection.delete_one({"id": story_id})
@@ -42,20 +120,96 @@ class MongoStoryRepository(IStoryRepository):
         self, 
         page: int = 1, 
         page_size: int = 10,
-    ) -> tuple[list[Story], int]:
-        skip = (page - 1) * page_size
-        
-        cursor = self.collection.find().sort("created_at", -1).skip(skip).limit(page_size)
-        stories: list[Story] = []
+        cursor: str | None = None,
+    ) -> StoryPage:
+        query = {} if cursor is None else self._after_cursor_filter(cursor)
+        skip = 0 if cursor is not None else (page - 1) * page_size
 
-        async for document in cursor:
-            stories.append(self._document_to_story(document))
-        
-        total = await self.collection.count_documents({})
+        documents = (
+            self.collection.find(query, self._LIST_PROJECTION)
+            .sort(self._LIST_SORT)
+            .skip(skip)
+            .limit(page_size + 1)
+        )
+        stories = [self._document_to_summary(document) async for document in documents]
+
+        next_cursor = None
+        if len(stories) > page_size:
+            stories = stories[:page_size]
+            next_cursor = self._encode_cursor(stories[-1])
+
+        return StoryPage(
+            stories=stories,
+            total=await self.collection.estimated_document_count(),
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def _encode_cursor(story: StorySummary) -> str:
+        raw_cursor = json.dumps([story.created_at.isoformat(), story.id])
+        return base64.urlsafe_b64encode(raw_cursor.encode()).decode("ascii")
+
+    @staticmethod
+    def _after_cursor_filter(cursor: str) -> dict:
+        try:
+            raw_created_at, story_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            created_at = datetime.fromisoformat(raw_created_at)
+        except (binascii.Error, UnicodeError, TypeError, ValueError) as exc:
+            raise InvalidCursor(f"Malformed pagination cursor: `{cursor}`") from exc
+
+        return {
+            "$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "id": {"$lt": story_id}},
+            ],
+        }
+
+    @staticmethod
+    def _update_for(document: dict, changed_fields: frozenset[str]) -> dict:
+        update: dict = {"$set": {name: document[name] for name in changed_fields if name in document}}
 
-        return stories, total
+        if unset := [name for name in changed_fields if name not in document]:
+            update["$unset"] = {name: "" for name in unset}
+
+        return update
+
+    def _story_to_document(self, story: Story) -> dict:
+        document = {
+            "id": story.id,
+            "flavor": story.flavor.value,
+            "title": story.title,
+            "story_text": story.story_text,
+            "created_at": story.created_at,
+            "status": story.status.value,
+            "image_url": story.image_url,
+            "image_sha256": story.image_sha256,
+            "audio_url": story.audio_url,
+            "audio_duration_seconds": story.audio_duration_seconds,
+            "audio_codec": story.audio_codec.value if story.audio_codec else None,
+            "generation_time_seconds": story.generation_time_seconds,
+            "error_message": story.error_message,
+            "image_insights": story.image_insights,
+            "stage_timings": story.stage_timings,
+            "updated_at": story.updated_at,
+        }
+
+        if story.batch_id is not None:
+            document["batch_id"] = story.batch_id
+
+        return document
+
+    def _document_to_summary(self, document: dict) -> StorySummary:
+        return StorySummary(
+            id=document["id"],
+            flavor=StoryFlavor(document["flavor"]),
+            title=document.get("title", ""),
+            story_text_head=document.get("story_text_head", ""),
+            created_at=document["created_at"],
+            status=StoryStatus(document["status"]),
+            audio_url=document.get("audio_url"),
+        )
     
-    def _document_to_story(self, document: dict) -> Story:
+    def document_to_story(self, document: dict) -> Story:
         return Story(
             id=document["id"],
             flavor=StoryFlavor(document["flavor"]),
@@ -64,8 +218,14 @@ class MongoStoryRepository(IStoryRepository):
             created_at=document["created_at"],
             status=StoryStatus(document["status"]),
             image_url=document.get("image_url"),
+            image_sha256=document.get("image_sha256"),
             audio_url=document.get("audio_url"),
             audio_duration_seconds=document.get("audio_duration_seconds"),
+            audio_codec=AudioCodec(codec) if (codec := document.get("audio_codec")) else None,
             generation_time_seconds=document.get("generation_time_seconds"),
             error_message=document.get("error_message"),
+            image_insights=document.get("image_insights"),
+            batch_id=document.get("batch_id"),
+            stage_timings=document.get("stage_timings") or {},
+            updated_at=document.get("updated_at"),
         )
@@ -1 +1,5 @@
+from .audio_cache import AudioCache
+from .parallel import ParagraphRenderPool, create_paragraph_render_pool
+from .paragraphs import ParagraphSplitter, split_into_paragraphs
 from .synthesizer import StorySynthesizer
+from .voices import VoiceRegistry
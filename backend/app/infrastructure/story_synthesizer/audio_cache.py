@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, NamedTuple
+from uuid import uuid4
+
+from piper import SynthesisConfig
+
+from ..file_manager import FileManager
+from ..offloader import TaskOffloader
+
+
+class CachedAudio(NamedTuple):
+    audio_url: str
+    duration_seconds: float
+
+
+class AudioCache:
+    STAGING_MAX_AGE_SECONDS = 60 * 60
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        file_manager: FileManager,
+        offloader: TaskOffloader,
+        max_bytes: int,
+        max_age_seconds: float,
+    ) -> None:
+        self._cache_dir = cache_dir
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._files = file_manager
+        self._offloader = offloader
+        self._max_bytes = max_bytes
+        self._max_age_seconds = max_age_seconds
+
+        self._logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def key_for(text: str, voice_name: str, config: SynthesisConfig, **output_options: Any) -> str:
+        payload = json.dumps(
+            {"text": text, "voice": voice_name, "config": asdict(config), "output": output_options},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def link(self, key: str, extension: str) -> CachedAudio | None:
+        return await self._offloader.run_in_thread(self._link, key, extension)
+
+    async def store(self, key: str, audio_url: str, duration_seconds: float) -> None:
+        await self._offloader.run_in_thread(self._store, key, audio_url, duration_seconds)
+
+    async def evict(self) -> int:
+        return await self._offloader.run_in_thread(self._evict)
+
+    def _link(self, key: str, extension: str) -> CachedAudio | None:
+        entry_path, metadata_path = self._paths_for(key, extension)
+
+        try:
+            metadata = json.loads(metadata_path.read_text())
+        except FileNotFoundError:
+            return None
+
+        audio_url, audio_path = self._files.allocate_audio_file(extension)
+        try:
+            self._link_or_copy(entry_path, audio_path)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+
+        self._logger.info(f"Reused cached audio {key} as {audio_url}")
+        return CachedAudio(audio_url=audio_url, duration_seconds=metadata["duration_seconds"])
+
+    def _store(self, key: str, audio_url: str, duration_seconds: float) -> None:
+        entry_path, metadata_path = self._paths_for(key, Path(audio_url).suffix.lstrip("."))
+
+        staging_path = self._cache_dir / f".{uuid4()}.tmp"
+        self._link_or_copy(self._files.resolve_path_from_url(audio_url), staging_path)
+        staging_path.replace(entry_path)
+
+        staging_path.write_text(json.dumps({"duration_seconds": duration_seconds}))
+        staging_path.replace(metadata_path)
+
+    def _evict(self) -> int:
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+
+        for path in self._cache_dir.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            if path.name.startswith("."):
+                if now - stat.st_mtime > self.STAGING_MAX_AGE_SECONDS:
+                    path.unlink(missing_ok=True)
+            elif path.suffix != ".json":
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        evicted = 0
+
+        for last_used, size, path in entries:
+            if total_bytes <= self._max_bytes and now - last_used <= self._max_age_seconds:
+                break
+
+            path.with_suffix(".json").unlink(missing_ok=True)
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            evicted += 1
+
+        self._logger.info(f"Evicted {evicted} audio cache entries, {total_bytes} bytes remain")
+        return evicted
+
+    def _paths_for(self, key: str, extension: str) -> tuple[Path, Path]:
+        return self._cache_dir / f"{key}.{extension}", self._cache_dir / f"{key}.json"
+
+    @staticmethod
+    def _link_or_copy(source: Path, target: Path) -> None:
+        try:
+            os.link(source, target)
+        except FileNotFoundError:
+            raise
+        except OSError:
+            shutil.copyfile(source, target)
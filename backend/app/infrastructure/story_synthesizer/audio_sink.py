@@ -0,0 +1,113 @@
+import subprocess
+import wave
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from app.domain import AudioCodec
+
+
+class AudioSink(ABC):
+    SAMPLE_WIDTH = 2
+    CHANNELS = 1
+
+    def __init__(self, path: Path, sample_rate: int) -> None:
+        self._path = path
+        self._sample_rate = sample_rate
+        self._frames = 0
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    @property
+    def duration_seconds(self) -> float:
+        return self._frames / float(self._sample_rate)
+
+    @abstractmethod
+    def open(self) -> None:
+        pass
+
+    def write(self, pcm: bytes) -> None:
+        self._write_pcm(pcm)
+        self._frames += len(pcm) // (self.SAMPLE_WIDTH * self.CHANNELS)
+
+    @abstractmethod
+    def close(self, failed: bool = False) -> None:
+        pass
+
+    @abstractmethod
+    def _write_pcm(self, pcm: bytes) -> None:
+        pass
+
+
+class WavFileSink(AudioSink):
+    def __init__(self, path: Path, sample_rate: int) -> None:
+        super().__init__(path, sample_rate)
+        self._writer: wave.Wave_write | None = None
+
+    def open(self) -> None:
+        self._writer = wave.open(str(self._path), "wb")
+        self._writer.setnchannels(self.CHANNELS)
+        self._writer.setsampwidth(self.SAMPLE_WIDTH)
+        self._writer.setframerate(self._sample_rate)
+
+    def _write_pcm(self, pcm: bytes) -> None:
+        assert self._writer is not None, "Sink must be opened before writing"
+        self._writer.writeframesraw(pcm)
+
+    def close(self, failed: bool = False) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class FfmpegEncoderSink(AudioSink):
+    _CODEC_ARGS = {
+        AudioCodec.OPUS: ["-c:a", "libopus", "-application", "voip", "-f", "ogg"],
+        AudioCodec.MP3: ["-c:a", "libmp3lame", "-f", "mp3"],
+    }
+
+    def __init__(self, path: Path, sample_rate: int, codec: AudioCodec, bitrate: str) -> None:
+        super().__init__(path, sample_rate)
+        self._codec = codec
+        self._bitrate = bitrate
+        self._process: subprocess.Popen | None = None
+
+    def open(self) -> None:
+        self._process = subprocess.Popen(
+            [
+                "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+                "-f", "s16le", "-ar", str(self._sample_rate), "-ac", str(self.CHANNELS), "-i", "pipe:0",
+                *self._CODEC_ARGS[self._codec], "-b:a", self._bitrate,
+                str(self._path),
+            ],
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def _write_pcm(self, pcm: bytes) -> None:
+        assert self._process is not None and self._process.stdin is not None, "Sink must be opened before writing"
+        self._process.stdin.write(pcm)
+
+    def close(self, failed: bool = False) -> None:
+        if (process := self._process) is None:
+            return
+
+        self._process = None
+
+        if failed:
+            process.kill()
+            process.wait()
+            return
+
+        _, stderr = process.communicate()
+        if process.returncode != 0:
+            self._path.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg failed to encode `{self._path.name}`: {stderr.decode(errors='replace')}")
+
+
+def create_audio_sink(path: Path, sample_rate: int, codec: AudioCodec, bitrate: str) -> AudioSink:
+    if codec is AudioCodec.WAV:
+        return WavFileSink(path, sample_rate)
+
+    return FfmpegEncoderSink(path, sample_rate, codec, bitrate)
@@ -0,0 +1,25 @@
+from piper import SynthesisConfig
+
+from app.domain import StoryFlavor
+
+from .constants import flavour_to_wpm
+
+
+def estimate_speech_seconds(text: str, flavor: StoryFlavor, config: SynthesisConfig) -> float:
+    words = len(text.split())
+    return words / flavour_to_wpm[flavor] * 60 * (config.length_scale or 1.0)
+
+
+class DurationBudget:
+    def __init__(self, max_seconds: float, sample_rate: int) -> None:
+        self._max_frames = int(max_seconds * sample_rate)
+        self._frames = 0
+        self.exceeded = False
+
+    def admit(self, frames: int) -> bool:
+        if self._frames + frames > self._max_frames:
+            self.exceeded = True
+            return False
+
+        self._frames += frames
+        return True
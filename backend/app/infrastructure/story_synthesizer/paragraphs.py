@@ -0,0 +1,42 @@
+import re
+
+
+class ParagraphSplitter:
+    _SCENE_BREAK = re.compile(r"^\s*-{3,}\s*$")
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._lines: list[str] = []
+
+    def feed(self, text: str) -> list[str]:
+        self._pending += text
+        *complete_lines, self._pending = self._pending.split("\n")
+
+        return [paragraph for line in complete_lines if (paragraph := self._consume_line(line)) is not None]
+
+    def flush(self) -> list[str]:
+        paragraphs = [self._consume_line(self._pending), self._close_paragraph()]
+        self._pending = ""
+
+        return [paragraph for paragraph in paragraphs if paragraph is not None]
+
+    def _consume_line(self, line: str) -> str | None:
+        if line.strip() and not self._SCENE_BREAK.match(line):
+            self._lines.append(line.strip())
+            return None
+
+        return self._close_paragraph()
+
+    def _close_paragraph(self) -> str | None:
+        if not self._lines:
+            return None
+
+        paragraph = "\n".join(self._lines)
+        self._lines = []
+
+        return paragraph
+
+
+def split_into_paragraphs(text: str) -> list[str]:
+    splitter = ParagraphSplitter()
+    return [*splitter.feed(text), *splitter.flush()]
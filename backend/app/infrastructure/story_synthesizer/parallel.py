@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from piper import PiperVoice, SynthesisConfig
+
+from ..offloader import OffloadPool
+from .voices import VoiceRegistry
+
+
+def render_paragraph(voice: PiperVoice, paragraph: str, config: SynthesisConfig) -> bytes:
+    return b"".join(chunk.audio_int16_bytes for chunk in voice.synthesize(paragraph, syn_config=config))
+
+
+class ParagraphRenderPool:
+    def __init__(self, workers: int, voices: VoiceRegistry) -> None:
+        self.size = workers
+        self._voices = voices
+        self._pool = OffloadPool(
+            name="synthesis",
+            executor=ThreadPoolExecutor(max_workers=workers, thread_name_prefix="synthesis"),
+            size=workers,
+        )
+
+    async def render(self, voice_name: str, paragraph: str, config: SynthesisConfig) -> bytes:
+        return await self._pool.run(self._render, voice_name, paragraph, config)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+    def _render(self, voice_name: str, paragraph: str, config: SynthesisConfig) -> bytes:
+        return render_paragraph(self._voices.get(voice_name), paragraph, config)
+
+
+def create_paragraph_render_pool(workers: int, voices: VoiceRegistry) -> Iterator[ParagraphRenderPool | None]:
+    if workers <= 0:
+        yield None
+        return
+
+    pool = ParagraphRenderPool(workers=workers, voices=voices)
+    try:
+        yield pool
+    finally:
+        pool.shutdown()
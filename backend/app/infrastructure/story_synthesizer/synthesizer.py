@@ -1,19 +1,44 @@
-import io
+import asyncio
 import logging
+from collections import deque
+from contextlib import aclosing
+from time import perf_counter
+from typing import AsyncGenerator, AsyncIterable, AsyncIterator, Iterable
 
-import wave
 from piper import PiperVoice, SynthesisConfig
 
-from app.domain import Story, StoryFlavor, StoryStatus
+from app.domain import AudioCodec, Story, StoryFlavor, StoryStatus
 
 from ..file_manager import FileManager
+from ..metrics import TTS_REAL_TIME_FACTOR
+from ..offloader import TaskOffloader
+from .audio_cache import AudioCache
+from .audio_sink import create_audio_sink
+from .duration import DurationBudget, estimate_speech_seconds
+from .paragraphs import split_into_paragraphs
+from .parallel import ParagraphRenderPool, render_paragraph
+from .voices import VoiceRegistry
 
 
 class StorySynthesizer:
-    MAX_AUDIO_DURATION_SECONDS = 4 * 60
-
-    def __init__(self, file_manager: FileManager) -> None:
-        self._voice = PiperVoice.load(model_path="/app/en_US-lessac-medium.onnx")
+    ESTIMATE_TOLERANCE = 1.15
+
+    def __init__(
+        self,
+        voices: VoiceRegistry,
+        audio_cache: AudioCache,
+        file_manager: FileManager,
+        offloader: TaskOffloader,
+        audio_codec: AudioCodec,
+        audio_bitrate: str,
+        max_audio_duration_seconds: float,
+        trim_overlong_audio: bool,
+        paragraph_silence_seconds: float,
+        render_pool: ParagraphRenderPool | None = None,
+    ) -> None:
+        self._voices = voices
+        self._audio_cache = audio_cache
+        self._render_pool = render_pool
 
         self._config_for_flavor = {
             StoryFlavor.FAIRY_TALE: SynthesisConfig(length_scale=1.10, noise_scale=0.70, noise_w_scale=0.8, volume=1.0),
@@ -23,46 +48,168 @@ class StorySynthesizer:
         }
 
         self._files = file_manager
+        self._offloader = offloader
+        self._audio_codec = audio_codec
+        self._audio_bitrate = audio_bitrate
+        self._max_audio_duration_seconds = max_audio_duration_seconds
+        self._trim_overlong_audio = trim_overlong_audio
+        self._paragraph_silence_seconds = paragraph_silence_seconds
         self._logger = logging.getLogger(__name__)
 
     async def synthesize_audio_for(self, story: Story) -> Story:
-        self._logger.info(f"Synthesizing audio for story {story.title}...")
-
         config = self._config_for_flavor[story.flavor]
+        paragraphs = split_into_paragraphs(story.story_text)
+
+        estimated_seconds = estimate_speech_seconds(story.story_text, story.flavor, config)
+        estimated_seconds += self._paragraph_silence_seconds * max(len(paragraphs) - 1, 0)
+        self._logger.info(f"Estimated audio duration for story {story.title}: {estimated_seconds:.0f}s")
+
+        limit_seconds = self._max_audio_duration_seconds * self.ESTIMATE_TOLERANCE
+        if not self._trim_overlong_audio and estimated_seconds > limit_seconds:
+            return self._make_audio_too_long(story)
+
+        cache_key = self._audio_cache.key_for(
+            story.story_text,
+            self._voices.voice_name_for(story.flavor),
+            config,
+            codec=self._audio_codec.value,
+            bitrate=self._audio_bitrate,
+            paragraph_silence_seconds=self._paragraph_silence_seconds,
+            max_audio_duration_seconds=self._max_audio_duration_seconds,
+            trim_overlong_audio=self._trim_overlong_audio,
+        )
+
+        if (cached := await self._audio_cache.link(cache_key, self._audio_codec.file_extension)) is not None:
+            story.audio_url = cached.audio_url
+            story.audio_codec = self._audio_codec
+            story.audio_duration_seconds = cached.duration_seconds
+            story.status = StoryStatus.COMPLETED
+            return story
 
-        with io.BytesIO() as buffer:
-            # Provide a proper Wave_write for Piper
-            with wave.open(buffer, "wb") as wav_writer:
-                self._voice.synthesize_wav(
-                    text=story.story_text,
-                    wav_file=wav_writer,
-                    syn_config=config,
-                )
+        started = perf_counter()
+        story = await self.synthesize_paragraphs(story, self._iterate(paragraphs))
 
-            audio_bytes = buffer.getvalue()
+        if story.audio_duration_seconds and story.status is StoryStatus.COMPLETED:
+            real_time_factor = (perf_counter() - started) / story.audio_duration_seconds
+            TTS_REAL_TIME_FACTOR.observe(real_time_factor)
+            story.record_stage_timing("tts_real_time_factor", real_time_factor)
 
-        audio_url = self._files.store_audio(audio_bytes)
+        trimmed = story.error_message is not None
+        if story.status is StoryStatus.COMPLETED and not trimmed and story.audio_url and story.audio_duration_seconds:
+            await self._audio_cache.store(cache_key, story.audio_url, story.audio_duration_seconds)
 
-        story.audio_url = audio_url
+        return story
+
+    async def synthesize_paragraphs(self, story: Story, paragraphs: AsyncIterable[str]) -> Story:
+        self._logger.info(f"Synthesizing audio for story {story.title}...")
 
-        story = self._check_audio_length(audio_bytes, story)
+        config = self._config_for_flavor[story.flavor]
+        voice = await self._offloader.run_in_thread(self._voices.voice_for, story.flavor)
+
+        audio_url, audio_path = self._files.allocate_audio_file(self._audio_codec.file_extension)
+        sink = create_audio_sink(
+            audio_path,
+            sample_rate=voice.config.sample_rate,
+            codec=self._audio_codec,
+            bitrate=self._audio_bitrate,
+        )
+
+        budget = DurationBudget(self._max_audio_duration_seconds, sample_rate=voice.config.sample_rate)
+        silence_frames = int(voice.config.sample_rate * self._paragraph_silence_seconds)
+        silence = bytes(silence_frames * sink.SAMPLE_WIDTH * sink.CHANNELS)
+
+        if self._render_pool is not None:
+            rendered = self._render_in_parallel(self._voices.voice_name_for(story.flavor), paragraphs, config)
+        else:
+            rendered = self._render_sequentially(voice, paragraphs, config)
+
+        await self._offloader.run_in_thread(sink.open)
+
+        spoken = 0
+        try:
+            async with aclosing(rendered):
+                async for index, pcm in self._enumerate(rendered):
+                    pcm = pcm if index == 0 else silence + pcm
+                    if not budget.admit(len(pcm) // (sink.SAMPLE_WIDTH * sink.CHANNELS)):
+                        break
+
+                    await self._offloader.run_in_thread(sink.write, pcm)
+                    spoken += 1
+        except BaseException:
+            await self._offloader.run_in_thread(sink.close, True)
+            await self._files.delete_file(audio_url)
+            raise
+
+        if budget.exceeded and not self._trim_overlong_audio:
+            await self._offloader.run_in_thread(sink.close, True)
+            await self._files.delete_file(audio_url)
+            return self._make_audio_too_long(story)
+
+        await self._offloader.run_in_thread(sink.close)
+
+        if budget.exceeded:
+            self._logger.info(f"Trimmed audio of story {story.title} at the last paragraph within the limit")
+
+        story.error_message = (
+            f"Audio was trimmed to the first {spoken} paragraphs to stay within "
+            f"{self._max_audio_duration_seconds:.0f} seconds"
+            if budget.exceeded
+            else None
+        )
+        story.audio_url = audio_url
+        story.audio_codec = self._audio_codec
+        story.audio_duration_seconds = sink.duration_seconds
+        story.status = StoryStatus.COMPLETED
 
         return story
-    
-    def _calculate_duration_seconds(self, audio_bytes: bytes) -> float | None:
-        with io.BytesIO(audio_bytes) as rb:
-            with wave.open(rb, "rb") as wf:
-                frames = wf.getnframes()
-                framerate = wf.getframerate()
-                return frames / float(framerate) if framerate else None
-
-    def _check_audio_length(self, audio_bytes: bytes, story: Story) -> Story:
-        story.audio_duration_seconds = self._calculate_duration_seconds(audio_bytes)
-        
-        if int(story.audio_duration_seconds or 0) > self.MAX_AUDIO_DURATION_SECONDS:
-            story.status = StoryStatus.AUDIO_TOO_LONG
-            story.error_message = f"Audio duration is too long. Maximum duration is {self.MAX_AUDIO_DURATION_SECONDS} seconds"
-            return story
-        
-        story.status = StoryStatus.COMPLETED
+
+    @staticmethod
+    async def _iterate(paragraphs: Iterable[str]) -> AsyncIterator[str]:
+        for paragraph in paragraphs:
+            yield paragraph
+
+    @staticmethod
+    async def _enumerate(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+        index = 0
+        async for chunk in chunks:
+            yield index, chunk
+            index += 1
+
+    async def _render_sequentially(
+        self,
+        voice: PiperVoice,
+        paragraphs: AsyncIterable[str],
+        config: SynthesisConfig,
+    ) -> AsyncGenerator[bytes, None]:
+        async for paragraph in paragraphs:
+            yield await self._offloader.run_in_thread(render_paragraph, voice, paragraph, config)
+
+    async def _render_in_parallel(
+        self,
+        voice_name: str,
+        paragraphs: AsyncIterable[str],
+        config: SynthesisConfig,
+    ) -> AsyncGenerator[bytes, None]:
+        pool = self._render_pool
+        assert pool is not None
+
+        pending: deque[asyncio.Task[bytes]] = deque()
+        try:
+            async for paragraph in paragraphs:
+                pending.append(asyncio.create_task(pool.render(voice_name, paragraph, config)))
+
+                while pending and (len(pending) > pool.size or pending[0].done()):
+                    yield await pending.popleft()
+
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _make_audio_too_long(self, story: Story) -> Story:
+        story.status = StoryStatus.AUDIO_TOO_LONG
+        story.error_message = (
+            f"Audio duration is too long. Maximum duration is {self._max_audio_duration_seconds:.0f} seconds"
+        )
         return story
@@ -0,0 +1,90 @@
+import json
+import logging
+import threading
+from pathlib import Path
+
+import onnxruntime
+from piper import PiperVoice
+from piper.config import PiperConfig
+
+from app.domain import StoryFlavor
+
+from ..lru import LRUCache
+
+
+class VoiceRegistry:
+    WARM_UP_TEXT = "Once upon a time."
+
+    def __init__(
+        self,
+        voices_dir: Path,
+        default_voice: str,
+        flavor_voices: dict[StoryFlavor, str],
+        max_loaded_voices: int,
+        intra_op_threads: int,
+        inter_op_threads: int,
+    ) -> None:
+        self._voices_dir = voices_dir
+        self._default_voice = default_voice
+        self._flavor_voices = flavor_voices
+        self._intra_op_threads = intra_op_threads
+        self._inter_op_threads = inter_op_threads
+
+        self._voices: LRUCache[str, PiperVoice] = LRUCache(max_size=max_loaded_voices)
+        self._lock = threading.Lock()
+
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def fork_safe(self) -> bool:
+        return self._intra_op_threads == 1 and self._inter_op_threads == 1
+
+    def voice_name_for(self, flavor: StoryFlavor) -> str:
+        return self._flavor_voices.get(flavor, self._default_voice)
+
+    def voice_for(self, flavor: StoryFlavor) -> PiperVoice:
+        return self.get(self.voice_name_for(flavor))
+
+    def get(self, name: str) -> PiperVoice:
+        with self._lock:
+            if (voice := self._voices.get(name)) is None:
+                voice = self._load(name)
+                self._voices.put(name, voice)
+
+            return voice
+
+    def preload(self) -> None:
+        for name in dict.fromkeys([self._default_voice, *self._flavor_voices.values()]):
+            self.get(name)
+
+    def after_fork(self) -> None:
+        if self.fork_safe:
+            return
+
+        self._logger.warning("Dropping voices loaded before fork because their ONNX sessions use thread pools")
+        with self._lock:
+            self._voices.clear()
+
+    def _load(self, name: str) -> PiperVoice:
+        self._logger.info(f"Loading voice {name}...")
+
+        model_path = self._voices_dir / f"{name}.onnx"
+        with open(f"{model_path}.json", encoding="utf-8") as config_file:
+            config = PiperConfig.from_dict(json.load(config_file))
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = self._intra_op_threads
+        options.inter_op_num_threads = self._inter_op_threads
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+
+        session = onnxruntime.InferenceSession(
+            str(model_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        voice = PiperVoice(session=session, config=config)
+
+        for _ in voice.synthesize(self.WARM_UP_TEXT):
+            pass
+
+        return voice
@@ -1,7 +1,11 @@
 from pathlib import Path
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+from app.domain import AudioCodec, GenerationMode, StoryFlavor
+
 
 class Settings(BaseSettings):
     mongo_url: str = Field(
@@ -12,6 +16,26 @@ class Settings(BaseSettings):
         default="story_tailer",
         description="MongoDB database name",
     )
+    story_cache_max_entries: int = Field(
+        default=1024,
+        description="Finished stories kept in the in-process read-through cache",
+    )
+    story_cache_ttl_seconds: float = Field(
+        default=300.0,
+        description="How long a cached story is served before it is re-read from MongoDB",
+    )
+    story_events_backend: Literal["mongo", "local"] = Field(
+        default="mongo",
+        description="Story status events source: MongoDB change streams (needs a replica set) or in-process pub/sub",
+    )
+    story_events_keepalive_seconds: float = Field(
+        default=15.0,
+        description="Idle time after which a story event stream sends a keepalive comment",
+    )
+    story_events_max_stream_seconds: float = Field(
+        default=15 * 60,
+        description="Longest time a story event stream stays open; EventSource clients reconnect after it closes",
+    )
     host: str = Field(
         default="0.0.0.0",
         description="Host to bind the server to",
@@ -25,10 +49,218 @@ class Settings(BaseSettings):
         description="Enable debug mode",
     )
 
+    ollama_url: str = Field(
+        default="http://host.docker.internal:11434",
+        description="Ollama base URL; several comma-separated URLs are used round-robin",
+    )
+    ollama_vlm_model: str = Field(
+        default="qwen2.5vl:7b",
+        description="Vision model used for the safety check and image insights",
+    )
+    ollama_txt_model: str = Field(
+        default="qwen2.5:7b",
+        description="Text model used to write the story",
+    )
+    ollama_max_concurrency_per_process: int = Field(
+        default=2,
+        description=(
+            "Concurrent requests one process sends per model to a single Ollama backend; every prefork "
+            "worker child applies it separately, so a backend can see worker concurrency times this value"
+        ),
+    )
+    ollama_max_connections: int = Field(
+        default=10,
+        description="HTTP connection pool size of each Ollama client",
+    )
+    ollama_max_keepalive_connections: int = Field(
+        default=5,
+        description="Idle HTTP connections kept alive by each Ollama client",
+    )
+    ollama_keepalive_expiry_seconds: float = Field(
+        default=60.0,
+        description="How long idle Ollama HTTP connections are kept alive",
+    )
+    ollama_timeout_seconds: float | None = Field(
+        default=None,
+        description="Ollama HTTP request timeout; unset means no timeout",
+    )
+
+    generation_mode: GenerationMode = Field(
+        default=GenerationMode.STAGED,
+        description=(
+            "staged: text and audio run as chained Celery tasks on the LLM and TTS queues; "
+            "pipelined: one task synthesizes paragraphs while the story text is still streaming from the LLM; "
+            "sequential: one task writes the whole text, then synthesizes it"
+        ),
+    )
+    celery_llm_queue: str = Field(
+        default="llm",
+        description="Celery queue for the Ollama-bound text generation stage",
+    )
+    celery_tts_queue: str = Field(
+        default="tts",
+        description="Celery queue for the CPU-bound speech synthesis stage",
+    )
+    celery_metrics_port: int = Field(
+        default=9100,
+        description="Port of the Prometheus exporter started by each Celery worker; 0 disables it",
+    )
+
+    admission_max_queue_depth: int = Field(
+        default=200,
+        description="Messages waiting on the generation queues above which new stories are rejected with 429",
+    )
+    admission_max_in_flight: int = Field(
+        default=100,
+        description="Unfinished stories above which new stories are rejected with 429",
+    )
+    admission_seconds_per_story: float = Field(
+        default=30.0,
+        description="Estimated backlog drain time per story, used to compute Retry-After",
+    )
+    admission_in_flight_window_seconds: float = Field(
+        default=2 * 60 * 60,
+        description=(
+            "Unfinished stories created longer ago than this are treated as abandoned by a dead worker "
+            "and no longer count against admission_max_in_flight"
+        ),
+    )
+    rate_limit_per_minute: float = Field(
+        default=10.0,
+        description="Sustained story requests allowed per client and API process",
+    )
+    rate_limit_burst: int = Field(
+        default=5,
+        description=(
+            "Story requests a client may make in a burst before the rate limit applies; a larger batch "
+            "needs the whole burst and is paid back at the sustained rate"
+        ),
+    )
+
+    max_batch_size: int = Field(
+        default=50,
+        description="Maximum number of stories accepted by a single batch generation request",
+    )
+
+    offload_thread_pool_size: int = Field(
+        default=8,
+        description="Worker threads for blocking file I/O and ONNX inference",
+    )
+    offload_process_pool_size: int = Field(
+        default=2,
+        description="Processes for CPU-bound image processing in the API; 0 runs it on the worker threads",
+    )
+
+    vision_cache_max_entries: int = Field(
+        default=1024,
+        description="Safety verdicts and image insights kept in the in-process LRU",
+    )
+    vision_cache_ttl_seconds: int = Field(
+        default=7 * 24 * 60 * 60,
+        description="How long cached vision model results stay valid in MongoDB",
+    )
+
+    audio_codec: AudioCodec = Field(
+        default=AudioCodec.WAV,
+        description="Codec of the stored story audio: wav (raw PCM), opus (Ogg) or mp3",
+    )
+    audio_bitrate: str = Field(
+        default="32k",
+        description="Target bitrate for compressed audio codecs",
+    )
+
+    piper_voices_dir: Path = Field(
+        default=Path("/app"),
+        description="Directory holding Piper voices as <name>.onnx with <name>.onnx.json next to them",
+    )
+    piper_default_voice: str = Field(
+        default="en_US-lessac-medium",
+        description="Piper voice used for flavors without a voice of their own",
+    )
+    piper_flavor_voices: dict[StoryFlavor, str] = Field(
+        default_factory=dict,
+        description="Piper voice per story flavor, as a JSON object",
+    )
+    piper_max_loaded_voices: int = Field(
+        default=4,
+        description="Voices kept loaded per process before the least recently used one is dropped",
+    )
+    piper_preload_voices: bool = Field(
+        default=True,
+        description="Load voices in the Celery parent process so prefork children share them",
+    )
+    onnx_intra_op_threads: int = Field(
+        default=1,
+        description="ONNX Runtime threads used inside a single operator",
+    )
+    onnx_inter_op_threads: int = Field(
+        default=1,
+        description="ONNX Runtime threads used to run independent operators in parallel",
+    )
+
+    parallel_synthesis_workers: int = Field(
+        default=0,
+        description="Threads that synthesize paragraphs of a story in parallel; 0 synthesizes them one at a time",
+    )
+    paragraph_silence_seconds: float = Field(
+        default=0.3,
+        description="Silence inserted between synthesized paragraphs",
+    )
+
+    max_audio_duration_seconds: float = Field(
+        default=4 * 60,
+        description="Longest story audio that will be synthesized",
+    )
+    trim_overlong_audio: bool = Field(
+        default=False,
+        description=(
+            "Cut over-long audio at the last paragraph that fits instead of rejecting the story; "
+            "trimmed stories complete with a note in error_message"
+        ),
+    )
+
+    audio_cache_max_bytes: int = Field(
+        default=2 * 1024 * 1024 * 1024,
+        description="Size of the synthesized audio cache above which least recently used entries are evicted",
+    )
+    audio_cache_max_age_seconds: float = Field(
+        default=30 * 24 * 60 * 60,
+        description="Audio cache entries unused for longer than this are evicted",
+    )
+    audio_cache_sweep_interval_seconds: float = Field(
+        default=60 * 60,
+        description="How often Celery beat schedules the audio cache eviction sweep",
+    )
+
+    max_image_bytes: int = Field(
+        default=20 * 1024 * 1024,
+        description="Largest accepted image upload; bigger uploads are rejected with 413",
+    )
+
     base_files_dir: Path = Field(
         default=(Path(__file__).resolve().parent / "files"),
         description="Base directory for storing files",
     )
+    files_delivery_mode: Literal["direct", "x-accel-redirect", "x-sendfile"] = Field(
+        default="direct",
+        description="Serve files from the app, or hand them off to a front proxy via X-Accel-Redirect/X-Sendfile",
+    )
+    files_accel_redirect_location: str = Field(
+        default="/protected-files/",
+        description="Internal proxy location that maps to base_files_dir in x-accel-redirect mode",
+    )
+
+    @property
+    def audio_cache_dir(self) -> Path:
+        return self.base_files_dir / "audio-cache"
+
+    @property
+    def generation_queues(self) -> list[str]:
+        return [self.celery_llm_queue, self.celery_tts_queue, "celery"]
+
+    @property
+    def ollama_urls(self) -> list[str]:
+        return [url.strip() for url in self.ollama_url.split(",") if url.strip()]
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from typing import Any, Coroutine, TypeVar
+
+from app.application import StoryApplication
+from app.containers import ApplicationContainer, bootstrap_storage
+from app.infrastructure import AudioCache
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    def __init__(self) -> None:
+        self._container: ApplicationContainer | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._application: StoryApplication | None = None
+
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop is not None and not self._loop.is_closed()
+
+    @property
+    def application(self) -> StoryApplication:
+        if self._application is None:
+            self.start()
+
+        return self._application  # type: ignore[return-value]
+
+    @property
+    def audio_cache(self) -> AudioCache:
+        if not self.is_running:
+            self.start()
+
+        return self._container.audio_cache()  # type: ignore[union-attr]
+
+    def preload_voices(self) -> None:
+        if self._container is None:
+            self._container = ApplicationContainer()
+
+        self._container.voice_registry().preload()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+
+        self._logger.info("Starting worker runtime...")
+
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        if self._container is None:
+            self._container = ApplicationContainer()
+        else:
+            self._container.voice_registry().after_fork()
+        self._application = self._loop.run_until_complete(self._build_application())
+
+        self._logger.info("Worker runtime started")
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        if not self.is_running:
+            self.start()
+
+        return self._loop.run_until_complete(coroutine)  # type: ignore[union-attr]
+
+    def shutdown(self) -> None:
+        if not self.is_running:
+            return
+
+        self._logger.info("Shutting down worker runtime...")
+
+        loop = self._loop
+        try:
+            self._cancel_pending_tasks()
+            loop.run_until_complete(loop.shutdown_asyncgens())  # type: ignore[union-attr]
+            self._close_container()
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()  # type: ignore[union-attr]
+
+            self._loop = None
+            self._container = None
+            self._application = None
+
+        self._logger.info("Worker runtime stopped")
+
+    async def _build_application(self) -> StoryApplication:
+        container = self._container
+        assert container is not None
+
+        container.offloader.override(container.thread_offloader)
+        container.mongo_client()
+        container.story_synthesizer()
+        container.story_repository.override(container.mongo_story_repository)
+
+        await bootstrap_storage(container)
+
+        return container.application()
+
+    def _cancel_pending_tasks(self) -> None:
+        loop = self._loop
+        assert loop is not None
+
+        if not (pending := asyncio.all_tasks(loop)):
+            return
+
+        for task in pending:
+            task.cancel()
+
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+    def _close_container(self) -> None:
+        container = self._container
+        assert container is not None
+
+        container.mongo_client().close()
+        container.shutdown_resources()
+        container.reset_singletons()
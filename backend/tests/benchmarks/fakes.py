@@ -0,0 +1,155 @@
+import asyncio
+import json
+import random
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+_WORDS = (
+    "the old lighthouse keeper watched a silver storm roll over quiet harbor while children laughed "
+    "beneath lanterns and a curious fox followed footprints across frozen meadow toward forgotten gate"
+).split()
+
+
+class FakeOllamaServer:
+    def __init__(
+        self,
+        first_token_seconds: float = 0.2,
+        tokens_per_second: float = 40.0,
+        max_story_tokens: int = 300,
+    ) -> None:
+        self.first_token_seconds = first_token_seconds
+        self.tokens_per_second = tokens_per_second
+        self.max_story_tokens = max_story_tokens
+        self.requests = 0
+
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle_connection, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+
+        self._server.close()
+        for writer in self._connections:
+            writer.close()
+
+        await asyncio.gather(*self._connections.values(), return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()  # type: ignore[assignment]
+
+        try:
+            while request_line := await reader.readline():
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                _, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+                if path == "/api/chat":
+                    await self._chat(json.loads(body), writer)
+                else:
+                    writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _chat(self, payload: dict, writer: asyncio.StreamWriter) -> None:
+        self.requests += 1
+        model = payload.get("model", "fake")
+
+        if (schema := payload.get("format")) and isinstance(schema, dict):
+            content = json.dumps(_fake_value(schema, "root", schema.get("$defs", {})))
+            pieces = [content[i:i + 16] for i in range(0, len(content), 16)]
+        else:
+            num_predict = (payload.get("options") or {}).get("num_predict") or self.max_story_tokens
+            pieces = list(_story_tokens(min(num_predict, self.max_story_tokens)))
+
+        await asyncio.sleep(self.first_token_seconds)
+
+        if not payload.get("stream", True):
+            body = json.dumps(_chat_chunk(model, "".join(pieces), done=True)).encode()
+            await asyncio.sleep(len(pieces) / self.tokens_per_second)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body,
+            )
+            await writer.drain()
+            return
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n")
+
+        started = time.monotonic()
+        for index, piece in enumerate(pieces):
+            if (delay := started + index / self.tokens_per_second - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            self._write_chunk(writer, _chat_chunk(model, piece, done=False))
+            await writer.drain()
+
+        self._write_chunk(writer, _chat_chunk(model, "", done=True, eval_count=len(pieces)))
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, chunk: dict) -> None:
+        data = json.dumps(chunk).encode() + b"\n"
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+def _chat_chunk(model: str, content: str, done: bool, eval_count: int | None = None) -> dict:
+    chunk: dict[str, Any] = {
+        "model": model,
+        "created_at": datetime.now(tz=timezone.utc).isoformat(),
+        "message": {"role": "assistant", "content": content},
+        "done": done,
+    }
+    if done:
+        chunk.update(done_reason="stop", eval_count=eval_count or 0, prompt_eval_count=0)
+    return chunk
+
+
+def _story_tokens(count: int) -> Iterator[str]:
+    rng = random.Random()
+    for index in range(count):
+        if index and index % 60 == 0:
+            yield ".\n\n"
+        yield ("" if index % 60 == 0 else " ") + rng.choice(_WORDS)
+    yield "."
+
+
+def _fake_value(schema: dict, name: str, defs: dict) -> Any:
+    if (ref := schema.get("$ref")) is not None:
+        schema = defs[ref.rsplit("/", 1)[-1]]
+
+    if (options := schema.get("anyOf")) is not None:
+        schema = next((option for option in options if option.get("type") != "null"), options[0])
+
+    schema_type = schema.get("type")
+
+    if schema_type == "object":
+        properties = schema.get("properties", {})
+        return {key: _fake_value(value, key, defs) for key, value in properties.items()}
+    if schema_type == "array":
+        return [_fake_value(schema.get("items", {"type": "string"}), name, defs) for _ in range(3)]
+    if schema_type == "boolean":
+        return False
+    if schema_type == "integer":
+        return 1
+    if schema_type == "number":
+        return 0.5
+
+    return f"benchmark {name} {random.choice(_WORDS)}"
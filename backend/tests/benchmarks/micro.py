@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from app.api.serializers import StoryGenerationResponse, StoryListItem, StoryListResponse
+from app.domain import AudioCodec, Story, StoryFlavor, StoryStatus
+from app.infrastructure.images import convert_image_to_jpeg, normalize_image
+
+from ..fakes import InMemoryStoryRepository, make_story, random_jpeg
+from .report import print_stage_table
+
+
+def measure(samples: dict[str, list[float]], name: str, func: Callable[[], Any], repeat: int) -> None:
+    func()
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        samples[name].append(perf_counter() - started)
+
+
+async def measure_async(
+    samples: dict[str, list[float]],
+    name: str,
+    func: Callable[[], Awaitable[Any]],
+    repeat: int,
+) -> None:
+    await func()
+    for _ in range(repeat):
+        started = perf_counter()
+        await func()
+        samples[name].append(perf_counter() - started)
+
+
+def sample_story(index: int, created_at: datetime) -> Story:
+    return make_story(
+        flavor=list(StoryFlavor)[index % len(StoryFlavor)],
+        title=f"Benchmark story {index}",
+        story_text="Once upon a time a fox crossed the frozen meadow. " * 60,
+        created_at=created_at,
+        status=StoryStatus.COMPLETED,
+        image_url=f"images/{uuid4()}.jpg",
+        audio_url=f"audio/{uuid4()}.ogg",
+        audio_duration_seconds=182.4,
+        audio_codec=AudioCodec.OPUS,
+        generation_time_seconds=41.7,
+    )
+
+
+def image_benchmarks(samples: dict[str, list[float]], repeat: int) -> None:
+    for width, height in ((1280, 960), (4032, 3024)):
+        image = random_jpeg(width, height)
+        measure(samples, f"convert_image_to_jpeg {width}x{height}", lambda: convert_image_to_jpeg(image), repeat)
+        measure(samples, f"normalize_image {width}x{height}", lambda: normalize_image(image), repeat)
+
+
+def serializer_benchmarks(samples: dict[str, list[float]], repeat: int) -> None:
+    now = datetime.now(tz=timezone.utc)
+    story = sample_story(0, now)
+    page = [sample_story(index, now - timedelta(seconds=index)) for index in range(100)]
+
+    measure(
+        samples,
+        "StoryGenerationResponse dump",
+        lambda: StoryGenerationResponse.from_domain(story).model_dump_json(by_alias=True),
+        repeat * 10,
+    )
+
+    async def summaries():
+        repository = InMemoryStoryRepository()
+        for item in page:
+            await repository.save(item)
+        return (await repository.list_stories(page_size=100)).stories
+
+    stories = asyncio.run(summaries())
+    measure(
+        samples,
+        "StoryListResponse dump (100)",
+        lambda: StoryListResponse(
+            stories=[StoryListItem.from_domain(item) for item in stories],
+            total=len(stories),
+            page=1,
+            page_size=len(stories),
+        ).model_dump_json(),
+        repeat,
+    )
+
+
+async def list_stories_benchmarks(samples: dict[str, list[float]], repeat: int, mongo_url: str | None) -> None:
+    now = datetime.now(tz=timezone.utc)
+    stories = [sample_story(index, now - timedelta(seconds=index)) for index in range(5000)]
+
+    memory = InMemoryStoryRepository()
+    for story in stories:
+        await memory.save(story)
+    await measure_async(samples, "list_stories in-memory (20)", lambda: memory.list_stories(page_size=20), repeat)
+
+    if mongo_url is None:
+        print("Skipping MongoStoryRepository.list_stories, pass --mongo-url to include it")
+        return
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from app.infrastructure import MongoStoryRepository
+
+    client: AsyncIOMotorClient = AsyncIOMotorClient(mongo_url)
+    database = client[f"story_tailer_bench_{uuid4().hex[:8]}"]
+    try:
+        repository = MongoStoryRepository(database)
+        await repository.ensure_indexes()
+        await repository.save_many(stories)
+
+        first_page = await repository.list_stories(page_size=20)
+        deep_cursor = first_page.next_cursor
+        for _ in range(50):
+            deep_cursor = (await repository.list_stories(page_size=20, cursor=deep_cursor)).next_cursor
+
+        await measure_async(
+            samples,
+            "list_stories mongo page 1",
+            lambda: repository.list_stories(page_size=20),
+            repeat,
+        )
+        await measure_async(
+            samples,
+            "list_stories mongo page 50",
+            lambda: repository.list_stories(page=50, page_size=20),
+            repeat,
+        )
+        await measure_async(
+            samples,
+            "list_stories mongo cursor ~50",
+            lambda: repository.list_stories(page_size=20, cursor=deep_cursor),
+            repeat,
+        )
+    finally:
+        await client.drop_database(database.name)
+        client.close()
+
+
+def main(args: argparse.Namespace) -> None:
+    samples: dict[str, list[float]] = {}
+
+    for name in args.only or ["images", "serializers", "list_stories"]:
+        current: dict[str, list[float]] = defaultdict(list)
+
+        if name == "images":
+            image_benchmarks(current, args.repeat)
+        elif name == "serializers":
+            serializer_benchmarks(current, args.repeat)
+        elif name == "list_stories":
+            asyncio.run(list_stories_benchmarks(current, args.repeat, args.mongo_url))
+
+        samples.update(current)
+
+    print_stage_table("micro-benchmarks", samples)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for hot helpers of the story API")
+    parser.add_argument("--only", nargs="+", choices=["images", "serializers", "list_stories"])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--mongo-url", default=None, help="Also benchmark MongoStoryRepository.list_stories")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    main(parse_args())
@@ -0,0 +1,239 @@
+import os
+
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+
+import argparse
+import asyncio
+import logging
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from uuid import uuid4
+
+import httpx
+from dependency_injector import providers
+
+from app.__main__ import create_app
+from app.api.serializers import StoryGenerationRequest
+from app.containers import ApplicationContainer
+from app.domain import AudioCodec, GenerationMode, Story, StoryFlavor, StoryStatus
+from app.settings import Settings
+
+from ..fakes import InMemoryStoryRepository, MemoryVisionResultCache, StubVoiceRegistry, random_jpeg
+from .fakes import FakeOllamaServer
+from .report import StageTimer, peak_rss_mb, print_stage_table
+
+
+def build_container(args: argparse.Namespace, ollama_url: str, files_dir: Path) -> ApplicationContainer:
+    container = ApplicationContainer()
+    container.settings.override(
+        providers.Object(
+            Settings(
+                ollama_url=ollama_url,
+                ollama_max_concurrency_per_process=args.ollama_concurrency,
+                base_files_dir=files_dir,
+                audio_codec=AudioCodec.WAV,
+                story_events_backend="local",
+                generation_mode=GenerationMode.PIPELINED if args.pipelined else GenerationMode.SEQUENTIAL,
+                parallel_synthesis_workers=0,
+                admission_max_queue_depth=1_000_000,
+                admission_max_in_flight=1_000_000,
+                rate_limit_per_minute=1_000_000,
+                rate_limit_burst=1_000_000,
+            ),
+        ),
+    )
+    container.story_repository.override(providers.Singleton(InMemoryStoryRepository))
+    container.vision_cache.override(providers.Singleton(MemoryVisionResultCache, max_entries=1024, ttl_seconds=3600))
+    container.voice_registry.override(
+        providers.Singleton(StubVoiceRegistry, real_time_factor=args.tts_real_time_factor),
+    )
+    return container
+
+
+def instrument(container: ApplicationContainer, timer: StageTimer) -> None:
+    generator = container.story_generator()
+    synthesizer = container.story_synthesizer()
+    repository = container.story_repository()
+
+    timer.wrap(generator, "perform_elder_content_check", "safety check")
+    timer.wrap(generator, "get_image_insights", "image insights")
+    timer.wrap(synthesizer, "synthesize_paragraphs", "speech synthesis")
+    timer.wrap(container.file_manager(), "store_image", "store image")
+    timer.wrap(repository, "patch", "repository patch")
+
+
+async def create_story(container: ApplicationContainer, request: StoryGenerationRequest, image: bytes) -> str:
+    async def chunks():
+        yield image
+
+    stored = await container.file_manager().store_image(chunks())
+    story = Story(
+        id=str(uuid4()),
+        flavor=request.flavor,
+        title="Story generation in progress...",
+        story_text="Your story is generating, please wait a moment...",
+        created_at=datetime.now(tz=timezone.utc),
+        status=StoryStatus.JUST_CREATED,
+        image_url=stored.url,
+        image_sha256=stored.sha256,
+    )
+    await container.story_repository().save(story)
+    return story.id
+
+
+async def run_pipeline(args: argparse.Namespace, ollama_url: str, files_dir: Path) -> None:
+    container = build_container(args, ollama_url, files_dir)
+    timer = StageTimer()
+    instrument(container, timer)
+    application = container.application()
+
+    request = StoryGenerationRequest(flavor=StoryFlavor.FAIRY_TALE)
+    images = [random_jpeg() for _ in range(min(args.stories, 16))]
+
+    for concurrency in args.concurrency:
+        timer.clear()
+        story_ids = [
+            await create_story(container, request, images[index % len(images)])
+            for index in range(args.stories)
+        ]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(story_id: str) -> None:
+            async with semaphore:
+                started = perf_counter()
+                await application.perform_story_generation(story_id, request)
+                timer.record("total", perf_counter() - started)
+
+        started = perf_counter()
+        await asyncio.gather(*(generate(story_id) for story_id in story_ids))
+        elapsed = perf_counter() - started
+
+        stories = [await application.get_story_by_id(story_id) for story_id in story_ids]
+        failed = sum(story.status is not StoryStatus.COMPLETED for story in stories)
+        for story in stories:
+            for stage, label in (("story_llm", "story text"), ("story_llm_first_token", "story first token")):
+                if (seconds := story.stage_timings.get(stage)) is not None:
+                    timer.record(label, seconds)
+
+        print_stage_table(
+            f"perform_story_generation, concurrency={concurrency}, stories={args.stories}, "
+            f"pipelined={args.pipelined}",
+            timer.samples,
+        )
+        print(f"  throughput: {args.stories / elapsed * 60:.1f} stories/min, not completed: {failed}")
+        print(f"  peak RSS: {peak_rss_mb():.1f} MiB")
+
+    container.shutdown_resources()
+
+
+async def run_endpoints(args: argparse.Namespace, ollama_url: str, files_dir: Path) -> None:
+    container = build_container(args, ollama_url, files_dir)
+    app = create_app(container)
+    timer = StageTimer()
+
+    image = random_jpeg()
+    request_json = StoryGenerationRequest(flavor=StoryFlavor.THRILLER).model_dump_json(by_alias=True)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for concurrency in args.concurrency:
+            timer.clear()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def timed(stage: str, method: str, url: str, **kwargs) -> httpx.Response:
+                async with semaphore:
+                    started = perf_counter()
+                    response = await client.request(method, url, **kwargs)
+                    timer.record(stage, perf_counter() - started)
+                    return response
+
+            started = perf_counter()
+            created = await asyncio.gather(
+                *(
+                    timed(
+                        "POST /stories/generate",
+                        "POST",
+                        "/api/stories/generate",
+                        data={"request": request_json},
+                        files={"image": ("image.jpg", image, "image/jpeg")},
+                    )
+                    for _ in range(args.stories)
+                ),
+            )
+            story_ids = [response.json()["id"] for response in created if response.status_code == 200]
+
+            fetched = await asyncio.gather(
+                *(timed("GET /stories/{id}", "GET", f"/api/stories/{story_id}") for story_id in story_ids),
+            )
+            await asyncio.gather(
+                *(
+                    timed(
+                        "GET /stories/{id} (304)",
+                        "GET",
+                        f"/api/stories/{response.json()['id']}",
+                        headers={"If-None-Match": response.headers["ETag"]},
+                    )
+                    for response in fetched
+                ),
+            )
+            await asyncio.gather(
+                *(timed("GET /stories", "GET", "/api/stories", params={"page_size": 20}) for _ in story_ids),
+            )
+            elapsed = perf_counter() - started
+
+            requests = sum(len(values) for values in timer.samples.values())
+            print_stage_table(f"API endpoints, concurrency={concurrency}, stories={args.stories}", timer.samples)
+            print(f"  throughput: {requests / elapsed:.1f} requests/s, created: {len(story_ids)}/{args.stories}")
+            print(f"  peak RSS: {peak_rss_mb():.1f} MiB")
+
+    container.shutdown_resources()
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = FakeOllamaServer(
+        first_token_seconds=args.first_token_ms / 1000,
+        tokens_per_second=args.tokens_per_second,
+        max_story_tokens=args.story_tokens,
+    )
+    ollama_url = await server.start()
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="story-tailer-bench-") as files_dir:
+            for subdir in ("images", "audio"):
+                (Path(files_dir) / subdir).mkdir()
+
+            if args.suite in ("pipeline", "all"):
+                await run_pipeline(args, ollama_url, Path(files_dir))
+            if args.suite in ("endpoints", "all"):
+                await run_endpoints(args, ollama_url, Path(files_dir))
+    finally:
+        await server.stop()
+
+    print(f"\nfake Ollama served {server.requests} chat requests")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="End-to-end story pipeline benchmark against local stand-ins")
+    parser.add_argument("--suite", choices=["pipeline", "endpoints", "all"], default="all")
+    parser.add_argument("--stories", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--pipelined", action="store_true", help="Overlap speech synthesis with text streaming")
+    parser.add_argument("--first-token-ms", type=float, default=200.0, help="Fake Ollama time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0, help="Fake Ollama decode rate")
+    parser.add_argument("--story-tokens", type=int, default=300, help="Upper bound on fake story length in tokens")
+    parser.add_argument("--ollama-concurrency", type=int, default=4, help="Concurrent requests per model and process")
+    parser.add_argument(
+        "--tts-real-time-factor",
+        type=float,
+        default=0.05,
+        help="Seconds the stub voice spends per second of generated audio",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, force=True)
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,56 @@
+import resource
+import statistics
+import sys
+from collections import defaultdict
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def wrap(self, target: Any, method_name: str, stage: str) -> None:
+        original: Callable[..., Awaitable[Any]] = getattr(target, method_name)
+
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            started = perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                self.samples[stage].append(perf_counter() - started)
+
+        setattr(target, method_name, timed)
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.samples[stage].append(seconds)
+
+    def clear(self) -> None:
+        self.samples.clear()
+
+
+def percentiles(samples: list[float]) -> tuple[float, float, float]:
+    if len(samples) == 1:
+        return samples[0], samples[0], samples[0]
+
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[89], cuts[98]
+
+
+def peak_rss_mb() -> float:
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / scale
+
+
+def print_stage_table(title: str, samples: dict[str, list[float]], unit: str = "ms") -> None:
+    factor = 1000 if unit == "ms" else 1_000_000
+
+    print(f"\n{title}")
+    print(f"  {'stage':<28}{'n':>7}{'p50':>12}{'p90':>12}{'p99':>12}  ({unit})")
+    for stage, values in samples.items():
+        if not values:
+            continue
+        p50, p90, p99 = percentiles(values)
+        print(f"  {stage:<28}{len(values):>7}{p50 * factor:>12.2f}{p90 * factor:>12.2f}{p99 * factor:>12.2f}")
@@ -0,0 +1,173 @@
+import dataclasses
+import random
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from uuid import uuid4
+
+from PIL import Image
+
+from app.domain import IStoryRepository, Story, StoryFlavor, StoryPage, StoryStatus, StorySummary
+from app.exceptions import StaleStoryWrite
+from app.infrastructure import VisionResultCache, VoiceRegistry
+
+
+def make_story(**fields: Any) -> Story:
+    defaults: dict[str, Any] = {
+        "id": uuid4().hex,
+        "flavor": StoryFlavor.FAIRY_TALE,
+        "title": "A quiet harbor",
+        "story_text": "Once upon a time",
+        "created_at": datetime.now(tz=timezone.utc),
+    }
+    return Story(**(defaults | fields))
+
+
+class InMemoryStoryRepository(IStoryRepository):
+    def __init__(self) -> None:
+        self._stories: dict[str, Story] = {}
+
+    async def save(self, story: Story) -> None:
+        story.updated_at = datetime.now(tz=timezone.utc)
+        self._stories[story.id] = self._copy(story)
+        story.mark_persisted()
+
+    async def save_many(self, stories: list[Story]) -> None:
+        for story in stories:
+            await self.save(story)
+
+    async def patch(self, story: Story, expected_status: StoryStatus | None = None) -> None:
+        if not story.changed_fields:
+            return
+
+        stored = self._stories.get(story.id)
+        if expected_status is not None:
+            allowed = [expected_status]
+        elif "status" in story.changed_fields:
+            allowed = story.status.allowed_predecessors()
+        else:
+            allowed = list(StoryStatus)
+
+        if stored is None or stored.status not in allowed:
+            raise StaleStoryWrite(f"Story '{story.id}' is missing or in a state that does not allow this write")
+
+        story.updated_at = datetime.now(tz=timezone.utc)
+        for name in story.changed_fields:
+            setattr(stored, name, getattr(story, name))
+
+        stored.mark_persisted()
+        story.mark_persisted()
+
+    async def get_by_id(self, story_id: str) -> Story | None:
+        story = self._stories.get(story_id)
+        return None if story is None else self._copy(story)
+
+    async def list_by_batch(self, batch_id: str) -> list[Story]:
+        return [self._copy(story) for story in self._stories.values() if story.batch_id == batch_id]
+
+    async def count_in_progress(self, created_after: datetime) -> int:
+        return sum(
+            1
+            for story in self._stories.values()
+            if not story.status.is_terminal and story.created_at > created_after
+        )
+
+    async def list_stories(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> StoryPage:
+        ordered = sorted(self._stories.values(), key=lambda story: (story.created_at, story.id), reverse=True)
+
+        start = (page - 1) * page_size
+        if cursor is not None:
+            start = next((index + 1 for index, story in enumerate(ordered) if story.id == cursor), len(ordered))
+
+        selected = ordered[start:start + page_size]
+        next_cursor = selected[-1].id if selected and start + page_size < len(ordered) else None
+
+        return StoryPage(
+            stories=[self._summary(story) for story in selected],
+            total=len(ordered),
+            next_cursor=next_cursor,
+        )
+
+    async def delete(self, story_id: str) -> None:
+        self._stories.pop(story_id, None)
+
+    @staticmethod
+    def _copy(story: Story) -> Story:
+        return dataclasses.replace(story)
+
+    @staticmethod
+    def _summary(story: Story) -> StorySummary:
+        return StorySummary(
+            id=story.id,
+            flavor=story.flavor,
+            title=story.title,
+            story_text_head=story.story_text[:101],
+            created_at=story.created_at,
+            status=story.status,
+            audio_url=story.audio_url,
+        )
+
+
+class MemoryVisionResultCache(VisionResultCache):
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        super().__init__(
+            db=SimpleNamespace(vision_cache=None),  # type: ignore[arg-type]
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+
+    async def ensure_indexes(self) -> None:
+        pass
+
+    async def _get_from_mongo(self, key: str) -> dict | None:
+        return None
+
+    async def _put_to_mongo(self, key: str, kind: str, payload: dict) -> None:
+        pass
+
+
+class StubVoice:
+    def __init__(self, sample_rate: int, real_time_factor: float, words_per_second: float = 2.5) -> None:
+        self.config = SimpleNamespace(sample_rate=sample_rate)
+        self._real_time_factor = real_time_factor
+        self._words_per_second = words_per_second
+
+    def synthesize(self, text: str, syn_config: Any = None) -> Iterator[SimpleNamespace]:
+        length_scale = getattr(syn_config, "length_scale", None) or 1.0
+        seconds = len(text.split()) / self._words_per_second * length_scale
+
+        time.sleep(seconds * self._real_time_factor)
+        yield SimpleNamespace(audio_int16_bytes=bytes(int(seconds * self.config.sample_rate) * 2))
+
+
+class StubVoiceRegistry(VoiceRegistry):
+    def __init__(self, sample_rate: int = 22050, real_time_factor: float = 0.05) -> None:
+        super().__init__(
+            voices_dir=Path("."),
+            default_voice="stub",
+            flavor_voices={},
+            max_loaded_voices=1,
+            intra_op_threads=1,
+            inter_op_threads=1,
+        )
+        self._sample_rate = sample_rate
+        self._real_time_factor = real_time_factor
+
+    def _load(self, name: str) -> StubVoice:  # type: ignore[override]
+        return StubVoice(sample_rate=self._sample_rate, real_time_factor=self._real_time_factor)
+
+
+def random_jpeg(width: int = 1280, height: int = 960) -> bytes:
+    image = Image.effect_noise((width, height), random.uniform(20, 80)).convert("RGB")
+    with BytesIO() as buffer:
+        image.save(buffer, format="JPEG", quality=85)
+        return buffer.getvalue()
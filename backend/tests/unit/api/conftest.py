@@ -0,0 +1,52 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from dependency_injector import providers
+from fastapi.testclient import TestClient
+
+from app.__main__ import create_app
+from app.containers import ApplicationContainer
+from app.domain import AudioCodec
+from app.settings import Settings
+from tests.fakes import InMemoryStoryRepository, MemoryVisionResultCache, random_jpeg
+from tests.unit.fakes import FakeOffloader
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Settings:
+    for subdir in ("images", "audio"):
+        (tmp_path / subdir).mkdir()
+
+    return Settings(
+        base_files_dir=tmp_path,
+        audio_codec=AudioCodec.WAV,
+        story_events_backend="local",
+        max_image_bytes=1024 * 1024,
+        max_batch_size=10,
+        rate_limit_burst=5,
+    )
+
+
+@pytest.fixture
+def container(settings: Settings) -> Iterator[ApplicationContainer]:
+    container = ApplicationContainer()
+    container.settings.override(providers.Object(settings))
+    container.offloader.override(providers.Object(FakeOffloader(thread_results={"_read_queue_depth": 0})))
+    container.story_repository.override(providers.Singleton(InMemoryStoryRepository))
+    container.vision_cache.override(providers.Singleton(MemoryVisionResultCache, max_entries=16, ttl_seconds=60))
+
+    yield container
+
+    container.unwire()
+    container.reset_singletons()
+
+
+@pytest.fixture
+def client(container: ApplicationContainer) -> TestClient:
+    return TestClient(create_app(container))
+
+
+@pytest.fixture(scope="session")
+def image() -> bytes:
+    return random_jpeg(width=64, height=48)
@@ -0,0 +1,74 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.settings import Settings
+
+AUDIO = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def audio_url(settings: Settings) -> str:
+    (settings.base_files_dir / "audio" / "story.wav").write_bytes(AUDIO)
+    return "/api/files/audio/story.wav"
+
+
+def test_get_file_serves_the_file_with_an_etag_and_immutable_caching(client: TestClient, audio_url: str) -> None:
+    response = client.get(audio_url)
+
+    assert response.status_code == 200
+    assert response.content == AUDIO
+    assert response.headers["etag"] == f'"story-{len(AUDIO):x}"'
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_get_file_serves_a_byte_range(client: TestClient, audio_url: str) -> None:
+    response = client.get(audio_url, headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == AUDIO[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(AUDIO)}"
+
+
+def test_get_file_is_not_modified_for_a_matching_etag(client: TestClient, audio_url: str) -> None:
+    etag = client.get(audio_url).headers["etag"]
+
+    response = client.get(audio_url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert "immutable" in response.headers["cache-control"]
+
+
+def test_get_file_hands_off_to_the_proxy_in_x_accel_redirect_mode(
+    client: TestClient,
+    settings: Settings,
+    audio_url: str,
+) -> None:
+    settings.files_delivery_mode = "x-accel-redirect"
+
+    response = client.get(audio_url)
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["x-accel-redirect"] == "/protected-files/audio/story.wav"
+    assert "immutable" in response.headers["cache-control"]
+
+
+def test_get_file_hands_off_to_the_proxy_in_x_sendfile_mode(
+    client: TestClient,
+    settings: Settings,
+    audio_url: str,
+) -> None:
+    settings.files_delivery_mode = "x-sendfile"
+
+    response = client.get(audio_url)
+
+    assert response.headers["x-sendfile"] == str(settings.base_files_dir / "audio" / "story.wav")
+
+
+def test_get_file_returns_404_for_a_missing_file(client: TestClient) -> None:
+    response = client.get("/api/files/audio/missing.wav")
+
+    assert response.status_code == 404
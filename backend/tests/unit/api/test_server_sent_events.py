@@ -0,0 +1,53 @@
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+
+from app.api.server_sent_events import with_heartbeats
+
+
+async def _delayed(items: list[str], delay_seconds: float) -> AsyncIterator[str]:
+    for item in items:
+        await asyncio.sleep(delay_seconds)
+        yield item
+
+
+async def _collect(items: AsyncIterator[str | None]) -> list[str | None]:
+    return [item async for item in items]
+
+
+@pytest.mark.anyio
+async def test_with_heartbeats_passes_items_through_until_they_end() -> None:
+    events = await _collect(with_heartbeats(_delayed(["a", "b"], 0.0), interval_seconds=1.0, lifetime_seconds=5.0))
+
+    assert events == ["a", "b"]
+
+
+@pytest.mark.anyio
+async def test_with_heartbeats_fills_idle_gaps_with_heartbeats() -> None:
+    events = await _collect(with_heartbeats(_delayed(["a"], 0.25), interval_seconds=0.1, lifetime_seconds=5.0))
+
+    assert events[-1] == "a"
+    assert events[:-1] == [None] * (len(events) - 1)
+    assert len(events) >= 2
+
+
+@pytest.mark.anyio
+async def test_with_heartbeats_stops_after_its_lifetime() -> None:
+    closed = asyncio.Event()
+
+    async def endless() -> AsyncIterator[str]:
+        try:
+            while True:
+                await asyncio.sleep(10)
+                yield "never"
+        finally:
+            closed.set()
+
+    events = await asyncio.wait_for(
+        _collect(with_heartbeats(endless(), interval_seconds=0.05, lifetime_seconds=0.2)),
+        timeout=2.0,
+    )
+
+    assert events and set(events) == {None}
+    assert closed.is_set()
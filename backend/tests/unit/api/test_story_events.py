@@ -0,0 +1,40 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.containers import ApplicationContainer
+from app.domain import Story, StoryStatus
+from app.settings import Settings
+from tests.fakes import make_story
+
+
+def _save_story(container: ApplicationContainer, status: StoryStatus) -> Story:
+    story = make_story(status=status)
+    asyncio.run(container.story_repository().save(story))
+    return story
+
+
+def test_story_events_close_after_a_terminal_status(client: TestClient, container: ApplicationContainer) -> None:
+    story = _save_story(container, StoryStatus.COMPLETED)
+
+    response = client.get(f"/api/stories/{story.id}/events")
+
+    assert response.status_code == 200
+    assert response.text.count("event: status") == 1
+    assert ": keepalive" not in response.text
+
+
+def test_story_events_send_keepalives_and_close_after_the_max_lifetime(
+    client: TestClient,
+    container: ApplicationContainer,
+    settings: Settings,
+) -> None:
+    settings.story_events_keepalive_seconds = 0.05
+    settings.story_events_max_stream_seconds = 0.3
+    story = _save_story(container, StoryStatus.GENERATING_STORY)
+
+    response = client.get(f"/api/stories/{story.id}/events")
+
+    assert response.status_code == 200
+    assert response.text.startswith("event: status")
+    assert ": keepalive\n\n" in response.text
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from app.api.serializers import StoryGenerationRequest
+from app.containers import ApplicationContainer
+from app.domain import StoryFlavor
+from app.settings import Settings
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _batch_form(size: int, image: bytes) -> dict:
+    request = StoryGenerationRequest(flavor=StoryFlavor.FAIRY_TALE).model_dump(mode="json", by_alias=True)
+
+    return {
+        "data": {"requests": json.dumps([request] * size)},
+        "files": [("images", (f"{index}.jpg", image, "image/jpeg")) for index in range(size)],
+    }
+
+
+def _generate(client: TestClient, image: bytes, content_type: str = "image/jpeg") -> Response:
+    request = StoryGenerationRequest(flavor=StoryFlavor.FAIRY_TALE).model_dump_json(by_alias=True)
+
+    return client.post(
+        "/api/stories/generate",
+        data={"request": request},
+        files={"image": ("image.jpg", image, content_type)},
+    )
+
+
+def test_generate_stores_the_sha256_of_the_upload(
+    client: TestClient,
+    container: ApplicationContainer,
+    image: bytes,
+) -> None:
+    response = _generate(client, image)
+
+    assert response.status_code == 200
+    story = asyncio.run(container.story_repository().get_by_id(response.json()["id"]))
+    assert story is not None
+    assert story.image_sha256 == hashlib.sha256(image).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "upload",
+    [b"%PDF-1.7\n" + bytes(512), b"not an image", PNG_SIGNATURE + bytes(512)],
+    ids=["pdf", "text", "png-signature-only"],
+)
+def test_generate_rejects_a_non_image_upload(client: TestClient, settings: Settings, upload: bytes) -> None:
+    response = _generate(client, upload)
+
+    assert response.status_code == 415
+    assert response.json()["error"] == "Unsupported image"
+    assert list((settings.base_files_dir / "images").iterdir()) == []
+
+
+def test_generate_checks_the_content_not_the_declared_type(client: TestClient, image: bytes) -> None:
+    assert _generate(client, b"not an image", content_type="image/png").status_code == 415
+    assert _generate(client, image, content_type="application/octet-stream").status_code == 200
+
+
+def test_generate_releases_admission_after_a_rejected_upload(client: TestClient, settings: Settings) -> None:
+    settings.rate_limit_burst = 1
+
+    assert _generate(client, b"not an image").status_code == 415
+    assert _generate(client, b"not an image").status_code == 415
+
+
+def test_generate_batch_larger_than_the_rate_limit_burst(client: TestClient, image: bytes) -> None:
+    response = client.post("/api/stories/generate/batch", **_batch_form(6, image))
+
+    assert response.status_code == 200
+    assert len(response.json()["stories"]) == 6
+
+
+def test_generate_batch_is_rate_limited_after_a_batch_larger_than_the_burst(client: TestClient, image: bytes) -> None:
+    client.post("/api/stories/generate/batch", **_batch_form(6, image))
+
+    response = client.post("/api/stories/generate/batch", **_batch_form(2, image))
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_generate_batch_larger_than_max_batch_size_is_rejected(client: TestClient, image: bytes) -> None:
+    response = client.post("/api/stories/generate/batch", **_batch_form(11, image))
+
+    assert response.status_code == 400
+
+
+def test_generate_batch_that_can_never_be_admitted_is_rejected(
+    client: TestClient,
+    settings: Settings,
+    image: bytes,
+) -> None:
+    settings.admission_max_in_flight = 3
+
+    response = client.post("/api/stories/generate/batch", **_batch_form(4, image))
+
+    assert response.status_code == 400
+
+
+def test_generate_rejects_an_oversized_upload_with_cors_headers(client: TestClient, settings: Settings) -> None:
+    request = StoryGenerationRequest(flavor=StoryFlavor.FAIRY_TALE).model_dump_json(by_alias=True)
+    oversized = bytes(settings.max_image_bytes * 2)
+
+    response = client.post(
+        "/api/stories/generate",
+        data={"request": request},
+        files={"image": ("image.jpg", oversized, "image/jpeg")},
+        headers={"Origin": "http://frontend.example"},
+    )
+
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] in ("*", "http://frontend.example")
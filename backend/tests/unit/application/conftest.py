@@ -0,0 +1,108 @@
+from pathlib import Path
+from typing import AsyncIterator, Callable
+
+import pytest
+
+from app.application import StoryApplication
+from app.domain import AudioCodec, GenerationMode, Story, StoryStatus
+from app.infrastructure import (
+    AdmissionController,
+    AudioCache,
+    ClientRateLimiter,
+    FileManager,
+    InMemoryStoryEvents,
+    StorySynthesizer,
+)
+from tests.fakes import InMemoryStoryRepository, StubVoiceRegistry, make_story, random_jpeg
+from tests.unit.fakes import FakeOffloader, FakeStoryGenerator
+
+ApplicationFactory = Callable[..., StoryApplication]
+
+
+@pytest.fixture
+def story_repository() -> InMemoryStoryRepository:
+    return InMemoryStoryRepository()
+
+
+@pytest.fixture
+def application_factory(
+    tmp_path: Path,
+    story_repository: InMemoryStoryRepository,
+    offloader: FakeOffloader,
+    file_manager: FileManager,
+) -> ApplicationFactory:
+    def create(
+        story_text: str,
+        max_audio_duration_seconds: float = 600.0,
+        trim_overlong_audio: bool = False,
+        generation_mode: GenerationMode = GenerationMode.SEQUENTIAL,
+        generator: FakeStoryGenerator | None = None,
+    ) -> StoryApplication:
+        synthesizer = StorySynthesizer(
+            voices=StubVoiceRegistry(real_time_factor=0.0),
+            audio_cache=AudioCache(
+                cache_dir=tmp_path / "audio-cache",
+                file_manager=file_manager,
+                offloader=offloader,  # type: ignore[arg-type]
+                max_bytes=1024 * 1024 * 1024,
+                max_age_seconds=60.0,
+            ),
+            file_manager=file_manager,
+            offloader=offloader,  # type: ignore[arg-type]
+            audio_codec=AudioCodec.WAV,
+            audio_bitrate="32k",
+            max_audio_duration_seconds=max_audio_duration_seconds,
+            trim_overlong_audio=trim_overlong_audio,
+            paragraph_silence_seconds=0.0,
+        )
+
+        return StoryApplication(
+            story_repository=story_repository,
+            events=InMemoryStoryEvents(),
+            generator=generator or FakeStoryGenerator(story_text),  # type: ignore[arg-type]
+            synthesizer=synthesizer,
+            file_manager=file_manager,
+            admission=AdmissionController(
+                story_repository=story_repository,
+                offloader=offloader,  # type: ignore[arg-type]
+                rate_limiter=ClientRateLimiter(requests_per_minute=60.0, burst=5),
+                queue_names=[],
+                max_queue_depth=100,
+                max_in_flight=100,
+                seconds_per_story=30.0,
+                in_flight_window_seconds=3600.0,
+            ),
+            generation_mode=generation_mode,
+        )
+
+    return create
+
+
+@pytest.fixture
+def insights_ready_story(story_repository: InMemoryStoryRepository) -> Callable:
+    async def create() -> Story:
+        story = make_story(
+            story_text="Your story is generating, please wait a moment...",
+            status=StoryStatus.GENERATING_STORY,
+            image_url="images/missing.jpg",
+            image_insights={"title": "A quiet harbor", "caption": "A harbor at dusk", "setting": "harbor"},
+        )
+        await story_repository.save(story)
+        return story
+
+    return create
+
+
+async def image_chunks() -> AsyncIterator[bytes]:
+    yield random_jpeg(width=64, height=48)
+
+
+@pytest.fixture
+def uploaded_story(story_repository: InMemoryStoryRepository, file_manager: FileManager) -> Callable:
+    async def create() -> Story:
+        stored = await file_manager.store_image(image_chunks())
+        story = make_story(status=StoryStatus.JUST_CREATED, image_url=stored.url, image_sha256=stored.sha256)
+        await story_repository.save(story)
+        return story
+
+    return create
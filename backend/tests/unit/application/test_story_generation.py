@@ -0,0 +1,185 @@
+import asyncio
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from app.api.serializers import StoryGenerationRequest
+from app.domain import GenerationMode, StoryFlavor, StoryStatus
+from tests.fakes import make_story
+from tests.unit.fakes import FakeStoryGenerator
+from tests.unit.application.conftest import ApplicationFactory, image_chunks
+
+PARAGRAPH = "the old lighthouse keeper watched a silver storm roll over the quiet harbor"
+STORY_TEXT = "\n\n".join([PARAGRAPH] * 12)
+REQUEST = StoryGenerationRequest(flavor=StoryFlavor.FAIRY_TALE)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("generation_mode", [GenerationMode.SEQUENTIAL, GenerationMode.PIPELINED])
+async def test_generation_keeps_the_whole_text_of_a_story_that_is_too_long(
+    application_factory: ApplicationFactory,
+    insights_ready_story: Callable,
+    generation_mode: GenerationMode,
+) -> None:
+    application = application_factory(
+        STORY_TEXT,
+        max_audio_duration_seconds=20.0,
+        generation_mode=generation_mode,
+    )
+    story = await insights_ready_story()
+
+    await application.perform_story_generation(story.id, REQUEST)
+
+    stored = await application.get_story_by_id(story.id)
+    assert stored.status is StoryStatus.AUDIO_TOO_LONG
+    assert stored.story_text == STORY_TEXT
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("generation_mode", [GenerationMode.SEQUENTIAL, GenerationMode.PIPELINED])
+async def test_generation_trims_only_the_audio_of_a_story_that_is_too_long(
+    application_factory: ApplicationFactory,
+    insights_ready_story: Callable,
+    generation_mode: GenerationMode,
+) -> None:
+    application = application_factory(
+        STORY_TEXT,
+        max_audio_duration_seconds=20.0,
+        trim_overlong_audio=True,
+        generation_mode=generation_mode,
+    )
+    story = await insights_ready_story()
+
+    await application.perform_story_generation(story.id, REQUEST)
+
+    stored = await application.get_story_by_id(story.id)
+    assert stored.status is StoryStatus.COMPLETED
+    assert stored.story_text == STORY_TEXT
+    assert stored.error_message is not None
+    assert 0 < (stored.audio_duration_seconds or 0) <= 20.0
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("generation_mode", [GenerationMode.SEQUENTIAL, GenerationMode.PIPELINED])
+async def test_generation_completes_a_story_within_the_audio_limit(
+    application_factory: ApplicationFactory,
+    insights_ready_story: Callable,
+    generation_mode: GenerationMode,
+) -> None:
+    application = application_factory(STORY_TEXT, generation_mode=generation_mode)
+    story = await insights_ready_story()
+
+    await application.perform_story_generation(story.id, REQUEST)
+
+    stored = await application.get_story_by_id(story.id)
+    assert stored.status is StoryStatus.COMPLETED
+    assert stored.story_text == STORY_TEXT
+    assert stored.error_message is None
+    assert stored.audio_url is not None
+
+
+@pytest.mark.anyio
+async def test_pipelined_generation_discards_partial_audio_when_the_llm_fails(
+    application_factory: ApplicationFactory,
+    insights_ready_story: Callable,
+    tmp_path: Path,
+) -> None:
+    application = application_factory(
+        STORY_TEXT,
+        generation_mode=GenerationMode.PIPELINED,
+        generator=FakeStoryGenerator(STORY_TEXT, stream_error=ConnectionError("Ollama went away")),
+    )
+    story = await insights_ready_story()
+
+    await application.perform_story_generation(story.id, REQUEST)
+
+    stored = await application.get_story_by_id(story.id)
+    assert stored.status is StoryStatus.FAILED
+    assert stored.audio_url is None
+    assert stored.audio_duration_seconds is None
+    assert list((tmp_path / "audio").iterdir()) == []
+
+
+@pytest.mark.anyio
+async def test_restricted_verdict_cancels_the_pending_insights(
+    application_factory: ApplicationFactory,
+    uploaded_story: Callable,
+) -> None:
+    generator = FakeStoryGenerator(
+        STORY_TEXT,
+        restricted_summary="Graphic violence",
+        insights_gate=asyncio.Event(),
+    )
+    application = application_factory(STORY_TEXT, generator=generator)
+    story = await uploaded_story()
+
+    await asyncio.wait_for(application.perform_story_generation(story.id, REQUEST), timeout=5)
+
+    stored = await application.get_story_by_id(story.id)
+    assert stored.status is StoryStatus.RESTRICTED_CONTENT_DETECTED
+    assert "Graphic violence" in stored.story_text
+    assert generator.insights_cancelled
+
+
+@pytest.mark.parametrize(
+    ("generation_mode", "task_names"),
+    [
+        (GenerationMode.STAGED, ["tasks.generate_story_text", "tasks.synthesize_story_audio"]),
+        (GenerationMode.PIPELINED, ["tasks.generate_story"]),
+        (GenerationMode.SEQUENTIAL, ["tasks.generate_story"]),
+    ],
+)
+def test_generation_job_follows_the_generation_mode(
+    application_factory: ApplicationFactory,
+    generation_mode: GenerationMode,
+    task_names: list[str],
+) -> None:
+    application = application_factory(STORY_TEXT, generation_mode=generation_mode)
+    story = make_story()
+
+    job = application._generation_job(story, REQUEST)
+
+    tasks = job.tasks if job.task == "celery.chain" else [job]
+    assert [task.task for task in tasks] == task_names
+
+
+@pytest.mark.anyio
+async def test_initiation_records_the_image_stages(application_factory: ApplicationFactory) -> None:
+    application = application_factory(STORY_TEXT)
+
+    story = await application.initiate_story_generation(REQUEST, image_chunks())
+
+    stored = await application.get_story_by_id(story.id)
+    assert {"image_upload", "image_normalization", "file_write"} <= stored.stage_timings.keys()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("generation_mode", "audio_stages"),
+    [
+        (GenerationMode.SEQUENTIAL, {"tts", "tts_real_time_factor"}),
+        (GenerationMode.STAGED, {"tts", "tts_real_time_factor"}),
+        (GenerationMode.PIPELINED, {"story_llm_and_tts"}),
+    ],
+)
+async def test_generation_records_the_timing_of_every_stage(
+    application_factory: ApplicationFactory,
+    uploaded_story: Callable,
+    generation_mode: GenerationMode,
+    audio_stages: set[str],
+) -> None:
+    application = application_factory(STORY_TEXT, generation_mode=generation_mode)
+    story = await uploaded_story()
+
+    await application.perform_story_generation(story.id, REQUEST)
+
+    stored = await application.get_story_by_id(story.id)
+    assert stored.stage_timings.keys() == {
+        "safety_check",
+        "image_insights",
+        "story_llm",
+        "story_llm_first_token",
+        "repository_save",
+        *audio_stages,
+    }
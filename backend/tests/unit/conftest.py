@@ -0,0 +1,29 @@
+import os
+
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure import FileManager
+from tests.unit.fakes import FakeOffloader
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def offloader() -> FakeOffloader:
+    return FakeOffloader(thread_results={"_read_queue_depth": 0})
+
+
+@pytest.fixture
+def file_manager(tmp_path: Path, offloader: FakeOffloader) -> FileManager:
+    for subdir in ("images", "audio"):
+        (tmp_path / subdir).mkdir()
+
+    return FileManager(base_dir=tmp_path, offloader=offloader, max_image_bytes=1024 * 1024)  # type: ignore[arg-type]
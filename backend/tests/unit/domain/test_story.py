@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain import StoryStatus
+from tests.fakes import make_story
+
+TERMINAL_STATUSES = [
+    StoryStatus.COMPLETED,
+    StoryStatus.FAILED,
+    StoryStatus.AUDIO_TOO_LONG,
+    StoryStatus.RESTRICTED_CONTENT_DETECTED,
+]
+
+
+def test_new_story_has_no_changed_fields() -> None:
+    assert make_story().changed_fields == frozenset()
+
+
+def test_assigned_fields_are_tracked_until_persisted() -> None:
+    story = make_story()
+
+    story.title = "A quiet harbor"
+    story.status = StoryStatus.GENERATING_STORY
+
+    assert story.changed_fields == {"title", "status"}
+
+    story.mark_persisted()
+
+    assert story.changed_fields == frozenset()
+
+
+def test_recorded_stage_timing_is_tracked_and_rounded() -> None:
+    story = make_story()
+    timings = story.stage_timings
+
+    story.record_stage_timing("tts", 1.23456)
+
+    assert story.changed_fields == {"stage_timings"}
+    assert story.stage_timings == {"tts": 1.235}
+    assert timings == {}
+
+
+@pytest.mark.parametrize("status", TERMINAL_STATUSES)
+def test_terminal_status_follows_any_unfinished_status_or_itself(status: StoryStatus) -> None:
+    predecessors = status.allowed_predecessors()
+
+    assert status.is_terminal
+    assert set(predecessors) == {
+        StoryStatus.JUST_CREATED,
+        StoryStatus.GENERATING_STORY,
+        StoryStatus.GENERATING_AUDIO,
+        status,
+    }
+
+
+def test_unfinished_status_never_follows_a_later_or_terminal_status() -> None:
+    assert set(StoryStatus.GENERATING_STORY.allowed_predecessors()) == {
+        StoryStatus.JUST_CREATED,
+        StoryStatus.GENERATING_STORY,
+    }
+    assert set(StoryStatus.GENERATING_AUDIO.allowed_predecessors()) == {
+        StoryStatus.JUST_CREATED,
+        StoryStatus.GENERATING_STORY,
+        StoryStatus.GENERATING_AUDIO,
+    }
+
+
+def test_last_modified_falls_back_to_created_at() -> None:
+    story = make_story()
+
+    assert story.last_modified == story.created_at
+
+    story.updated_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    assert story.last_modified == story.updated_at
@@ -0,0 +1,62 @@
+import asyncio
+import re
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from app.api.serializers import StoryGenerationRequest
+from app.exceptions import RestrictedContentDetected
+from app.infrastructure.story_generator.response_models import ImageInsights
+
+T = TypeVar("T")
+
+
+class FakeOffloader:
+    def __init__(self, thread_results: dict[str, Any] | None = None) -> None:
+        self._thread_results = thread_results or {}
+
+    async def run_in_thread(self, func: Callable[..., T], *args: Any) -> T:
+        if (name := getattr(func, "__name__", "")) in self._thread_results:
+            return self._thread_results[name]
+
+        return func(*args)
+
+    async def run_in_process(self, func: Callable[..., T], *args: Any) -> T:
+        return func(*args)
+
+
+class FakeStoryGenerator:
+    def __init__(
+        self,
+        text: str,
+        stream_error: Exception | None = None,
+        restricted_summary: str | None = None,
+        insights_gate: asyncio.Event | None = None,
+    ) -> None:
+        self.text = text
+        self.insights_cancelled = False
+        self._stream_error = stream_error
+        self._restricted_summary = restricted_summary
+        self._insights_gate = insights_gate
+
+    async def perform_elder_content_check(self, request: StoryGenerationRequest, image: Any) -> None:
+        await asyncio.sleep(0)
+
+        if self._restricted_summary is not None:
+            raise RestrictedContentDetected(self._restricted_summary)
+
+    async def get_image_insights(self, request: StoryGenerationRequest, image: Any) -> ImageInsights:
+        if self._insights_gate is not None:
+            try:
+                await self._insights_gate.wait()
+            except asyncio.CancelledError:
+                self.insights_cancelled = True
+                raise
+
+        return ImageInsights(title="A quiet harbor", caption="A harbor at dusk", setting="harbor")
+
+    async def stream_story(self, request: StoryGenerationRequest, insights: ImageInsights) -> AsyncIterator[str]:
+        for token in re.split(r"(\s+)", self.text):
+            await asyncio.sleep(0)
+            yield token
+
+        if self._stream_error is not None:
+            raise self._stream_error
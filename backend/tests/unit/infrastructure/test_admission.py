@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domain import StoryStatus
+from app.exceptions import AdmissionRejected
+from app.infrastructure import AdmissionController, ClientRateLimiter
+from tests.fakes import InMemoryStoryRepository, make_story
+from tests.unit.fakes import FakeOffloader
+
+
+def _admission(
+    burst: int = 5,
+    requests_per_minute: float = 60.0,
+    max_queue_depth: int = 100,
+    max_in_flight: int = 100,
+    story_repository: InMemoryStoryRepository | None = None,
+) -> AdmissionController:
+    return AdmissionController(
+        story_repository=story_repository or InMemoryStoryRepository(),
+        offloader=FakeOffloader(thread_results={"_read_queue_depth": 0}),  # type: ignore[arg-type]
+        rate_limiter=ClientRateLimiter(requests_per_minute=requests_per_minute, burst=burst),
+        queue_names=[],
+        max_queue_depth=max_queue_depth,
+        max_in_flight=max_in_flight,
+        seconds_per_story=30.0,
+        in_flight_window_seconds=3600.0,
+    )
+
+
+def test_rate_limiter_admits_requests_up_to_the_burst() -> None:
+    limiter = ClientRateLimiter(requests_per_minute=60.0, burst=3)
+
+    assert [limiter.acquire("client") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("client") > 0
+
+
+def test_rate_limiter_keeps_clients_apart() -> None:
+    limiter = ClientRateLimiter(requests_per_minute=60.0, burst=1)
+
+    assert limiter.acquire("first") == 0.0
+    assert limiter.acquire("second") == 0.0
+    assert limiter.acquire("first") > 0
+
+
+def test_rate_limiter_admits_a_batch_larger_than_the_burst_from_a_full_bucket() -> None:
+    limiter = ClientRateLimiter(requests_per_minute=60.0, burst=5)
+
+    assert limiter.acquire("client", cost=20) == 0.0
+    assert limiter.acquire("client") == pytest.approx(16.0, abs=0.1)
+
+
+def test_rate_limiter_waits_for_a_full_bucket_before_a_batch_larger_than_the_burst() -> None:
+    limiter = ClientRateLimiter(requests_per_minute=60.0, burst=5)
+    limiter.acquire("client", cost=2)
+
+    assert limiter.acquire("client", cost=20) == pytest.approx(2.0, abs=0.1)
+
+
+def test_rate_limiter_refund_restores_tokens() -> None:
+    limiter = ClientRateLimiter(requests_per_minute=60.0, burst=1)
+    limiter.acquire("client")
+
+    limiter.refund("client")
+
+    assert limiter.acquire("client") == 0.0
+
+
+@pytest.mark.anyio
+async def test_admission_admits_a_batch_larger_than_the_burst() -> None:
+    admission = _admission(burst=5)
+
+    await admission.admit("client", cost=6)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await admission.admit("client")
+    assert rejected.value.retry_after_seconds == 2
+
+
+@pytest.mark.anyio
+async def test_admission_rejects_work_over_the_in_flight_limit() -> None:
+    admission = _admission(burst=10, max_in_flight=3)
+    await admission.admit("first", cost=2)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await admission.admit("second", cost=2)
+    assert rejected.value.retry_after_seconds == 30
+
+
+@pytest.mark.anyio
+async def test_admission_release_frees_capacity() -> None:
+    admission = _admission(burst=10, max_in_flight=2)
+    await admission.admit("client", cost=2)
+
+    admission.release("client", cost=2)
+
+    await admission.admit("client", cost=2)
+
+
+def test_admission_capacity_is_the_tighter_limit() -> None:
+    assert _admission(max_queue_depth=7, max_in_flight=9).capacity == 7
+
+
+@pytest.mark.anyio
+async def test_admission_counts_unfinished_stories_against_the_in_flight_limit() -> None:
+    now = datetime.now(tz=timezone.utc)
+    story_repository = InMemoryStoryRepository()
+    await story_repository.save(make_story(status=StoryStatus.GENERATING_AUDIO, created_at=now - timedelta(minutes=5)))
+    await story_repository.save(make_story(status=StoryStatus.COMPLETED, created_at=now - timedelta(minutes=5)))
+    admission = _admission(burst=10, max_in_flight=2, story_repository=story_repository)
+
+    await admission.admit("client")
+
+    with pytest.raises(AdmissionRejected):
+        await admission.admit("client")
+
+
+@pytest.mark.anyio
+async def test_admission_ignores_unfinished_stories_older_than_the_window() -> None:
+    now = datetime.now(tz=timezone.utc)
+    story_repository = InMemoryStoryRepository()
+    await story_repository.save(make_story(status=StoryStatus.GENERATING_STORY, created_at=now - timedelta(hours=2)))
+    admission = _admission(burst=10, max_in_flight=1, story_repository=story_repository)
+
+    await admission.admit("client")
@@ -0,0 +1,107 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+from piper import SynthesisConfig
+
+from app.infrastructure import AudioCache, FileManager
+from tests.unit.fakes import FakeOffloader
+
+CONFIG = SynthesisConfig(length_scale=1.0)
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    return tmp_path / "audio-cache"
+
+
+def _cache(cache_dir: Path, file_manager: FileManager, offloader: FakeOffloader, max_bytes: int = 1024) -> AudioCache:
+    return AudioCache(
+        cache_dir=cache_dir,
+        file_manager=file_manager,
+        offloader=offloader,  # type: ignore[arg-type]
+        max_bytes=max_bytes,
+        max_age_seconds=60.0,
+    )
+
+
+def _audio_file(file_manager: FileManager, content: bytes) -> str:
+    audio_url, audio_path = file_manager.allocate_audio_file("wav")
+    audio_path.write_bytes(content)
+    return audio_url
+
+
+def _age(cache_dir: Path, key: str, seconds: float) -> None:
+    last_used = time.time() - seconds
+    os.utime(cache_dir / f"{key}.wav", (last_used, last_used))
+
+
+def test_key_depends_on_text_voice_and_output_options() -> None:
+    key = AudioCache.key_for("Once upon a time", "voice", CONFIG, codec="wav")
+
+    assert key == AudioCache.key_for("Once upon a time", "voice", CONFIG, codec="wav")
+    assert key != AudioCache.key_for("Once upon a time.", "voice", CONFIG, codec="wav")
+    assert key != AudioCache.key_for("Once upon a time", "other", CONFIG, codec="wav")
+    assert key != AudioCache.key_for("Once upon a time", "voice", SynthesisConfig(length_scale=1.1), codec="wav")
+    assert key != AudioCache.key_for("Once upon a time", "voice", CONFIG, codec="mp3")
+
+
+@pytest.mark.anyio
+async def test_stored_audio_is_linked_as_a_new_file(
+    cache_dir: Path,
+    file_manager: FileManager,
+    offloader: FakeOffloader,
+) -> None:
+    cache = _cache(cache_dir, file_manager, offloader)
+    audio_url = _audio_file(file_manager, b"pcm")
+
+    await cache.store("key", audio_url, duration_seconds=1.5)
+    cached = await cache.link("key", "wav")
+
+    assert cached is not None
+    assert cached.audio_url != audio_url
+    assert cached.duration_seconds == 1.5
+    assert file_manager.resolve_path_from_url(cached.audio_url).read_bytes() == b"pcm"
+
+
+@pytest.mark.anyio
+async def test_missing_entry_is_not_linked(
+    cache_dir: Path,
+    file_manager: FileManager,
+    offloader: FakeOffloader,
+) -> None:
+    assert await _cache(cache_dir, file_manager, offloader).link("missing", "wav") is None
+
+
+@pytest.mark.anyio
+async def test_eviction_drops_least_recently_used_entries_until_the_cache_fits(
+    cache_dir: Path,
+    file_manager: FileManager,
+    offloader: FakeOffloader,
+) -> None:
+    cache = _cache(cache_dir, file_manager, offloader, max_bytes=250)
+    for key, age_seconds in (("oldest", 30), ("older", 20), ("newest", 10)):
+        await cache.store(key, _audio_file(file_manager, bytes(100)), duration_seconds=1.0)
+        _age(cache_dir, key, age_seconds)
+
+    assert await cache.evict() == 1
+    assert await cache.link("oldest", "wav") is None
+    assert await cache.link("older", "wav") is not None
+    assert await cache.link("newest", "wav") is not None
+
+
+@pytest.mark.anyio
+async def test_eviction_drops_entries_unused_for_too_long(
+    cache_dir: Path,
+    file_manager: FileManager,
+    offloader: FakeOffloader,
+) -> None:
+    cache = _cache(cache_dir, file_manager, offloader)
+    await cache.store("stale", _audio_file(file_manager, b"pcm"), duration_seconds=1.0)
+    await cache.store("fresh", _audio_file(file_manager, b"pcm"), duration_seconds=1.0)
+    _age(cache_dir, "stale", 120)
+
+    assert await cache.evict() == 1
+    assert not (cache_dir / "stale.json").exists()
+    assert await cache.link("fresh", "wav") is not None
@@ -0,0 +1,106 @@
+import wave
+from pathlib import Path
+
+import pytest
+
+from app.domain import AudioCodec
+from app.infrastructure.story_synthesizer.audio_sink import FfmpegEncoderSink, WavFileSink, create_audio_sink
+
+SAMPLE_RATE = 16000
+PCM = bytes(2 * SAMPLE_RATE)
+
+
+def _install_ffmpeg(directory: Path, script: str) -> None:
+    ffmpeg = directory / "ffmpeg"
+    ffmpeg.write_text(f"#!/bin/sh\n{script}\n")
+    ffmpeg.chmod(0o755)
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", str(bin_dir))
+    return bin_dir
+
+
+def test_wav_sink_writes_a_playable_file(tmp_path: Path) -> None:
+    path = tmp_path / "story.wav"
+    sink = WavFileSink(path, SAMPLE_RATE)
+
+    sink.open()
+    sink.write(PCM)
+    sink.write(PCM)
+    sink.close()
+
+    with wave.open(str(path), "rb") as reader:
+        assert reader.getnchannels() == 1
+        assert reader.getsampwidth() == 2
+        assert reader.getframerate() == SAMPLE_RATE
+        assert reader.getnframes() == 2 * SAMPLE_RATE
+    assert sink.duration_seconds == 2.0
+
+
+def test_wav_sink_close_is_idempotent(tmp_path: Path) -> None:
+    sink = WavFileSink(tmp_path / "story.wav", SAMPLE_RATE)
+    sink.open()
+
+    sink.close()
+    sink.close(failed=True)
+
+
+def test_ffmpeg_sink_pipes_pcm_to_the_encoder(tmp_path: Path, fake_ffmpeg: Path) -> None:
+    _install_ffmpeg(fake_ffmpeg, 'for last; do :; done\n/bin/cat > "$last"')
+    path = tmp_path / "story.ogg"
+    sink = FfmpegEncoderSink(path, SAMPLE_RATE, AudioCodec.OPUS, "24k")
+
+    sink.open()
+    sink.write(PCM)
+    sink.close()
+
+    assert path.read_bytes() == PCM
+    assert sink.duration_seconds == 1.0
+
+
+def test_ffmpeg_sink_fails_to_open_without_an_encoder(tmp_path: Path, fake_ffmpeg: Path) -> None:
+    path = tmp_path / "story.ogg"
+    sink = FfmpegEncoderSink(path, SAMPLE_RATE, AudioCodec.OPUS, "24k")
+
+    with pytest.raises(FileNotFoundError):
+        sink.open()
+
+    sink.close(failed=True)
+    assert not path.exists()
+
+
+def test_ffmpeg_sink_raises_and_removes_the_output_on_a_non_zero_exit(tmp_path: Path, fake_ffmpeg: Path) -> None:
+    _install_ffmpeg(fake_ffmpeg, 'for last; do :; done\n/bin/cat > "$last"\necho "unknown encoder" >&2\nexit 1')
+    path = tmp_path / "story.ogg"
+    sink = FfmpegEncoderSink(path, SAMPLE_RATE, AudioCodec.OPUS, "24k")
+    sink.open()
+    sink.write(PCM)
+
+    with pytest.raises(RuntimeError, match="unknown encoder"):
+        sink.close()
+
+    assert not path.exists()
+
+
+def test_ffmpeg_sink_kills_the_encoder_on_failure(tmp_path: Path, fake_ffmpeg: Path) -> None:
+    _install_ffmpeg(fake_ffmpeg, "exec /bin/sleep 30")
+    sink = FfmpegEncoderSink(tmp_path / "story.ogg", SAMPLE_RATE, AudioCodec.OPUS, "24k")
+    sink.open()
+    process = sink._process
+    assert process is not None
+
+    sink.close(failed=True)
+
+    assert process.returncode is not None
+
+
+@pytest.mark.parametrize(
+    ("codec", "sink_type"),
+    [(AudioCodec.WAV, WavFileSink), (AudioCodec.OPUS, FfmpegEncoderSink), (AudioCodec.MP3, FfmpegEncoderSink)],
+)
+def test_create_audio_sink_picks_the_sink_for_the_codec(tmp_path: Path, codec: AudioCodec, sink_type: type) -> None:
+    assert isinstance(create_audio_sink(tmp_path / "story", SAMPLE_RATE, codec, "24k"), sink_type)
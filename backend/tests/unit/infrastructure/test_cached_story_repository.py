@@ -0,0 +1,102 @@
+import pytest
+
+from app.domain import Story, StoryStatus
+from app.infrastructure import CachedStoryRepository
+from tests.fakes import InMemoryStoryRepository, make_story
+
+
+class CountingStoryRepository(InMemoryStoryRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    async def get_by_id(self, story_id: str) -> Story | None:
+        self.reads += 1
+        return await super().get_by_id(story_id)
+
+
+@pytest.fixture
+def inner() -> CountingStoryRepository:
+    return CountingStoryRepository()
+
+
+@pytest.fixture
+def repository(inner: CountingStoryRepository) -> CachedStoryRepository:
+    return CachedStoryRepository(inner=inner, max_entries=16, ttl_seconds=60.0)
+
+
+async def _saved_story(repository: CachedStoryRepository, status: StoryStatus) -> Story:
+    story = make_story(status=status)
+    await repository.save(story)
+    return story
+
+
+@pytest.mark.anyio
+async def test_finished_story_is_read_once(repository: CachedStoryRepository, inner: CountingStoryRepository) -> None:
+    story = await _saved_story(repository, StoryStatus.COMPLETED)
+
+    await repository.get_by_id(story.id)
+    cached = await repository.get_by_id(story.id)
+
+    assert cached == story
+    assert inner.reads == 1
+
+
+@pytest.mark.anyio
+async def test_unfinished_story_is_always_read(
+    repository: CachedStoryRepository,
+    inner: CountingStoryRepository,
+) -> None:
+    story = await _saved_story(repository, StoryStatus.GENERATING_AUDIO)
+
+    await repository.get_by_id(story.id)
+    await repository.get_by_id(story.id)
+
+    assert inner.reads == 2
+
+
+@pytest.mark.anyio
+async def test_cached_story_is_a_copy(repository: CachedStoryRepository) -> None:
+    story = await _saved_story(repository, StoryStatus.COMPLETED)
+    first = await repository.get_by_id(story.id)
+    assert first is not None
+
+    first.title = "Changed in memory"
+
+    assert (await repository.get_by_id(story.id)).title == "A quiet harbor"  # type: ignore[union-attr]
+
+
+@pytest.mark.anyio
+async def test_patch_invalidates_the_cached_story(
+    repository: CachedStoryRepository,
+    inner: CountingStoryRepository,
+) -> None:
+    story = await _saved_story(repository, StoryStatus.COMPLETED)
+    await repository.get_by_id(story.id)
+
+    story.status = StoryStatus.GENERATING_AUDIO
+    await repository.patch(story, expected_status=StoryStatus.COMPLETED)
+
+    assert (await repository.get_by_id(story.id)).status is StoryStatus.GENERATING_AUDIO  # type: ignore[union-attr]
+    assert inner.reads == 2
+
+
+@pytest.mark.anyio
+async def test_delete_invalidates_the_cached_story(repository: CachedStoryRepository) -> None:
+    story = await _saved_story(repository, StoryStatus.FAILED)
+    await repository.get_by_id(story.id)
+
+    await repository.delete(story.id)
+
+    assert await repository.get_by_id(story.id) is None
+
+
+@pytest.mark.anyio
+async def test_expired_story_is_read_again(inner: CountingStoryRepository) -> None:
+    repository = CachedStoryRepository(inner=inner, max_entries=16, ttl_seconds=0.0)
+    story = await _saved_story(repository, StoryStatus.COMPLETED)
+
+    await repository.get_by_id(story.id)
+    await repository.get_by_id(story.id)
+
+    assert inner.reads == 2
@@ -0,0 +1,29 @@
+import pytest
+from piper import SynthesisConfig
+
+from app.domain import StoryFlavor
+from app.infrastructure.story_synthesizer.duration import DurationBudget, estimate_speech_seconds
+
+
+def test_budget_admits_frames_up_to_the_limit() -> None:
+    budget = DurationBudget(max_seconds=2.0, sample_rate=100)
+
+    assert budget.admit(150)
+    assert budget.admit(50)
+    assert not budget.exceeded
+
+
+def test_budget_rejects_the_chunk_that_would_cross_the_limit() -> None:
+    budget = DurationBudget(max_seconds=2.0, sample_rate=100)
+    budget.admit(150)
+
+    assert not budget.admit(51)
+    assert budget.exceeded
+    assert budget.admit(50)
+
+
+def test_speech_estimate_follows_the_flavor_pace_and_length_scale() -> None:
+    text = " ".join(["word"] * 135)
+
+    assert estimate_speech_seconds(text, StoryFlavor.THRILLER, SynthesisConfig(length_scale=1.0)) == pytest.approx(60)
+    assert estimate_speech_seconds(text, StoryFlavor.THRILLER, SynthesisConfig(length_scale=1.5)) == pytest.approx(90)
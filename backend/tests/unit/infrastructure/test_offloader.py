@@ -0,0 +1,45 @@
+import os
+import threading
+
+import pytest
+
+from app.infrastructure import TaskOffloader, create_task_offloader
+
+
+def _current_thread_name() -> str:
+    return threading.current_thread().name
+
+
+@pytest.mark.anyio
+async def test_cpu_bound_work_runs_on_the_threads_without_a_process_pool() -> None:
+    offloader = TaskOffloader(thread_pool_size=1, process_pool_size=0)
+
+    try:
+        thread_name = await offloader.run_in_process(_current_thread_name)
+    finally:
+        offloader.shutdown()
+
+    assert thread_name.startswith("offload")
+
+
+@pytest.mark.anyio
+async def test_cpu_bound_work_runs_in_another_process_with_a_process_pool() -> None:
+    offloader = TaskOffloader(thread_pool_size=1, process_pool_size=1)
+
+    try:
+        pid = await offloader.run_in_process(os.getpid)
+    finally:
+        offloader.shutdown()
+
+    assert pid != os.getpid()
+
+
+@pytest.mark.anyio
+async def test_offloader_without_a_process_pool_shuts_down_with_its_resource() -> None:
+    resource = create_task_offloader(thread_pool_size=1, process_pool_size=0)
+    offloader = next(resource)
+
+    next(resource, None)
+
+    with pytest.raises(RuntimeError):
+        await offloader.run_in_process(_current_thread_name)
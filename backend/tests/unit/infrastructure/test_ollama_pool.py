@@ -0,0 +1,141 @@
+import asyncio
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from app.infrastructure import OllamaClientPool, create_ollama_client_pool
+
+
+class Verdict(BaseModel):
+    allowed: bool
+
+
+def _pool(base_urls: list[str] | None = None, max_concurrency_per_model: int = 2) -> OllamaClientPool:
+    return OllamaClientPool(
+        base_urls=base_urls or ["http://first:11434"],
+        max_concurrency_per_model=max_concurrency_per_model,
+        max_connections=4,
+        max_keepalive_connections=2,
+        keepalive_expiry_seconds=30.0,
+        timeout_seconds=10.0,
+    )
+
+
+async def _client(
+    pool: OllamaClientPool,
+    model: str = "llama",
+    schema: type[BaseModel] | None = None,
+    **params: Any,
+) -> Any:
+    async with pool.chat(model, schema, **params) as client:
+        return client
+
+
+def _http_clients(pool: OllamaClientPool) -> list[Any]:
+    return [client for llm in pool._models.values() for client in (llm._client._client, llm._async_client._client)]
+
+
+@pytest.mark.anyio
+async def test_chat_spreads_requests_over_the_backends_round_robin() -> None:
+    pool = _pool(base_urls=["http://first:11434", "http://second:11434"])
+
+    base_urls = [(await _client(pool)).base_url for _ in range(3)]
+
+    assert base_urls == ["http://first:11434", "http://second:11434", "http://first:11434"]
+
+
+@pytest.mark.anyio
+async def test_chat_reuses_the_client_for_the_same_model_and_params() -> None:
+    pool = _pool()
+
+    first = await _client(pool, temperature=0.5)
+    second = await _client(pool, temperature=0.5)
+    other = await _client(pool, temperature=0.9)
+
+    assert first is second
+    assert other is not first
+
+
+@pytest.mark.anyio
+async def test_structured_clients_share_the_connections_of_their_model() -> None:
+    pool = _pool()
+
+    plain = await _client(pool)
+    structured = await _client(pool, schema=Verdict)
+
+    assert structured is not plain
+    assert structured is await _client(pool, schema=Verdict)
+    assert list(pool._models.values()) == [plain]
+
+
+@pytest.mark.anyio
+async def test_chat_limits_concurrency_per_backend_and_model() -> None:
+    pool = _pool(max_concurrency_per_model=1)
+
+    async with pool.chat("llama"):
+        waiting = asyncio.create_task(_client(pool, "llama"))
+        other_model = await asyncio.wait_for(_client(pool, "llava"), timeout=1)
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+    assert other_model.model == "llava"
+    assert (await asyncio.wait_for(waiting, timeout=1)).model == "llama"
+
+
+@pytest.mark.anyio
+async def test_aclose_closes_every_cached_http_client() -> None:
+    pool = _pool()
+    await _client(pool, "llama")
+    await _client(pool, "llava", schema=Verdict)
+
+    http_clients = _http_clients(pool)
+    await pool.aclose()
+
+    assert len(http_clients) == 4
+    assert all(client.is_closed for client in http_clients)
+
+
+@pytest.mark.anyio
+async def test_resource_teardown_from_another_thread_closes_the_clients() -> None:
+    resource = create_ollama_client_pool(
+        base_urls=["http://first:11434"],
+        max_concurrency_per_model=1,
+        max_connections=4,
+        max_keepalive_connections=2,
+        keepalive_expiry_seconds=30.0,
+        timeout_seconds=None,
+    )
+    pool = next(resource)
+    await _client(pool)
+    http_clients = _http_clients(pool)
+
+    await asyncio.to_thread(next, resource, None)
+
+    assert all(client.is_closed for client in http_clients)
+
+
+def test_close_runs_on_the_idle_loop_of_the_clients() -> None:
+    pool = _pool()
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_client(pool))
+        http_clients = _http_clients(pool)
+
+        pool.close()
+    finally:
+        loop.close()
+
+    assert all(client.is_closed for client in http_clients)
+
+
+def test_at_least_one_backend_is_required() -> None:
+    with pytest.raises(ValueError):
+        OllamaClientPool(
+            base_urls=[],
+            max_concurrency_per_model=1,
+            max_connections=4,
+            max_keepalive_connections=2,
+            keepalive_expiry_seconds=30.0,
+            timeout_seconds=None,
+        )
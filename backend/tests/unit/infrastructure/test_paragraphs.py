@@ -0,0 +1,39 @@
+import pytest
+
+from app.infrastructure import ParagraphSplitter
+from app.infrastructure.story_synthesizer.paragraphs import split_into_paragraphs
+
+STORY = "First line\nof the first paragraph.\n\nSecond paragraph.\n---\nThird paragraph.\n\n\n\nFourth"
+
+
+def test_split_into_paragraphs_breaks_on_blank_lines_and_scene_breaks() -> None:
+    assert split_into_paragraphs(STORY) == [
+        "First line\nof the first paragraph.",
+        "Second paragraph.",
+        "Third paragraph.",
+        "Fourth",
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 16])
+def test_streamed_splitting_matches_whole_text_splitting(chunk_size: int) -> None:
+    splitter = ParagraphSplitter()
+    paragraphs: list[str] = []
+
+    for start in range(0, len(STORY), chunk_size):
+        paragraphs.extend(splitter.feed(STORY[start:start + chunk_size]))
+    paragraphs.extend(splitter.flush())
+
+    assert paragraphs == split_into_paragraphs(STORY)
+
+
+def test_paragraph_is_emitted_as_soon_as_it_is_closed() -> None:
+    splitter = ParagraphSplitter()
+
+    assert splitter.feed("Once upon a time.\n") == []
+    assert splitter.feed("\nThe end") == ["Once upon a time."]
+    assert splitter.flush() == ["The end"]
+
+
+def test_blank_text_has_no_paragraphs() -> None:
+    assert split_into_paragraphs("\n  \n---\n") == []
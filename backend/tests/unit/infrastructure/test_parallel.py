@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from piper import SynthesisConfig
+
+from app.infrastructure import ParagraphRenderPool, create_paragraph_render_pool
+from tests.fakes import StubVoiceRegistry
+
+CONFIG = SynthesisConfig(length_scale=1.0)
+
+
+class EchoVoice:
+    def __init__(self, name: str, barrier: threading.Barrier | None) -> None:
+        self.name = name
+        self._barrier = barrier
+
+    def synthesize(self, text: str, syn_config: Any = None) -> Iterator[SimpleNamespace]:
+        if self._barrier is not None:
+            self._barrier.wait(timeout=5)
+
+        yield SimpleNamespace(audio_int16_bytes=f"{self.name}:{text}".encode())
+
+
+class EchoVoiceRegistry(StubVoiceRegistry):
+    def __init__(self, barrier: threading.Barrier | None = None) -> None:
+        super().__init__()
+        self.loaded: list[str] = []
+        self._barrier = barrier
+
+    def _load(self, name: str) -> EchoVoice:  # type: ignore[override]
+        self.loaded.append(name)
+        return EchoVoice(name, self._barrier)
+
+
+@pytest.mark.anyio
+async def test_render_uses_the_named_voice_of_the_shared_registry() -> None:
+    voices = EchoVoiceRegistry()
+    voices.preload()
+    pool = ParagraphRenderPool(workers=2, voices=voices)
+
+    try:
+        rendered = await pool.render("stub", "Once upon a time", CONFIG)
+    finally:
+        pool.shutdown()
+
+    assert rendered == b"stub:Once upon a time"
+    assert voices.loaded == ["stub"]
+
+
+@pytest.mark.anyio
+async def test_paragraphs_render_concurrently_up_to_the_worker_count() -> None:
+    pool = ParagraphRenderPool(workers=3, voices=EchoVoiceRegistry(threading.Barrier(3)))
+
+    try:
+        rendered = await asyncio.gather(*(pool.render("stub", str(index), CONFIG) for index in range(3)))
+    finally:
+        pool.shutdown()
+
+    assert rendered == [b"stub:0", b"stub:1", b"stub:2"]
+
+
+def test_no_pool_is_created_without_workers() -> None:
+    resource = create_paragraph_render_pool(workers=0, voices=EchoVoiceRegistry())
+
+    assert next(resource) is None
+
+
+@pytest.mark.anyio
+async def test_pool_is_shut_down_with_its_resource() -> None:
+    resource = create_paragraph_render_pool(workers=1, voices=EchoVoiceRegistry())
+    pool = next(resource)
+    assert pool is not None
+
+    next(resource, None)
+
+    with pytest.raises(RuntimeError):
+        await pool.render("stub", "Once upon a time", CONFIG)
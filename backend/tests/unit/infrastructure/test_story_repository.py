@@ -0,0 +1,179 @@
+import base64
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.domain import StoryFlavor, StoryStatus, StorySummary
+from app.exceptions import InvalidCursor
+from app.infrastructure import MongoStoryRepository
+from tests.fakes import make_story
+
+CREATED_AT = datetime(2030, 5, 17, 12, 30, tzinfo=timezone.utc)
+
+
+class FakeCursor:
+    def __init__(self, documents: list[dict]) -> None:
+        self._documents = documents
+        self.skipped = 0
+        self.limited = 0
+
+    def sort(self, _: list) -> "FakeCursor":
+        return self
+
+    def skip(self, count: int) -> "FakeCursor":
+        self.skipped = count
+        return self
+
+    def limit(self, count: int) -> "FakeCursor":
+        self.limited = count
+        return self
+
+    async def __aiter__(self):
+        for document in self._documents[self.skipped:self.skipped + self.limited]:
+            yield document
+
+
+class FakeStoriesCollection:
+    def __init__(self, documents: list[dict]) -> None:
+        self._documents = documents
+        self.queries: list[dict] = []
+
+    def find(self, query: dict, projection: dict) -> FakeCursor:
+        self.queries.append(query)
+        return FakeCursor(self._documents)
+
+    async def estimated_document_count(self) -> int:
+        return len(self._documents)
+
+
+def _repository(documents: list[dict] | None = None) -> MongoStoryRepository:
+    return MongoStoryRepository(db=SimpleNamespace(stories=FakeStoriesCollection(documents or [])))  # type: ignore
+
+
+def _summary_document(story_id: str, created_at: datetime) -> dict:
+    return {
+        "id": story_id,
+        "flavor": "thriller",
+        "title": "",
+        "story_text_head": "Once upon a time",
+        "created_at": created_at,
+        "status": "completed",
+    }
+
+
+def _summary(story_id: str, created_at: datetime = CREATED_AT) -> StorySummary:
+    return StorySummary(
+        id=story_id,
+        flavor=StoryFlavor.THRILLER,
+        title="",
+        story_text_head="",
+        created_at=created_at,
+        status=StoryStatus.COMPLETED,
+    )
+
+
+def test_cursor_resumes_after_the_last_story_of_the_page() -> None:
+    cursor = MongoStoryRepository._encode_cursor(_summary("b"))
+
+    assert MongoStoryRepository._after_cursor_filter(cursor) == {
+        "$or": [
+            {"created_at": {"$lt": CREATED_AT}},
+            {"created_at": CREATED_AT, "id": {"$lt": "b"}},
+        ],
+    }
+
+
+def test_cursor_is_url_safe() -> None:
+    cursor = MongoStoryRepository._encode_cursor(_summary("?/+" * 10, CREATED_AT - timedelta(microseconds=1)))
+
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(b'["not a date", "id"]').decode(),
+        base64.urlsafe_b64encode(b'["2030-05-17T12:30:00+00:00"]').decode(),
+        base64.urlsafe_b64encode(b"42").decode(),
+    ],
+)
+def test_malformed_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(InvalidCursor):
+        MongoStoryRepository._after_cursor_filter(cursor)
+
+
+def test_update_sets_changed_fields_only() -> None:
+    story = make_story(status=StoryStatus.GENERATING_STORY)
+    story.mark_persisted()
+
+    story.title = "A stormy night"
+    story.status = StoryStatus.GENERATING_AUDIO
+
+    document = _repository()._story_to_document(story)
+    assert MongoStoryRepository._update_for(document, story.changed_fields) == {
+        "$set": {"title": "A stormy night", "status": "generating_audio"},
+    }
+
+
+def test_update_unsets_a_cleared_batch_id() -> None:
+    story = make_story(batch_id="batch")
+    story.mark_persisted()
+
+    story.batch_id = None
+    story.updated_at = CREATED_AT
+
+    document = _repository()._story_to_document(story)
+    assert MongoStoryRepository._update_for(document, story.changed_fields) == {
+        "$set": {"updated_at": CREATED_AT},
+        "$unset": {"batch_id": ""},
+    }
+
+
+def test_unbatched_story_is_stored_without_a_batch_id() -> None:
+    repository = _repository()
+
+    assert "batch_id" not in repository._story_to_document(make_story())
+    assert repository._story_to_document(make_story(batch_id="batch"))["batch_id"] == "batch"
+
+
+def test_document_round_trip_keeps_the_story() -> None:
+    repository = _repository()
+    story = make_story(status=StoryStatus.COMPLETED, batch_id="batch", stage_timings={"tts": 1.5})
+
+    assert repository.document_to_story(repository._story_to_document(story)) == story
+
+
+@pytest.mark.anyio
+async def test_list_stories_returns_a_cursor_when_more_stories_follow() -> None:
+    documents = [_summary_document(str(index), CREATED_AT - timedelta(minutes=index)) for index in range(3)]
+    repository = _repository(documents)
+
+    page = await repository.list_stories(page_size=2)
+
+    assert [story.id for story in page.stories] == ["0", "1"]
+    assert page.total == 3
+    assert page.next_cursor == MongoStoryRepository._encode_cursor(page.stories[-1])
+
+
+@pytest.mark.anyio
+async def test_list_stories_has_no_cursor_on_the_last_page() -> None:
+    documents = [_summary_document(str(index), CREATED_AT) for index in range(2)]
+
+    page = await _repository(documents).list_stories(page_size=2)
+
+    assert len(page.stories) == 2
+    assert page.next_cursor is None
+
+
+@pytest.mark.anyio
+async def test_list_stories_with_a_cursor_filters_instead_of_skipping() -> None:
+    repository = _repository([_summary_document("0", CREATED_AT)])
+    cursor = MongoStoryRepository._encode_cursor(_summary("b"))
+
+    page = await repository.list_stories(page=3, page_size=2, cursor=cursor)
+
+    assert [story.id for story in page.stories] == ["0"]
+    assert repository.collection.queries == [MongoStoryRepository._after_cursor_filter(cursor)]
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.story_generator.response_models import RestrictedContentResponse
+from tests.fakes import MemoryVisionResultCache
+
+KEY = MemoryVisionResultCache.key_for("safety", "image-sha", "model", "prompt")
+
+
+class CountingCompute:
+    def __init__(self, delay_seconds: float = 0.0, error: Exception | None = None) -> None:
+        self.calls = 0
+        self._delay_seconds = delay_seconds
+        self._error = error
+
+    async def __call__(self) -> RestrictedContentResponse:
+        self.calls += 1
+        await asyncio.sleep(self._delay_seconds)
+
+        if self._error is not None:
+            raise self._error
+
+        return RestrictedContentResponse(summary="A calm harbor", is_restricted=False)
+
+
+def test_key_depends_on_every_input() -> None:
+    keys = {
+        KEY,
+        MemoryVisionResultCache.key_for("insights", "image-sha", "model", "prompt"),
+        MemoryVisionResultCache.key_for("safety", "other-sha", "model", "prompt"),
+        MemoryVisionResultCache.key_for("safety", "image-sha", "other-model", "prompt"),
+        MemoryVisionResultCache.key_for("safety", "image-sha", "model", None),
+    }
+
+    assert len(keys) == 5
+    assert KEY.startswith("safety:")
+
+
+@pytest.mark.anyio
+async def test_result_is_computed_once() -> None:
+    cache = MemoryVisionResultCache(max_entries=16, ttl_seconds=60)
+    compute = CountingCompute()
+
+    first = await cache.get_or_compute(KEY, RestrictedContentResponse, compute)
+    second = await cache.get_or_compute(KEY, RestrictedContentResponse, compute)
+
+    assert first == second
+    assert compute.calls == 1
+
+
+@pytest.mark.anyio
+async def test_concurrent_requests_share_one_computation() -> None:
+    cache = MemoryVisionResultCache(max_entries=16, ttl_seconds=60)
+    compute = CountingCompute(delay_seconds=0.05)
+
+    results = await asyncio.gather(*(cache.get_or_compute(KEY, RestrictedContentResponse, compute) for _ in range(5)))
+
+    assert len(set(result.model_dump_json() for result in results)) == 1
+    assert compute.calls == 1
+
+
+@pytest.mark.anyio
+async def test_failure_is_not_shared_with_waiters() -> None:
+    cache = MemoryVisionResultCache(max_entries=16, ttl_seconds=60)
+    failing = CountingCompute(delay_seconds=0.05, error=RuntimeError("model unavailable"))
+    succeeding = CountingCompute()
+
+    failed, result = await asyncio.gather(
+        cache.get_or_compute(KEY, RestrictedContentResponse, failing),
+        cache.get_or_compute(KEY, RestrictedContentResponse, succeeding),
+        return_exceptions=True,
+    )
+
+    assert isinstance(failed, RuntimeError)
+    assert isinstance(result, RestrictedContentResponse)
+    assert succeeding.calls == 1
+
+
+@pytest.mark.anyio
+async def test_expired_result_is_computed_again() -> None:
+    cache = MemoryVisionResultCache(max_entries=16, ttl_seconds=0)
+    compute = CountingCompute()
+
+    await cache.get_or_compute(KEY, RestrictedContentResponse, compute)
+    await cache.get_or_compute(KEY, RestrictedContentResponse, compute)
+
+    assert compute.calls == 2
@@ -0,0 +1,122 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+import pytest
+
+from app.domain import StoryFlavor
+from app.infrastructure.story_synthesizer import voices as voices_module
+from app.infrastructure.story_synthesizer.voices import VoiceRegistry
+
+
+class RecordingVoiceRegistry(VoiceRegistry):
+    def __init__(self, max_loaded_voices: int = 2, threads: int = 1) -> None:
+        super().__init__(
+            voices_dir=Path("."),
+            default_voice="default",
+            flavor_voices={StoryFlavor.FAIRY_TALE: "fairy", StoryFlavor.THRILLER: "default"},
+            max_loaded_voices=max_loaded_voices,
+            intra_op_threads=threads,
+            inter_op_threads=threads,
+        )
+        self.loaded: list[str] = []
+
+    def _load(self, name: str) -> Any:
+        self.loaded.append(name)
+        return SimpleNamespace(name=name)
+
+
+class WarmUpVoice:
+    def __init__(self, session: Any, config: Any) -> None:
+        self.session = session
+        self.synthesized: list[str] = []
+
+    def synthesize(self, text: str, syn_config: Any = None) -> Iterator[bytes]:
+        self.synthesized.append(text)
+        yield b""
+
+
+def test_get_caches_loaded_voices() -> None:
+    registry = RecordingVoiceRegistry()
+
+    first = registry.get("default")
+    second = registry.get("default")
+
+    assert first is second
+    assert registry.loaded == ["default"]
+
+
+def test_get_evicts_the_least_recently_used_voice() -> None:
+    registry = RecordingVoiceRegistry(max_loaded_voices=2)
+    registry.get("first")
+    registry.get("second")
+
+    registry.get("first")
+    registry.get("third")
+    registry.get("first")
+    registry.get("second")
+
+    assert registry.loaded == ["first", "second", "third", "second"]
+
+
+def test_voice_for_falls_back_to_the_default_voice() -> None:
+    registry = RecordingVoiceRegistry()
+
+    assert registry.voice_for(StoryFlavor.FAIRY_TALE).name == "fairy"  # type: ignore[attr-defined]
+    assert registry.voice_for(StoryFlavor.ROMANCE).name == "default"  # type: ignore[attr-defined]
+
+
+def test_preload_loads_every_configured_voice_once() -> None:
+    registry = RecordingVoiceRegistry()
+
+    registry.preload()
+
+    assert registry.loaded == ["default", "fairy"]
+
+
+def test_after_fork_keeps_single_threaded_voices() -> None:
+    registry = RecordingVoiceRegistry(threads=1)
+    registry.preload()
+
+    registry.after_fork()
+    registry.preload()
+
+    assert registry.fork_safe
+    assert registry.loaded == ["default", "fairy"]
+
+
+def test_after_fork_drops_voices_with_onnx_thread_pools() -> None:
+    registry = RecordingVoiceRegistry(threads=2)
+    registry.preload()
+
+    registry.after_fork()
+    registry.preload()
+
+    assert not registry.fork_safe
+    assert registry.loaded == ["default", "fairy", "default", "fairy"]
+
+
+def test_load_warms_up_the_voice_with_the_configured_threads(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "default.onnx.json").write_text("{}")
+    monkeypatch.setattr(voices_module.PiperConfig, "from_dict", staticmethod(lambda data: SimpleNamespace()))
+    monkeypatch.setattr(
+        voices_module.onnxruntime,
+        "InferenceSession",
+        lambda path, sess_options, providers: SimpleNamespace(path=path, options=sess_options),
+    )
+    monkeypatch.setattr(voices_module, "PiperVoice", WarmUpVoice)
+    registry = VoiceRegistry(
+        voices_dir=tmp_path,
+        default_voice="default",
+        flavor_voices={},
+        max_loaded_voices=1,
+        intra_op_threads=2,
+        inter_op_threads=1,
+    )
+
+    voice: Any = registry.get("default")
+
+    assert voice.synthesized == [VoiceRegistry.WARM_UP_TEXT]
+    assert voice.session.path == str(tmp_path / "default.onnx")
+    assert voice.session.options.intra_op_num_threads == 2
+    assert voice.session.options.inter_op_num_threads == 1
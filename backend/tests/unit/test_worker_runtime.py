@@ -0,0 +1,31 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from app import worker_runtime
+from app.containers import ApplicationContainer
+from app.worker_runtime import WorkerRuntime
+
+
+async def _skip_storage_bootstrap(container: ApplicationContainer) -> None:
+    pass
+
+
+def _current_thread_name() -> str:
+    return threading.current_thread().name
+
+
+def test_worker_runs_cpu_bound_work_on_threads(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("BASE_FILES_DIR", str(tmp_path))
+    monkeypatch.setattr(worker_runtime, "bootstrap_storage", _skip_storage_bootstrap)
+    runtime = WorkerRuntime()
+
+    runtime.start()
+    try:
+        offloader = runtime._container.offloader()  # type: ignore[union-attr]
+        thread_name = runtime.run(offloader.run_in_process(_current_thread_name))
+    finally:
+        runtime.shutdown()
+
+    assert thread_name.startswith("offload")
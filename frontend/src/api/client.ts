@@ -22,7 +22,9 @@ export interface StoryGenerationResponse {
   imageUrl?: string | null;
   audioUrl?: string | null;
   audioDurationSeconds?: number | null;
+  audioCodec?: 'wav' | 'opus' | 'mp3' | null;
   generationTimeSeconds?: number | null;
+  errorMessage?: string | null;
   createdAt: string;
   status: StoryStatus;
 }
@@ -42,6 +44,7 @@ export interface StoryListResponse {
   total: number;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export const apiBaseUrl = (() => {
@@ -70,6 +73,17 @@ export async function getStoryById(id: string): Promise<StoryGenerationResponse>
   return res.json();
 }
 
+export function subscribeToStory(
+  id: string,
+  onUpdate: (story: StoryGenerationResponse) => void
+): () => void {
+  const source = new EventSource(`${apiBaseUrl}/api/stories/${encodeURIComponent(id)}/events`);
+  source.addEventListener('status', (event) => {
+    onUpdate(JSON.parse((event as MessageEvent<string>).data));
+  });
+  return () => source.close();
+}
+
 export async function generateStory(
   request: StoryGenerationRequest,
   imageFile: File
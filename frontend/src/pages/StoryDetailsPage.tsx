@@ -1,6 +1,6 @@
 import React from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
-import { apiBaseUrl, buildFileUrl, deleteStory, getStoryById, StoryGenerationResponse } from '../api/client';
+import { apiBaseUrl, buildFileUrl, deleteStory, getStoryById, StoryGenerationResponse, subscribeToStory } from '../api/client';
 import { formatStatus, statusBadgeClass } from '../ui/status';
 import AudioPlayer from '../ui/AudioPlayer';
 
@@ -28,6 +28,13 @@ export default function StoryDetailsPage(): JSX.Element {
     })();
   }, [id]);
 
+  const inProgress = story !== null && ['just_created', 'generating_story', 'generating_audio'].includes(story.status);
+
+  React.useEffect(() => {
+    if (!id || !inProgress) return;
+    return subscribeToStory(id, setStory);
+  }, [id, inProgress]);
+
   if (!id) return <p>Missing id</p>;
   if (loading) return <p>Loading...</p>;
   if (error) return <p style={{ color: 'red' }}>{error}</p>;